@@ -0,0 +1,112 @@
+"""
+Benchmark of the comparison of two snapshots of pod records in the checker:
+previous comparison (deep equality of the snapshots and lookup of each key in both directions)
+and the fingerprint diff engine (libs/kubernetes_diff.py).
+The second snapshot replaces 1% of the items and changes the state of another 1%.
+
+Run from the src folder:
+    python -m benchmarks.bench_diff_engine [n_items] [churn_percent]
+"""
+import gc
+import sys
+import time
+
+from benchmarks.bench_records_memory import pod_record
+from libs.kubernetes_diff import KubernetesDiff
+from libs.kubernetes_records import PodRecord, ContainerStatusRecord
+
+ENABLE_KEYS = ['cluster', 'namespace', 'started', 'own_controller', 'own_kind', 'own_name',
+               'conditions', 'cs_0', 'cs_1', 'cs_2', 'cs_3']
+
+
+def snapshots(build, n_items, churn):
+    """
+    Two snapshots read one after the other: churn items replaced and churn items with a new state
+    """
+    old = {f'pod-{index}': build(index) for index in range(n_items)}
+    # the collectors build new objects at every read
+    new = {f'pod-{index}': build(index) for index in range(n_items)}
+    for index in range(churn):
+        del new[f'pod-{index}']
+        new[f'pod-new-{index}'] = build(index)
+    for index in range(churn, 2 * churn):
+        item = build(index)
+        container = item.containers[0]
+        item = PodRecord(*item[:4],
+                         (ContainerStatusRecord(container.image, container.restart, container.ready,
+                                                container.started, 'Waiting', 'ImagePullBackOff'),),
+                         *item[5:])
+        new[f'pod-{index}'] = item
+    return old, new
+
+
+def previous_compare(old, new):
+    """
+    Comparison of __process_key__ before the diff engine
+    """
+    if old == new:
+        return set(), set()
+    added = {name for name in new.keys() if name not in old.keys()}
+    resolved = {name for name in old.keys() if name not in new.keys()}
+    return added, resolved
+
+
+def timed(functions, repeat=25, setup=None):
+    """
+    Best time of each function, the functions run one after the other at each repeat so that the load
+    of the machine is the same for all. As timeit the garbage collector is disabled while they run
+    @param setup: function called before each run, not timed
+    @return: list of (best time, result)
+    """
+    best = [None] * len(functions)
+    results = [None] * len(functions)
+    for _ in range(repeat):
+        for index, function in enumerate(functions):
+            if setup is not None:
+                setup()
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            results[index] = function()
+            elapsed = time.perf_counter() - start
+            gc.enable()
+            best[index] = elapsed if best[index] is None else min(best[index], elapsed)
+    return list(zip(best, results))
+
+
+def main(n_items, churn_percent):
+    churn = max(1, n_items * churn_percent // 100)
+    old, new = snapshots(pod_record, n_items, churn)
+    _, same = snapshots(pod_record, n_items, 0)
+
+    diff = KubernetesDiff(ENABLE_KEYS)
+
+    diff.update(old)
+    old_fingerprints = diff.fingerprints
+
+    def reset():
+        # the fingerprints are updated in place
+        diff.fingerprints = old_fingerprints.copy()
+        diff.last_data = old
+
+    (previous, (added, resolved)), (engine, (new_names, changed, resolved_diff)) = \
+        timed([lambda: previous_compare(old, new), lambda: diff.update(new)], setup=reset)
+    (previous_same, _), (engine_same, _) = timed([lambda: previous_compare(old, same), lambda: diff.update(same)],
+                                                 setup=reset)
+
+    assert added == new_names and resolved == resolved_diff
+    print(f"items                  : {n_items} - churn {churn} replaced, {churn} changed")
+    print(f"previous, churn        : {previous * 1000:.1f} ms (changed items not detected)")
+    print(f"previous, no change    : {previous_same * 1000:.1f} ms")
+    print(f"diff engine, churn     : {engine * 1000:.1f} ms - new {len(new_names)} changed {len(changed)} "
+          f"resolved {len(resolved_diff)}")
+    print(f"diff engine, no change : {engine_same * 1000:.1f} ms")
+    # the margin is the noise of a run of a few ms. At a higher churn the engine computes the fingerprints
+    # of the changed items, not detected by the compare
+    assert engine_same <= previous_same * 1.2, "diff slower than the compare"
+    assert churn_percent > 1 or engine <= previous * 1.2, "diff slower than the compare"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1)
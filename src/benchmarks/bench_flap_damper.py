@@ -0,0 +1,70 @@
+"""
+Benchmark of the flap damping (libs/kubernetes_flap_damper.py):
+messages sent for objects flipping state at each cycle with and without damping,
+memory of the states and time of a cycle with many alerting objects.
+
+Run from the src folder:
+    python -m benchmarks.bench_flap_damper [n_alerting] [n_flapping] [n_cycles]
+"""
+import sys
+import time
+import tracemalloc
+
+from libs.kubernetes_flap_damper import KubernetesFlapDamper
+
+
+def cycles(n_alerting, n_flapping, n_cycles):
+    """
+    Objects with problem at each cycle: the alerting ones always, the flapping ones every other cycle
+    """
+    alerting = {f'pod-{index}': index for index in range(n_alerting)}
+    for cycle in range(n_cycles):
+        data = dict(alerting)
+        if cycle % 2 == 0:
+            data.update((f'flapping-{index}', index) for index in range(n_flapping))
+        yield data
+
+
+def messages(damper, n_alerting, n_flapping, n_cycles):
+    """
+    Items reported (raised, resolved or flapping) in all the cycles
+    """
+    total = 0
+    for data in cycles(n_alerting, n_flapping, n_cycles):
+        raised, cleared, flapping = damper.update(data)
+        total += len(raised) + len(cleared) + len(flapping)
+    return total
+
+
+def main(n_alerting, n_flapping, n_cycles):
+    print(f"alerting {n_alerting} - flapping {n_flapping} - cycles {n_cycles}")
+    # raise/clear at the first cycle: as without damping
+    undamped = messages(KubernetesFlapDamper(), 0, n_flapping, n_cycles)
+    hysteresis = messages(KubernetesFlapDamper(raise_cycles=2, clear_cycles=2), 0, n_flapping, n_cycles)
+    flap = messages(KubernetesFlapDamper(flap_window=8, flap_changes=4), 0, n_flapping, n_cycles)
+    print(f"items reported, no damping       : {undamped}")
+    print(f"items reported, raise 2 clear 2  : {hysteresis}")
+    print(f"items reported, flap window 8/4  : {flap}")
+
+    damper = KubernetesFlapDamper(raise_cycles=2, clear_cycles=2, flap_window=16, flap_changes=4)
+    data = next(cycles(n_alerting, n_flapping, 1))
+    tracemalloc.start()
+    damper.update(data)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = None
+    for data in cycles(n_alerting, n_flapping, 6):
+        start = time.perf_counter()
+        damper.update(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"states memory                    : {memory / 1024 / 1024:.1f} MiB "
+          f"({memory / len(damper.states):.0f} bytes for each object)")
+    print(f"cycle                            : {best * 1000:.1f} ms - states {len(damper.states)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 50)
@@ -0,0 +1,125 @@
+"""
+Benchmark of the alerts grouped by root owner (K8S_GROUP_BY_OWNER): report of the pods with problem
+of many replica sets, then report of the same pods with a new state (ImagePullBackOff -> CrashLoopBackOff).
+The changed pods must be sent under the Changed Workloads title, not as new alerts.
+With the owners of the replica sets listed by the collector (alerts of the replica sets disabled)
+the pods are grouped under their deployment.
+
+Run from the src folder:
+    python -m benchmarks.bench_grouped_alerts [n_pods]
+"""
+import asyncio
+import sys
+
+from benchmarks.bench_message_builder import Queue, timed
+from benchmarks.bench_records_memory import new_string
+from libs.kubernetes_checker import KubernetesChecker
+from libs.kubernetes_owner_graph import KubernetesOwnerGraph
+from libs.kubernetes_records import PodRecord, ConditionsRecord, ContainerStatusRecord
+from utils.config import ConfigK8sProcess
+
+ENABLE_KEYS = ['namespace', 'phase', 'conditions', 'cs_0', 'own_kind', 'own_name']
+
+
+def pods(n_pods, reason):
+    """
+    Pods of one replica set every 10 pods, all with the same waiting reason
+    """
+    return {f'pod-{index}': PodRecord(new_string('cluster-prod'),
+                                      new_string(f'namespace-{index % 50}'),
+                                      new_string('Pending'),
+                                      ConditionsRecord(((new_string('Ready'), new_string('False')),)),
+                                      (ContainerStatusRecord(new_string('app:1.0.0'),
+                                                             0,
+                                                             False,
+                                                             False,
+                                                             new_string('Waiting'),
+                                                             new_string(reason)),),
+                                      True,
+                                      new_string('ReplicaSet'),
+                                      new_string(f'app-{index // 10}-5d8f7c'))
+            for index in range(n_pods)}
+
+
+def grouped_report(checker, queue, data, old_data):
+    """
+    One cycle of the unique message mode with the pods only
+    @return: plain text of the report
+    """
+    async def report():
+        await checker.__unpack_data__({checker.k8s_config.disp_MSG_key_start: True})
+        await checker.__process_key__(data, old_data, ENABLE_KEYS, 'Pod', kind='Pod')
+        await checker.__unpack_data__({checker.k8s_config.disp_MSG_key_end: True})
+
+    queue.items = []
+    asyncio.run(report())
+    return queue.items[-1]['text'] if queue.items else ''
+
+
+def replica_set_owners(n_pods):
+    """
+    Owners of the replica sets of the pods as listed by the collector: one deployment every 10 replica sets
+    """
+    return {(f'namespace-{index % 50}', f'app-{index // 10}-5d8f7c'): ('Deployment', f'app-{index // 100}')
+            for index in range(n_pods)}
+
+
+def new_checker(queue, owner_graph=None):
+    k8s_config = ConfigK8sProcess()
+    k8s_config.GROUP_by_owner = True
+    checker = KubernetesChecker(debug_on=False,
+                                dispatcher_queue=queue,
+                                dispatcher_max_msg_len=50000,
+                                dispatcher_alive_message_hours=0,
+                                k8s_key_config=k8s_config,
+                                k8s_owner_graph=owner_graph)
+    checker.print_helper.info = checker.print_helper.info_if = lambda *args, **kwargs: None
+    checker.print_helper.debug_if = lambda *args, **kwargs: None
+    return checker
+
+
+def main(n_pods):
+    image_pull = pods(n_pods, 'ImagePullBackOff')
+    crash_loop = pods(n_pods, 'CrashLoopBackOff')
+
+    def first_report():
+        queue = Queue()
+        checker = new_checker(queue)
+        return grouped_report(checker, queue, image_pull, {})
+
+    def changed_report():
+        queue = Queue()
+        checker = new_checker(queue)
+        grouped_report(checker, queue, image_pull, {})
+        return grouped_report(checker, queue, crash_loop, image_pull)
+
+    def deployment_report():
+        queue = Queue()
+        owner_graph = KubernetesOwnerGraph()
+        owner_graph.set_listed_owners('ReplicaSet', replica_set_owners(n_pods))
+        checker = new_checker(queue, owner_graph)
+        return grouped_report(checker, queue, image_pull, {})
+
+    first, first_message = timed(first_report)
+    changed, changed_message = timed(changed_report)
+    deployment, deployment_message = timed(deployment_report)
+
+    assert 'Workloads details:' in first_message and 'Changed Workloads details:' not in first_message
+    # the new state is reported as a change of the alert already sent
+    assert 'Changed Workloads details:' in changed_message
+    assert 'CrashLoopBackOff' in changed_message.split('Changed Workloads details:', 1)[1]
+    assert changed_message.count('Workloads details:') == changed_message.count('Changed Workloads details:')
+    # the listed owners are kept at the start of the report, the pods are grouped by deployment
+    assert '==========\nDeployment app-0 in namespace-0: 2 Pod' in deployment_message
+    assert '==========\nReplicaSet' not in deployment_message
+
+    print(f"pods                   : {n_pods}")
+    print(f"grouped report         : {first * 1000:.1f} ms - report {len(first_message) / 1024:.0f} KiB")
+    print(f"grouped changed report : {changed * 1000:.1f} ms (two cycles) - "
+          f"report {len(changed_message) / 1024:.0f} KiB")
+    print(f"grouped by deployment  : {deployment * 1000:.1f} ms - "
+          f"{deployment_message.count('==========')} deployments")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
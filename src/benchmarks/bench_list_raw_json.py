@@ -0,0 +1,109 @@
+"""
+Benchmark of the list response processing: client models vs raw json fast path.
+
+Run from the src folder:
+    python -m benchmarks.bench_list_raw_json [n_pods]
+"""
+import json
+import sys
+import time
+from types import SimpleNamespace
+
+from kubernetes import client
+
+from libs.kubernetes_pods import KubernetesGetPods
+from libs.kubernetes_raw import KubernetesRawItem
+from libs.kubernetes_raw import load_json
+
+# default phases of KubernetesGetPods.get_pods
+collector_phase = {"Running", "Completed", "ContainerCreating"}
+
+
+def build_pod(index):
+    """
+    Build a pod body similar to the one returned by the API server
+    """
+    waiting = index % 50 == 0
+    state = {'waiting': {'reason': 'CrashLoopBackOff', 'message': 'back-off'}} if waiting \
+        else {'running': {'startedAt': '2023-11-01T10:00:00Z'}}
+    return {'metadata': {'name': f'app-{index}-7d9f8c6b5-x2x4z',
+                         'namespace': f'namespace-{index % 100}',
+                         'uid': f'5b1a3c1e-0000-0000-0000-{index:012d}',
+                         'resourceVersion': str(100000 + index),
+                         'creationTimestamp': '2023-11-01T10:00:00Z',
+                         'labels': {'app': f'app-{index}', 'pod-template-hash': '7d9f8c6b5'},
+                         'annotations': {'kubectl.kubernetes.io/restartedAt': '2023-11-01T10:00:00Z'},
+                         'ownerReferences': [{'apiVersion': 'apps/v1', 'kind': 'ReplicaSet',
+                                              'name': f'app-{index}-7d9f8c6b5', 'uid': 'u',
+                                              'controller': True, 'blockOwnerDeletion': True}]},
+            'spec': {'nodeName': f'node-{index % 20}',
+                     'serviceAccountName': 'default',
+                     'containers': [{'name': 'app',
+                                     'image': f'registry.local/project/app:{index % 7}',
+                                     'ports': [{'containerPort': 8080, 'protocol': 'TCP'}],
+                                     'env': [{'name': f'ENV_{n}', 'value': str(n)} for n in range(10)],
+                                     'resources': {'limits': {'cpu': '500m', 'memory': '512Mi'},
+                                                   'requests': {'cpu': '100m', 'memory': '128Mi'}},
+                                     'volumeMounts': [{'name': 'data', 'mountPath': '/data'}]}],
+                     'volumes': [{'name': 'data', 'emptyDir': {}}]},
+            'status': {'phase': 'Running',
+                       'podIP': '10.0.0.1',
+                       'startTime': '2023-11-01T10:00:00Z',
+                       'conditions': [{'type': t, 'status': 'False' if waiting and t == 'Ready' else 'True',
+                                       'lastTransitionTime': '2023-11-01T10:00:00Z'}
+                                      for t in ('Initialized', 'Ready', 'ContainersReady', 'PodScheduled')],
+                       'containerStatuses': [{'name': 'app',
+                                              'image': f'registry.local/project/app:{index % 7}',
+                                              'imageID': 'sha256:0000',
+                                              'ready': not waiting,
+                                              'started': True,
+                                              'restartCount': 5 if waiting else 0,
+                                              'state': state}]}}
+
+
+def build_body(n_pods):
+    return json.dumps({'apiVersion': 'v1',
+                       'kind': 'PodList',
+                       'metadata': {'resourceVersion': '1'},
+                       'items': [build_pod(index) for index in range(n_pods)]}).encode()
+
+
+def run_models(collector, body):
+    api_client = client.ApiClient()
+    response = SimpleNamespace(data=body.decode())
+    pods = {}
+    for pod in api_client.deserialize(response, 'V1PodList').items:
+        add_phase, condition = collector.__get_pod_details__(pod, collector_phase, False)
+        if add_phase:
+            pods[pod.metadata.name] = condition
+    return pods
+
+
+def run_raw(collector, body):
+    pods = {}
+    for item in load_json(body)['items']:
+        pod = KubernetesRawItem(item)
+        add_phase, condition = collector.__get_pod_details__(pod, collector_phase, False)
+        if add_phase:
+            pods[pod.metadata.name] = condition
+    return pods
+
+
+def main():
+    n_pods = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    body = build_body(n_pods)
+    collector = KubernetesGetPods(debug_on=False, cluster_name='benchmark')
+
+    results = {}
+    for name, function in (('client models', run_models), ('raw json', run_raw)):
+        start = time.perf_counter()
+        results[name] = function(collector, body)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<14} {n_pods} pods {elapsed:.3f} s - {len(results[name])} pods with problem")
+
+    if results['client models'] != results['raw json']:
+        print("ERROR the two paths return different data")
+
+
+if __name__ == "__main__":
+    main()
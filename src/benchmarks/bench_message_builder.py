@@ -0,0 +1,152 @@
+"""
+Benchmark of the report messages of the checker with many entries:
+previous concatenation of immutable strings (item, message and final report)
+and the fragments of utils/message_builder.py.
+The report is written as in the unique message mode: the messages cut at max_msg_len are
+concatenated in the final report sent at the end of the cycle.
+Without max_msg_len the configured range is measured: default Telegram max length, Telegram API limit
+and default max message length.
+
+Run from the src folder:
+    python -m benchmarks.bench_message_builder [n_entries] [max_msg_len]
+"""
+import asyncio
+import gc
+import sys
+import time
+
+from benchmarks.bench_diff_engine import timed as timed_alternate
+from benchmarks.bench_records_memory import pod_record
+from libs.kubernetes_checker import KubernetesChecker
+from libs.kubernetes_records import render_value
+from utils.config import ConfigDispatcher
+from utils.message_builder import MessageBuilder
+
+
+def entries(n_entries):
+    return {f'pod-{index}': render_value(pod_record(index)) for index in range(n_entries)}
+
+
+def render_item(name, details):
+    """
+    Item written in one fragment, as the item templates of the checker: the lines are joined once
+    """
+    lines = [f"----------\n", f"{name}\n"]
+    for key, value in details.items():
+        if isinstance(value, dict):
+            lines.append(f"{key}:\n")
+            lines.extend(f"   {key_n}= {value_n}\n" for key_n, value_n in value.items())
+        elif value is not None:
+            lines.append(f"{key}= {value}\n")
+    return ''.join(lines)
+
+
+def previous_report(data, max_msg_len):
+    """
+    Concatenation of __process_key__ and send_to_dispatcher before the message builder
+    """
+    final_message = ""
+    base_title = 'Pod details:\n'
+    msg = base_title
+    for name, details in data.items():
+        item_msg = f"----------\n"
+        item_msg += f"{name}\n"
+        for key, value in details.items():
+            if isinstance(value, dict):
+                item_msg += f"{key}:\n"
+                for key_n, value_n in value.items():
+                    item_msg += f"   {key_n}= {value_n}\n"
+            elif value is not None:
+                item_msg += f"{key}= {value}\n"
+        msg += item_msg
+        if len(msg) >= max_msg_len:
+            final_message = f"{final_message}\n{'-' * 20}\n{msg}" if len(final_message) > 0 else f"{msg}"
+            msg = base_title
+    if len(msg) > len(base_title):
+        final_message = f"{final_message}\n{'-' * 20}\n{msg}" if len(final_message) > 0 else f"{msg}"
+    return f"Start report\n{final_message}\nEnd report"
+
+
+def builder_report(data, max_msg_len):
+    """
+    Same report with the message builder
+    """
+    final_message = MessageBuilder()
+    msg = MessageBuilder('Pod details:\n')
+    for name, details in data.items():
+        msg.append(render_item(name, details))
+        if len(msg) >= max_msg_len:
+            if len(final_message) > 0:
+                final_message.append(f"\n{'-' * 20}\n")
+            final_message.append(msg.flush())
+    if not msg.is_empty():
+        if len(final_message) > 0:
+            final_message.append(f"\n{'-' * 20}\n")
+        final_message.append(msg.flush())
+    return MessageBuilder("Start report\n").extend(final_message).append("\nEnd report").build()
+
+
+class Queue:
+    def __init__(self):
+        self.items = []
+
+    async def put(self, item):
+        self.items.append(item)
+
+
+def checker_report(data, max_msg_len):
+    """
+    Report of the checker: __send_items__ of all the entries and send_to_dispatcher_summary
+    """
+    queue = Queue()
+    checker = KubernetesChecker(debug_on=False,
+                                dispatcher_queue=queue,
+                                dispatcher_max_msg_len=max_msg_len)
+    checker.print_helper.info = checker.print_helper.info_if = lambda *args, **kwargs: None
+
+    async def report():
+        checker.unique_message = True
+        await checker.__send_items__(data, None, 'Pod')
+        await checker.send_to_dispatcher_summary()
+
+    asyncio.run(report())
+    # plain text of the report
+    return queue.items[0]['text']
+
+
+def timed(function, repeat=5):
+    best = None
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(n_entries, max_msg_lens):
+    data = entries(n_entries)
+    print(f"entries              : {n_entries}")
+    for max_msg_len in max_msg_lens:
+        (previous, previous_message), (builder, builder_message) = timed_alternate(
+            [lambda: previous_report(data, max_msg_len), lambda: builder_report(data, max_msg_len)], repeat=15)
+        checker, checker_message = timed(lambda: checker_report(data, max_msg_len))
+        assert previous_message == builder_message
+        # same load of the machine for both, margin for the timer noise
+        assert builder <= previous * 1.1, f"message builder slower at max length {max_msg_len}"
+
+        print(f"max message length   : {max_msg_len} - report {len(builder_message) / 1024:.0f} KiB")
+        print(f"previous concatenate : {previous * 1000:.1f} ms")
+        print(f"message builder      : {builder * 1000:.1f} ms")
+        print(f"checker report       : {checker * 1000:.1f} ms - report {len(checker_message) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    dispatcher_config = ConfigDispatcher()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         [int(sys.argv[2])] if len(sys.argv) > 2 else [dispatcher_config.telegram_max_msg_len, 4096,
+                                                       dispatcher_config.max_msg_len])
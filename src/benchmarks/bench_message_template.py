@@ -0,0 +1,73 @@
+"""
+Benchmark of the rendering of the items with the message templates (utils/message_template.py):
+previous hand-assembled plain text and the templates with their static fragments rendered once,
+for the plain text channel and for plain text + Telegram HTML.
+
+Run from the src folder:
+    python -m benchmarks.bench_message_template [n_items]
+"""
+import sys
+
+from benchmarks.bench_diff_engine import timed
+from benchmarks.bench_records_memory import pod_record
+from libs.kubernetes_records import render_value
+from utils.message_template import MessageTemplates
+
+ENABLE_KEYS = ['cluster', 'namespace', 'started', 'own_controller', 'own_kind', 'own_name',
+               'conditions', 'cs_0', 'cs_1', 'cs_2', 'cs_3']
+
+
+def previous_render(data, enable_keys):
+    """
+    Plain text of the items as written by the checker before the templates
+    """
+    fragments = []
+    for name, details in data.items():
+        item_msg = f"----------\n"
+        item_msg += f"{name}\n"
+        for key, value in render_value(details).items():
+            if key not in enable_keys:
+                continue
+            if isinstance(value, dict):
+                item_msg += f"{key}:\n"
+                for key_n, value_n in value.items():
+                    if value_n is not None and len(value_n) > 0:
+                        if not isinstance(value_n, dict):
+                            item_msg += f"   {key_n}= {value_n}\n"
+                        else:
+                            item_msg += f"{key_n}:\n"
+                            for key_m, value_m in value_n.items():
+                                item_msg += f"   {key_m}= {value_m}\n"
+            elif value is not None and len(str(value)) > 0:
+                item_msg += f"{key}= {value}\n"
+        fragments.append(item_msg)
+    return fragments
+
+
+def templates_render(templates, data, enable_keys):
+    return [templates.render_item('Pod', enable_keys, name, details) for name, details in data.items()]
+
+
+def main(n_items):
+    data = {f'pod-{index}': pod_record(index) for index in range(n_items)}
+    text_templates = MessageTemplates(['text'])
+    text_templates.add_items('Pod', ENABLE_KEYS)
+    html_templates = MessageTemplates(['text', 'html'])
+    html_templates.add_items('Pod', ENABLE_KEYS)
+    (previous, previous_fragments), (text, text_fragments), (html, html_fragments) = timed(
+        [lambda: previous_render(data, ENABLE_KEYS),
+         lambda: templates_render(text_templates, data, ENABLE_KEYS),
+         lambda: templates_render(html_templates, data, ENABLE_KEYS)], repeat=25)
+    assert [fragment['text'] for fragment in text_fragments] == previous_fragments
+    assert [fragment['text'] for fragment in html_fragments] == previous_fragments
+    # same load of the machine for both, margin for the timer noise
+    assert text <= previous * 1.1, "templates slower than the previous plain text"
+
+    print(f"items                          : {n_items}")
+    print(f"previous plain text            : {previous * 1000:.1f} ms")
+    print(f"templates text                 : {text * 1000:.1f} ms")
+    print(f"templates text+html            : {html * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
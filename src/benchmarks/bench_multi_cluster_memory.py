@@ -0,0 +1,116 @@
+"""
+Benchmark of the memory used by each cluster in multi cluster mode (PROCESS_KUBE_CONTEXTS).
+The pipelines are built on a generated kube config, no request is sent to the clusters.
+
+Run from the src folder:
+    python -m benchmarks.bench_multi_cluster_memory [n_clusters]
+"""
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+from kubernetes.config import kube_config
+
+from libs.kubernetes_checker import KubernetesChecker
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
+from libs.kubernetes_status_run import KubernetesStatusRun
+from utils.config import ConfigK8sProcess
+
+
+def write_kube_config(n_clusters):
+    """
+    Write a kube config with one context for each cluster
+    @return: path of the file
+    """
+    kube_config_body = {'apiVersion': 'v1',
+                        'kind': 'Config',
+                        'clusters': [{'name': f'cluster-{index}',
+                                      'cluster': {'server': f'https://cluster-{index}.invalid:6443',
+                                                  'insecure-skip-tls-verify': True}}
+                                     for index in range(n_clusters)],
+                        'users': [{'name': f'user-{index}', 'user': {'token': f'token-{index}'}}
+                                  for index in range(n_clusters)],
+                        'contexts': [{'name': f'context-{index}',
+                                      'context': {'cluster': f'cluster-{index}', 'user': f'user-{index}'}}
+                                     for index in range(n_clusters)],
+                        'current-context': 'context-0'}
+    file = tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False)
+    yaml.safe_dump(kube_config_body, file)
+    file.close()
+    return file.name
+
+
+def build_pipelines(config_file, n_clusters, k8s_config, executor, rate_limiter):
+    """
+    Build one reader and one checker for each cluster as main_start does
+    """
+    dispatcher_queue = asyncio.Queue()
+    # as main_start: the kube config is parsed once
+    kube_config_dict = kube_config.KubeConfigMerger(config_file).config
+    pipelines = []
+    for index in range(n_clusters):
+        queue = asyncio.Queue()
+        pipelines.append(KubernetesStatusRun(kube_load_method=True,
+                                             kube_config_file=config_file,
+                                             debug_on=False,
+                                             queue=queue,
+                                             k8s_key_config=k8s_config,
+                                             kube_context=f'context-{index}',
+                                             executor=executor,
+                                             rate_limiter=rate_limiter,
+                                             kube_config_dict=kube_config_dict))
+        pipelines.append(KubernetesChecker(debug_on=False,
+                                           queue=queue,
+                                           dispatcher_queue=dispatcher_queue,
+                                           k8s_key_config=k8s_config,
+                                           kube_context=f'context-{index}'))
+    return pipelines
+
+
+def measure(config_file, n_clusters, k8s_config, executor, rate_limiter):
+    """
+    Memory allocated by the pipelines
+    @return: bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    pipelines = build_pipelines(config_file, n_clusters, k8s_config, executor, rate_limiter)
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del pipelines
+    return end - start
+
+
+def main(n_clusters):
+    config_file = write_kube_config(n_clusters)
+    k8s_config = ConfigK8sProcess()
+    executor = ThreadPoolExecutor(max_workers=k8s_config.API_max_workers, thread_name_prefix='k8s_api')
+    rate_limiter = KubernetesRateLimiter(False, qps=k8s_config.API_qps, burst=k8s_config.API_burst)
+    try:
+        # warm up: imports and caches of the client
+        measure(config_file, 1, k8s_config, executor, rate_limiter)
+
+        one = measure(config_file, 1, k8s_config, executor, rate_limiter)
+        many = measure(config_file, n_clusters, k8s_config, executor, rate_limiter)
+        threads = threading.active_count()
+    finally:
+        executor.shutdown()
+        os.remove(config_file)
+
+    print(f"clusters         : {n_clusters}")
+    print(f"1 cluster        : {one / 1024:.1f} KiB")
+    print(f"{n_clusters} clusters      : {many / 1024:.1f} KiB")
+    print(f"for each cluster : {many / n_clusters / 1024:.1f} KiB")
+    print(f"threads          : {threads}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,95 @@
+"""
+Benchmark of the memory used by a snapshot of pods kept as nested dicts (previous format)
+and as slotted records (libs/kubernetes_records.py).
+The strings are built for each pod as the json decoder does, the records intern them.
+
+Run from the src folder:
+    python -m benchmarks.bench_records_memory [n_pods ...]
+"""
+import gc
+import sys
+import tracemalloc
+
+from libs.kubernetes_records import PodRecord, ConditionsRecord, ContainerStatusRecord
+
+
+def new_string(value):
+    """
+    New string object with the same value (as decoded from each api response)
+    """
+    return ''.join(list(value))
+
+
+def pod_dict(index):
+    """
+    Pod details in the previous format
+    """
+    return {'cluster': new_string('cluster-prod'),
+            'namespace': new_string(f'namespace-{index % 50}'),
+            'phase': new_string('Running'),
+            'conditions': {new_string('Initialized'): new_string('True'),
+                           new_string('Ready'): new_string('False'),
+                           new_string('ContainersReady'): new_string('False'),
+                           new_string('PodScheduled'): new_string('True')},
+            'cs_0': {'image': new_string('app:1.0.0'),
+                     'restart': f"{index % 7}",
+                     'ready': f"{False}",
+                     'started': f"{True}",
+                     'state': {'Waiting': 'True', 'reason': new_string('CrashLoopBackOff')}},
+            'own_controller': True,
+            'own_kind': new_string('ReplicaSet'),
+            'own_name': new_string(f'app-{index % 500}-5d8f7c')}
+
+
+def pod_record(index):
+    """
+    Pod details as record
+    """
+    return PodRecord(new_string('cluster-prod'),
+                     new_string(f'namespace-{index % 50}'),
+                     new_string('Running'),
+                     ConditionsRecord(((new_string('Initialized'), new_string('True')),
+                                       (new_string('Ready'), new_string('False')),
+                                       (new_string('ContainersReady'), new_string('False')),
+                                       (new_string('PodScheduled'), new_string('True')))),
+                     (ContainerStatusRecord(new_string('app:1.0.0'),
+                                            index % 7,
+                                            False,
+                                            True,
+                                            new_string('Waiting'),
+                                            new_string('CrashLoopBackOff')),),
+                     True,
+                     new_string('ReplicaSet'),
+                     new_string(f'app-{index % 500}-5d8f7c'))
+
+
+def measure(build, n_pods):
+    """
+    Memory retained by a snapshot of n_pods
+    @return: bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    snapshot = {f'pod-{index}': build(index) for index in range(n_pods)}
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del snapshot
+    return end - start
+
+
+def main(sizes):
+    # the rendered message must not change
+    assert pod_record(1).to_dict() == pod_dict(1)
+
+    print(f"{'pods':>8} {'dict MiB':>10} {'record MiB':>11} {'saved':>7}")
+    for n_pods in sizes:
+        as_dict = measure(pod_dict, n_pods)
+        as_record = measure(pod_record, n_pods)
+        print(f"{n_pods:>8} {as_dict / 1024 / 1024:>10.1f} {as_record / 1024 / 1024:>11.1f} "
+              f"{100 - as_record * 100 / as_dict:>6.0f}%")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000, 100000])
@@ -0,0 +1,105 @@
+"""
+Benchmark of the split of the Telegram messages written in HTML parse mode (libs/dispatcher_telegram.py):
+previous split at a fixed length and split at the end of the lines.
+Each message sent in HTML must have all its tags closed, a report with a line longer than the max
+message length is sent as plain text.
+
+Run from the src folder:
+    python -m benchmarks.bench_telegram_split [n_items] [max_msg_len]
+"""
+import sys
+from html.parser import HTMLParser
+
+from benchmarks.bench_message_builder import timed
+from benchmarks.bench_records_memory import pod_record
+from libs.dispatcher_telegram import DispatcherTelegram
+from utils.config import ConfigDispatcher
+from utils.message_builder import ChannelMessageBuilder
+from utils.message_template import MessageTemplates
+
+ENABLE_KEYS = ['cluster', 'namespace', 'conditions', 'cs_0', 'own_kind', 'own_name']
+
+
+class TagChecker(HTMLParser):
+    """
+    Stack of the open tags of a message, as checked by the HTML parse mode
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stack = []
+        self.valid = True
+
+    def handle_starttag(self, tag, attrs):
+        self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if not self.stack or self.stack.pop() != tag:
+            self.valid = False
+
+
+def is_valid_html(message):
+    checker = TagChecker()
+    checker.feed(message)
+    checker.close()
+    return checker.valid and not checker.stack
+
+
+def report(n_items, long_value=None):
+    """
+    Report of the checker in plain text and HTML
+    @param long_value: value of an item longer than the max message length
+    """
+    templates = MessageTemplates(['text', 'html'])
+    templates.add_items('Pod', ENABLE_KEYS)
+    msg = ChannelMessageBuilder(templates.render('report_start'))
+    msg.append(templates.render('title', title='Pod'))
+    for index in range(n_items):
+        msg.append(templates.render_item('Pod', ENABLE_KEYS, f'pod-{index}', pod_record(index)))
+    if long_value is not None:
+        msg.append(templates.render_item('Pod', ['namespace'], 'pod-long', {'namespace': long_value}))
+    msg.append(templates.render('report_end'))
+    return msg.build()
+
+
+def new_dispatcher(max_msg_len):
+    dispatcher_config = ConfigDispatcher()
+    dispatcher_config.telegram_parse_mode = 'HTML'
+    dispatcher_config.telegram_max_msg_len = max_msg_len
+    dispatcher = DispatcherTelegram(debug_on=False, dispatcher_config=dispatcher_config)
+    dispatcher.print_helper.info = dispatcher.print_helper.info_if = lambda *args, **kwargs: None
+    dispatcher.print_helper.wrn = lambda *args, **kwargs: None
+    return dispatcher
+
+
+def main(n_items, max_msg_len):
+    dispatcher = new_dispatcher(max_msg_len)
+
+    item = report(n_items)
+    previous, previous_messages = timed(lambda: dispatcher.class_strings.split_string(item['html'],
+                                                                                      max_msg_len, '\n'))
+    split, (messages, parse_mode) = timed(lambda: dispatcher.__split_message__(item))
+    assert parse_mode == 'HTML'
+    assert all(len(message) <= max_msg_len and is_valid_html(message) for message in messages)
+    assert ''.join(messages).replace('\n', '') == item['html'].replace('\n', '')
+
+    # a line longer than the max length: the whole report is sent as plain text
+    long_item = report(n_items, '<ns>&' * max_msg_len)
+    long_messages, long_parse_mode = dispatcher.__split_message__(long_item)
+    assert long_parse_mode is None
+    # the plain text split strips the spaces at the cuts
+    assert ''.join(''.join(long_messages).split()) == ''.join(long_item['text'].split())
+    broken = [message for message in dispatcher.class_strings.split_string(long_item['html'], max_msg_len, '\n')
+              if not is_valid_html(message)]
+
+    print(f"items                : {n_items} - max message length {max_msg_len} - "
+          f"report {len(item['html']) / 1024:.0f} KiB")
+    print(f"previous split       : {previous * 1000:.1f} ms - {len(previous_messages)} messages")
+    print(f"split at line ends   : {split * 1000:.1f} ms - {len(messages)} messages")
+    print(f"long line            : previous split {len(broken)} messages with broken tags - "
+          f"now {len(long_messages)} plain text messages")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 3000)
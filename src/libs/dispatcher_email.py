@@ -99,6 +99,10 @@ class DispatcherEmail:
                 self.print_helper.info_if(self.print_debug,
                                           f"email channel: new element received")
 
+                # message written for each channel: plain text
+                if isinstance(item, dict):
+                    item = item.get('text', '')
+
                 if item is not None and len(item) > 0:
                     await self.send_email(item)
 
@@ -1,4 +1,5 @@
 import asyncio
+import re
 import requests
 from datetime import datetime
 from utils.config import ConfigK8sProcess
@@ -6,6 +7,10 @@ from utils.config import ConfigDispatcher
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_async_method
 from utils.strings import ClassString
+from utils.message_template import PARSE_MODE_CHANNELS
+
+# opening and closing tags of the HTML parse mode
+HTML_TAG = re.compile(r'<(/?)[a-zA-Z]+[^>]*>')
 
 
 class DispatcherTelegram:
@@ -37,6 +42,9 @@ class DispatcherTelegram:
         self.telegram_enable = dispatcher_config.telegram_enable
         self.telegram_max_msg_len = dispatcher_config.telegram_max_msg_len
         self.telegram_rate_minute = dispatcher_config.telegram_rate_limit
+        # messages written by the checkers in the format of the parse mode
+        self.telegram_parse_mode = dispatcher_config.telegram_parse_mode
+        self.telegram_channel = PARSE_MODE_CHANNELS.get(self.telegram_parse_mode)
 
         self.telegram_last_minute = 0
         self.telegram_last_rate = 0
@@ -74,10 +82,11 @@ class DispatcherTelegram:
             self.print_helper.error_and_exception(f"__can_send_message__", err)
 
     @handle_exceptions_async_method
-    async def send_to_telegram(self, message):
+    async def send_to_telegram(self, message, parse_mode=None):
         """
         Send message to telegram
         @param message: body message
+        @param parse_mode: HTML or MarkdownV2 (None plain text)
         """
         self.print_helper.info(f"send_to_telegram")
         await self.__can_send_message__()
@@ -86,9 +95,11 @@ class DispatcherTelegram:
                 api_url = f'https://api.telegram.org/bot{self.telegram_api_token}/sendMessage'
                 try:
 
-                    response = requests.post(api_url, json={'chat_id': self.telegram_chat_ID,
-                                                            'text': message})
-                    # 'parse_mode': 'MarkdownV2'
+                    body = {'chat_id': self.telegram_chat_ID,
+                            'text': message}
+                    if parse_mode is not None:
+                        body['parse_mode'] = parse_mode
+                    response = requests.post(api_url, json=body)
                     # LS 2023.10.28 truncate the response
                     self.print_helper.info(f"send_to_telegram.response {response.text[1:10]}")
 
@@ -103,6 +114,59 @@ class DispatcherTelegram:
         else:
             self.print_helper.info(f"send_to_telegram[Disable send...only std out]=\n{message}")
 
+    def __split_parse_mode__(self, message, parse_mode):
+        """
+        Split a message of the parse mode at the end of the lines: the tags and the escapes are never cut.
+        The lines are joined up to the max message length
+        @param message: message in the format of the parse mode
+        @param parse_mode: HTML or MarkdownV2
+        @return: list of messages, None if a line is longer than the max length or a tag is open across the lines
+        """
+        messages = []
+        lines = []
+        length = 0
+        # HTML tags opened and not closed in the current lines
+        open_tags = 0
+        for line in message.splitlines(keepends=True):
+            if len(line) > self.telegram_max_msg_len:
+                return None
+            if length + len(line) > self.telegram_max_msg_len:
+                if open_tags != 0:
+                    return None
+                messages.append(''.join(lines).strip('\n'))
+                lines = []
+                length = 0
+            lines.append(line)
+            length += len(line)
+            if parse_mode == 'HTML':
+                for closing in HTML_TAG.findall(line):
+                    open_tags += -1 if closing else 1
+        if lines:
+            messages.append(''.join(lines).strip('\n'))
+        return [message for message in messages if len(message) > 0]
+
+    def __split_message__(self, item):
+        """
+        Messages to send for an item of the queue
+        @param item: str plain text or dict channel -> str
+        @return: tuple (list of messages, parse mode or None)
+        """
+        if not isinstance(item, dict):
+            return self.class_strings.split_string(item, self.telegram_max_msg_len, '\n'), None
+
+        text = item.get('text', '')
+        if self.telegram_channel in item:
+            # split at the end of the lines, the tags of the parse mode are not across the lines
+            messages = self.__split_parse_mode__(item[self.telegram_channel], self.telegram_parse_mode)
+            if messages is not None:
+                return messages, self.telegram_parse_mode
+            # a line longer than the max length cannot be cut without breaking the parse mode
+            self.print_helper.wrn(f"message not split at the end of the lines for {self.telegram_parse_mode}. "
+                                  f"Send as plain text")
+        if text is None or len(text) == 0:
+            return [], None
+        return self.class_strings.split_string(text, self.telegram_max_msg_len, '\n'), None
+
     @handle_exceptions_async_method
     async def run(self):
         """
@@ -121,11 +185,11 @@ class DispatcherTelegram:
                 self.print_helper.info_if(self.print_debug,
                                           f"telegram channel: new element received")
 
+                # message written for each channel: the format of the parse mode or plain text
                 if item is not None and len(item) > 0:
-                    messages = self.class_strings.split_string(item,
-                                                               self.telegram_max_msg_len, '\n')
+                    messages, parse_mode = self.__split_message__(item)
                     for message in messages:
-                        await self.send_to_telegram(message)
+                        await self.send_to_telegram(message, parse_mode)
 
         except Exception as err:
             self.print_helper.error_and_exception(f"run", err)
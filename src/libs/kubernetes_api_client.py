@@ -0,0 +1,100 @@
+import socket
+
+from kubernetes import client
+from urllib3.connection import HTTPConnection
+from utils.print_helper import PrintHelper
+from utils.handle_error import handle_exceptions_method
+
+
+class KubernetesApiClient:
+    """
+    One ApiClient with an explicit connection pool shared by all the k8s API instances
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 configuration: client.Configuration = None,
+                 pool_size=0,
+                 tcp_keepalive=True):
+
+        self.print_helper = PrintHelper('kubernetes_api_client', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        self.configuration = configuration
+        if self.configuration is None:
+            self.configuration = client.Configuration.get_default_copy()
+
+        # max connections kept open to the API server. The default of the client depends on the number of cpu
+        if pool_size > 0:
+            self.configuration.connection_pool_maxsize = pool_size
+        self.print_helper.info(f"connection pool size {self.configuration.connection_pool_maxsize}")
+
+        self.api_client = client.ApiClient(self.configuration)
+
+        # the idle connections between two cycles are not closed by NAT or load balancers
+        if tcp_keepalive:
+            self.__enable_tcp_keepalive__()
+
+    def __enable_tcp_keepalive__(self):
+        """
+        Enable the TCP keep-alive on the sockets opened by the pool
+        """
+        socket_options = list(HTTPConnection.default_socket_options)
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # linux only
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 30))
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3))
+        self.api_client.rest_client.pool_manager.connection_pool_kw['socket_options'] = socket_options
+
+    def core_v1(self):
+        """
+        CoreV1Api on the shared client
+        """
+        return client.CoreV1Api(self.api_client)
+
+    def apps_v1(self):
+        """
+        AppsV1Api on the shared client
+        """
+        return client.AppsV1Api(self.api_client)
+
+    def coordination_v1(self):
+        """
+        CoordinationV1Api (leases) on the shared client
+        """
+        return client.CoordinationV1Api(self.api_client)
+
+    @handle_exceptions_method
+    def get_pool_stats(self):
+        """
+        Counters of the connection pools. The requests served without a new connection reused one
+        @return: dict with requests, connections and reused
+        """
+        pools = self.api_client.rest_client.pool_manager.pools
+        requests = 0
+        connections = 0
+        for key in pools.keys():
+            pool = pools[key]
+            requests += pool.num_requests
+            connections += pool.num_connections
+
+        return {'pools': len(pools),
+                'requests': requests,
+                'connections': connections,
+                'reused': requests - connections}
+
+    def print_pool_stats(self):
+        """
+        Log the counters of the connection pools
+        """
+        stats = self.get_pool_stats()
+        if stats is not None and 'requests' in stats:
+            self.print_helper.info(f"api connection pool: requests {stats['requests']} - "
+                                   f"new connections {stats['connections']} - "
+                                   f"reused {stats['reused']}")
@@ -2,6 +2,13 @@ import calendar
 from datetime import datetime
 
 from utils.config import ConfigK8sProcess
+from libs.kubernetes_lease import KubernetesShardCoordinator
+from libs.kubernetes_events import KubernetesEventWatcher
+from libs.kubernetes_owner_graph import KubernetesOwnerGraph
+from libs.kubernetes_diff import KubernetesDiff
+from libs.kubernetes_flap_damper import KubernetesFlapDamper
+from utils.message_builder import MessageBuilder, ChannelMessageBuilder
+from utils.message_template import MessageTemplates
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_async_method
 
@@ -18,9 +25,15 @@ class KubernetesChecker:
                  dispatcher_queue=None,
                  dispatcher_max_msg_len=8000,
                  dispatcher_alive_message_hours=24,
-                 k8s_key_config: ConfigK8sProcess = None):
-
-        self.print_helper = PrintHelper('k8s_checker', logger)
+                 k8s_key_config: ConfigK8sProcess = None,
+                 kube_context=None,
+                 k8s_shard: KubernetesShardCoordinator = None,
+                 k8s_events: KubernetesEventWatcher = None,
+                 dispatcher_channels=None,
+                 k8s_owner_graph: KubernetesOwnerGraph = None):
+
+        self.print_helper = PrintHelper('k8s_checker' if kube_context is None else f'k8s_checker_{kube_context}',
+                                        logger)
         self.print_debug = debug_on
 
         self.print_helper.debug_if(self.print_debug,
@@ -35,6 +48,9 @@ class KubernetesChecker:
         if k8s_key_config is not None:
             self.k8s_config = k8s_key_config
 
+        # messages written in the format of each channel of the dispatcher (e.g. plain text and Telegram HTML)
+        self.message_templates = MessageTemplates(dispatcher_channels)
+
         self.old_node_status = {}
         self.old_pods = {}
         self.old_stateful_set = {}
@@ -44,6 +60,32 @@ class KubernetesChecker:
         self.old_pv = {}
         self.old_deployment = {}
 
+        # fingerprints of the items received for each title
+        self.k8s_diffs = {}
+        # flap damping of the alerts for each title (None: the items are reported at the first change)
+        self.k8s_flap_dampers = None
+        if (self.k8s_config.ALERT_raise_cycles > 1
+                or self.k8s_config.ALERT_clear_cycles > 1
+                or self.k8s_config.FLAP_window > 0):
+            self.k8s_flap_dampers = {}
+
+        # kinds received as stale (API server not available), the old data is kept
+        self.stale_kinds = set()
+
+        # sharded mode: the namespaces of this replica can change when the replicas change
+        self.k8s_shard = k8s_shard
+        # recent warning events of the objects attached to the messages
+        self.k8s_events = k8s_events
+
+        # alerts of pods and workloads grouped by root owner in the report
+        self.k8s_owner_graph = None
+        if self.k8s_config.GROUP_by_owner:
+            # shared with the collectors (owners of all the replica sets listed)
+            self.k8s_owner_graph = k8s_owner_graph if k8s_owner_graph is not None else KubernetesOwnerGraph()
+        self.grouped_items = []
+        # kinds in owner order: the roots first
+        self.grouped_kinds = ['Deployment', 'StatefulSet', 'DaemonSet', 'ReplicaSet', 'Pod']
+
         self.alive_message_seconds = dispatcher_alive_message_hours * 3600
         self.last_send = calendar.timegm(datetime.today().timetuple())
 
@@ -55,7 +97,7 @@ class KubernetesChecker:
 
         # LS 2023.11.03 add final message for concat data all keys in a one message
         # Not required a unique message
-        self.final_message = ""
+        self.final_message = ChannelMessageBuilder()
         # Not required a unique message
         self.unique_message = False
 
@@ -77,22 +119,29 @@ class KubernetesChecker:
         """
         Send message to dispatcher engine
         @param force_message: send message immediately
-        @param message: message to send
+        @param message: message to send, str plain text or dict channel -> str
         """
-        self.print_helper.info(f"send_to_dispatcher. msg len= {len(message)}")
-        if len(message) > 0:
+        if isinstance(message, dict):
+            message_len = len(message.get('text', ''))
+        else:
+            message_len = len(message)
+        self.print_helper.info(f"send_to_dispatcher. msg len= {message_len}")
+        if message_len > 0:
             if not self.unique_message or force_message:
                 self.last_send = calendar.timegm(datetime.today().timetuple())
                 await self.__put_in_queue__(self.dispatcher_queue,
                                             message)
             else:
+                if not isinstance(message, dict):
+                    # plain text escaped for each channel of the report
+                    message = self.message_templates.render('text', text=message)
 
                 if len(self.final_message) > 0:
                     self.print_helper.info(f"send_to_dispatcher. concat message- len({len(self.final_message)})")
-                    self.final_message = f"{self.final_message}\n{'-'*20}\n{message}"
+                    self.final_message.append(self.message_templates.render('report_separator'))
                 else:
                     self.print_helper.info(f"send_to_dispatcher. start message")
-                    self.final_message = f"{message}"
+                self.final_message.append(message)
 
     @handle_exceptions_async_method
     async def send_to_dispatcher_summary(self):
@@ -103,12 +152,14 @@ class KubernetesChecker:
         self.print_helper.info(f"send_to_dispatcher_summary. message-len= {len(self.final_message)}")
         # Chck if the final message is not empty
         if len(self.final_message) > 10:
-            self.final_message = f"Start report\n{self.final_message}\nEnd report"
+            report = (ChannelMessageBuilder(self.message_templates.render('report_start'))
+                      .extend(self.final_message)
+                      .append(self.message_templates.render('report_end')))
             self.last_send = calendar.timegm(datetime.today().timetuple())
             await self.__put_in_queue__(self.dispatcher_queue,
-                                        self.final_message)
+                                        report.build())
 
-        self.final_message = ""
+        self.final_message = ChannelMessageBuilder()
         self.unique_message = False
 
     @handle_exceptions_async_method
@@ -117,7 +168,7 @@ class KubernetesChecker:
                               old_data,
                               enable_keys,
                               title,
-                              resolved: bool = False):
+                              kind=None):
         """
          Process k8s elements (extracted from API), compared data with old data
          and push new msg in a queue if required
@@ -125,112 +176,234 @@ class KubernetesChecker:
         :param old_data: second-to-last data received
         :param enable_keys: keys dict to process for creating the message
         :param title: title of k8s element (e.g. Pods, Replica Sets...)
+        :param kind: k8s kind of the elements for reading their events and owners (e.g. Pod)
         """
         try:
             self.print_helper.info(f"__process_key__")
 
-            # compare new data with old data
-            if old_data == data:
-                self.print_helper.info(f"{title} new data is equal to old data. skip all")
+            if self.__is_grouped__(kind):
+                self.k8s_owner_graph.add_items(kind, data)
+
+            # fingerprints of the enable keys of the last data received
+            if title not in self.k8s_diffs:
+                self.k8s_diffs[title] = KubernetesDiff(enable_keys)
+            new, changed, resolved = self.k8s_diffs[title].update(data)
+            # the items of the namespaces moved to another replica are not resolved
+            resolved = resolved & old_data.keys() if old_data else set()
+            resolved_data = {name: old_data[name] for name in old_data.keys() if name in resolved} if resolved else {}
+
+            flapping = {}
+            if self.k8s_flap_dampers is not None:
+                if title not in self.k8s_flap_dampers:
+                    self.k8s_flap_dampers[title] = KubernetesFlapDamper(self.k8s_config.ALERT_raise_cycles,
+                                                                        self.k8s_config.ALERT_clear_cycles,
+                                                                        self.k8s_config.FLAP_window,
+                                                                        self.k8s_config.FLAP_changes)
+                damper = self.k8s_flap_dampers[title]
+                # the items are reported and resolved after the hysteresis cycles, not when they change
+                new, cleared, flapping = damper.update(data)
+                changed = {name for name in changed if name not in new and damper.is_reported(name)}
+                resolved_data = self.__owned_items__(cleared)
+
+            self.print_helper.info(f"{title} new {len(new)} - changed {len(changed)} - "
+                                   f"resolved {len(resolved_data)} - flapping {len(flapping)}")
+
+            if not new and not changed and not resolved_data and not flapping:
+                self.print_helper.info(f"{title} no new, changed or resolved items. skip all")
+                return
+
+            await self.__send_items__({name: data[name] for name in data.keys() if name in new},
+                                      enable_keys,
+                                      title,
+                                      kind=kind)
+
+            if changed:
+                # items already sent with a new state of the enable keys (e.g. ImagePullBackOff -> CrashLoopBackOff)
+                self.print_helper.info(f"process changed items for {title}")
+                await self.__send_items__({name: data[name] for name in data.keys() if name in changed},
+                                          enable_keys,
+                                          f"Changed {title}",
+                                          kind=kind,
+                                          group_title='Changed Workloads')
+
+            if flapping:
+                # one message for the items started flapping, their alerts are suppressed until they are stable.
+                # Written as the resolved items: without events and not grouped
+                self.print_helper.info(f"process flapping items for {title}")
+                await self.__send_items__({name: {'namespace': details.get('namespace'),
+                                                  'changes': f"{changes} in the last "
+                                                             f"{self.k8s_config.FLAP_window} cycles"}
+                                           for name, (details, changes) in flapping.items()},
+                                          ['namespace', 'changes'],
+                                          f"Flapping {title}",
+                                          resolved=True)
+
+            if resolved_data:
+                # process the old data and find which are solved
+                self.print_helper.info(f"process solved items for {title}")
+                # the namespace is the only key in resolved items
+                await self.__send_items__(resolved_data,
+                                          ['namespace'],
+                                          f"Resolved {title}",
+                                          resolved=True)
+
+        except Exception as err:
+            self.print_helper.error_and_exception(f"__process_key__{title}", err)
+
+    async def __send_items__(self,
+                             data,
+                             enable_keys,
+                             title,
+                             resolved: bool = False,
+                             kind=None,
+                             group_title='Workloads'):
+        """
+        Write the message of the items and send it to the dispatcher
+        :param data: items to write
+        :param enable_keys: keys dict to process for creating the message
+        :param title: title of k8s element (e.g. Pods, Replica Sets...)
+        :param resolved: the items are resolved
+        :param kind: k8s kind of the elements for reading their events and owners (e.g. Pod)
+        :param group_title: title of the grouped alerts the items are sent with (e.g. Changed Workloads)
+        """
+        msg = ChannelMessageBuilder(self.message_templates.render('title', title=title))
+
+        for key_dict, details in data.items():
+            self.print_helper.info_if(self.print_debug,
+                                      f"{title} name {key_dict}")
+
+            # the records are converted in dict and written only if not in the cache of the templates
+            item_msg = ChannelMessageBuilder().append(self.message_templates.render_item(title,
+                                                                                         enable_keys,
+                                                                                         key_dict,
+                                                                                         details))
+
+            if not resolved and kind is not None:
+                item_msg = self.__concatenate_events__(kind, key_dict, details, item_msg)
+
+            if not resolved and self.__is_grouped__(kind):
+                # sent at the end of the report with the items of the same root owner
+                self.grouped_items.append((group_title, kind, details.get('namespace'), key_dict, item_msg))
             else:
+                msg.extend(item_msg)
 
-                data_keys = data.keys()
-
-                base_title = f'{title} details:\n'
-                msg = base_title
-
-                for key_dict in data_keys:
-                    process = True
-                    self.print_helper.info_if(self.print_debug,
-                                              f"{title} name {key_dict}")
-                    current_node = data[key_dict]
-
-                    # if key exits in previous data dict
-                    if old_data:
-                        if key_dict in old_data.keys():
-                            # LS 2023.10.29 update
-                            # if old_data[key_dict] == current_node:
-                            self.print_helper.info_if(self.print_debug, f"{title} old data for {key_dict}  "
-                                                                        f"is equal to new data. No message")
-                            process = False
-
-                    if process:
-                        # msg = f'{title} detail\n'
-                        msg += f"----------\n"
-                        # msg += f"Name= {key_dict}\n"
-                        msg += f"{key_dict}\n"
-                        # print(f"current_node:{current_node}")
-                        for key, value in current_node.items():
-                            key_value = True
-                            if (enable_keys is None or
-                                    key in enable_keys):
-                                key_value, msg = await self.__concatenate__status__(key, key_value, msg, value)
-                            else:
-                                key_value = False
-
-                            if key_value:
-                                if (value is not None
-                                        and len(str(value)) > 0):
-                                    msg += f"{key}= {value}\n"
-
-                        # if resolved:
-                        #     msg += f"Resolved= True\n"
-
-                        if len(msg) >= self.dispatcher_max_msg_len:
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"Max message length reached, force send message")
-                            await self.send_to_dispatcher(msg)
-                            # Reset msg len
-                            msg = base_title
+            if len(msg) >= self.dispatcher_max_msg_len:
+                self.print_helper.info_if(self.print_debug,
+                                          f"Max message length reached, force send message")
+                # the message restarts from the title
+                await self.send_to_dispatcher(msg.flush())
 
-                    else:
-                        self.print_helper.info_if(self.print_debug,
-                                                  f"{title} set {key_dict} already status sent")
-
-                if len(msg) > len(base_title):
-                    self.print_helper.info_if(self.print_debug, f"Flush last message")
-
-                    await self.send_to_dispatcher(msg)
-
-                if (not resolved
-                        and data is not None
-                        and old_data is not None
-                        and len(old_data) > 0):
-                    # process the old data and find which are solved
-                    self.print_helper.info(f"process solved items for {title}")
-                    # the namespace is the only key in resolved items
-                    await self.__process_key__(data=old_data,
-                                               old_data=data,
-                                               enable_keys=['namespace'],
-                                               title=f"Resolved {title}",
-                                               resolved=True)
+        if not msg.is_empty():
+            self.print_helper.info_if(self.print_debug, f"Flush last message")
 
-        except Exception as err:
-            self.print_helper.error_and_exception(f"__process_key__{title}", err)
+            await self.send_to_dispatcher(msg.flush())
 
-    async def __concatenate__status__(self, key, key_value, msg, value):
-        """
-        concatenate the message. Iterate in the f
-        @param key: title of section
-        @param key_value:
-        @param msg: concatenate variable
-        @param value: dict value
-        @return:
-        """
-        if isinstance(value, dict):
-            key_value = False
-            msg += f"{key}:\n"
-            for key_n, value_n in value.items():
-                if value_n is not None and len(value_n) > 0:
-                    if not isinstance(value_n, dict):
-                        msg += f"   {key_n}= {value_n}\n"
-                    else:
-                        key_value, msg = await self.__concatenate__status__(key_n,
-                                                                            key_value,
-                                                                            msg,
-                                                                            value_n)
+    def __owned_items__(self, old_data):
+        """
+        Keep the old items of the namespaces assigned to this replica.
+        The items of the namespaces moved to another replica are not reported as resolved
+        @param old_data: second-to-last data received
+        @return: filtered data
+        """
+        if self.k8s_shard is None or not old_data:
+            return old_data
+        return {name: details for name, details in old_data.items()
+                if details.get('namespace') is None or self.k8s_shard.owns_namespace(details.get('namespace'))}
+
+    def __is_grouped__(self, kind):
+        """
+        True if the alerts of the kind are grouped by root owner
+        @param kind: k8s kind (e.g. Pod)
+        """
+        return (self.k8s_owner_graph is not None
+                and self.unique_message
+                and kind in self.grouped_kinds)
 
-        return key_value, msg
+    @handle_exceptions_async_method
+    async def __send_grouped_items__(self):
+        """
+        Send one alert for each root owner (e.g. a Deployment with its replica set and pods).
+        The details are written for the root and the first item of each kind, only the names for the others.
+        The new and the changed items are sent in separate messages (e.g. Workloads and Changed Workloads)
+        """
+        if self.k8s_owner_graph is None or len(self.grouped_items) == 0:
+            return
+
+        # group title -> root -> items
+        titles = {}
+        for group_title, kind, namespace, name, item_msg in self.grouped_items:
+            root = self.k8s_owner_graph.get_root(kind, namespace, name)
+            titles.setdefault(group_title, {}).setdefault(root, []).append((kind, name, item_msg))
+        self.grouped_items = []
+
+        for group_title, groups in titles.items():
+            await self.__send_groups__(group_title, groups)
+
+    async def __send_groups__(self, group_title, groups):
+        """
+        Send the alerts of the root owners with one title
+        @param group_title: title of the message (e.g. Workloads)
+        @param groups: dict root -> list of (kind, name, item message)
+        """
+        msg = ChannelMessageBuilder(self.message_templates.render('title', title=group_title))
+        for (root_kind, namespace, root_name), items in groups.items():
+            if len(items) == 1:
+                group_msg = items[0][2]
+            else:
+                items.sort(key=lambda item: self.grouped_kinds.index(item[0]))
+                counts = {}
+                for kind, _, _ in items:
+                    counts[kind] = counts.get(kind, 0) + 1
+                group_msg = ChannelMessageBuilder(self.message_templates.render(
+                    'group',
+                    kind=root_kind,
+                    name=root_name,
+                    namespace=namespace,
+                    counts=', '.join(f'{count} {kind}' for kind, count in counts.items())))
+                others = {}
+                for kind, name, item_msg in items:
+                    if kind not in others:
+                        others[kind] = []
+                        group_msg.extend(item_msg)
+                    else:
+                        others[kind].append(name)
+                for kind, names in others.items():
+                    if names:
+                        group_msg.append(self.message_templates.render('group_others',
+                                                                       kind=kind,
+                                                                       names=', '.join(names)))
+
+            msg.extend(group_msg)
+            if len(msg) >= self.dispatcher_max_msg_len:
+                self.print_helper.info_if(self.print_debug,
+                                          f"Max message length reached, force send message")
+                await self.send_to_dispatcher(msg.flush())
+
+        if not msg.is_empty():
+            await self.send_to_dispatcher(msg.flush())
+
+    def __concatenate_events__(self, kind, name, details, msg):
+        """
+        Add the recent warning events of an object to the message
+        @param kind: k8s kind (e.g. Pod)
+        @param name: name of the object
+        @param details: details of the object
+        @param msg: ChannelMessageBuilder of the object
+        @return: msg
+        """
+        if self.k8s_events is None:
+            return msg
+
+        events = self.k8s_events.get_events(kind, details.get('namespace'), name)
+        if events:
+            msg.append(self.message_templates.render('events'))
+            for reason, message, count in events:
+                msg.append(self.message_templates.render('event',
+                                                         reason=reason,
+                                                         message=message,
+                                                         count=f' (x{count})' if count is not None and count > 1
+                                                         else ''))
+        return msg
 
     @handle_exceptions_async_method
     async def __unpack_data__(self, data):
@@ -241,7 +414,13 @@ class KubernetesChecker:
         self.print_helper.debug_if("__unpack_data")
         try:
             if isinstance(data, dict):
-                if self.k8s_config.CLUSTER_Name_key in data:
+                if self.k8s_config.disp_MSG_key_stale not in data:
+                    # fresh data after an outage
+                    self.stale_kinds.difference_update(data.keys())
+
+                if self.k8s_config.disp_MSG_key_stale in data:
+                    await self.__process_stale__(data)
+                elif self.k8s_config.CLUSTER_Name_key in data:
                     await self.__process_cluster_name__(data)
                 elif self.k8s_config.NODE_key in data:
                     await self.__process_nodes__(data)
@@ -262,17 +441,21 @@ class KubernetesChecker:
                 # LS 2023.11.03 add key message for sending unique message
                 elif self.k8s_config.disp_MSG_key_start in data:
                     self.unique_message = True
-                    self.final_message = ""
+                    self.final_message = ChannelMessageBuilder()
+                    if self.k8s_owner_graph is not None:
+                        self.k8s_owner_graph.clear()
+                        self.grouped_items = []
                 # LS 2023.11.03 add key message for sending unique message
                 elif self.k8s_config.disp_MSG_key_end in data:
+                    await self.__send_grouped_items__()
                     await self.send_to_dispatcher_summary()
                 else:
                     self.print_helper.info(f"key not defined")
             else:
                 self.print_helper.info(f"__unpack_data.the message is not a type of dict")
 
-            # dispatcher alive message
-            if self.alive_message_seconds > 0:
+            # dispatcher alive message (sent by the leader only in sharded mode)
+            if self.alive_message_seconds > 0 and (self.k8s_shard is None or self.k8s_shard.is_leader()):
                 diff = calendar.timegm(datetime.today().timetuple()) - self.last_send
                 # add parameter force message
                 if diff > self.alive_message_seconds or self.force_alive_message:
@@ -288,6 +471,24 @@ class KubernetesChecker:
         except Exception as err:
             self.print_helper.error_and_exception(f"__unpack_data", err)
 
+    @handle_exceptions_async_method
+    async def __process_stale__(self, data):
+        """
+        Data not updated because the API server is not available.
+        The comparison is skipped: the items are not reported as resolved
+        :param data:
+        """
+        for key in data.keys():
+            if key == self.k8s_config.disp_MSG_key_stale:
+                continue
+
+            self.print_helper.info(f"{key} received stale data. skip comparison")
+            if key not in self.stale_kinds:
+                self.stale_kinds.add(key)
+                await self.send_to_dispatcher(f"Cluster: {self.cluster_name}"
+                                              f"\nk8s API server not available for {key}."
+                                              f"\nThe last known state is kept until the next successful read")
+
     @handle_exceptions_async_method
     async def __process_nodes__(self, data):
         """
@@ -306,7 +507,8 @@ class KubernetesChecker:
         await self.__process_key__(data=nodes_status,
                                    old_data=self.old_node_status,
                                    enable_keys=enable_keys,
-                                   title='Node')
+                                   title='Node',
+                                   kind='Node')
         self.old_node_status = nodes_status
 
     @handle_exceptions_async_method
@@ -351,7 +553,7 @@ class KubernetesChecker:
         # LS 2023.10.28 add key condition_x
         # LS 2023.10.28 remove 'phase',
         await self.__process_key__(data=pods_status,
-                                   old_data=self.old_pods,
+                                   old_data=self.__owned_items__(self.old_pods),
                                    enable_keys=['cluster',
                                                 'namespace',
                                                 'started',
@@ -363,7 +565,8 @@ class KubernetesChecker:
                                                 'cs_1',
                                                 'cs_2',
                                                 'cs_3'],
-                                   title='Pod')
+                                   title='Pod',
+                                   kind='Pod')
         self.old_pods = pods_status
 
     @handle_exceptions_async_method
@@ -381,9 +584,10 @@ class KubernetesChecker:
                        'replicas',
                        ]
         await self.__process_key__(data=sts_status,
-                                   old_data=self.old_stateful_set,
+                                   old_data=self.__owned_items__(self.old_stateful_set),
                                    enable_keys=enable_keys,
-                                   title='Stateful sets')
+                                   title='Stateful sets',
+                                   kind='StatefulSet')
         self.old_stateful_set = sts_status
 
     @handle_exceptions_async_method
@@ -401,9 +605,10 @@ class KubernetesChecker:
                        'replicas',
                        ]
         await self.__process_key__(data=sts_status,
-                                   old_data=self.old_replica_set,
+                                   old_data=self.__owned_items__(self.old_replica_set),
                                    enable_keys=enable_keys,
-                                   title='Replica sets')
+                                   title='Replica sets',
+                                   kind='ReplicaSet')
         self.old_replica_set = sts_status
 
     @handle_exceptions_async_method
@@ -424,9 +629,10 @@ class KubernetesChecker:
 
                        ]
         await self.__process_key__(data=dmn_status,
-                                   old_data=self.old_daemon_set,
+                                   old_data=self.__owned_items__(self.old_daemon_set),
                                    enable_keys=enable_keys,
-                                   title='Daemon sets')
+                                   title='Daemon sets',
+                                   kind='DaemonSet')
         self.old_daemon_set = dmn_status
 
     @handle_exceptions_async_method
@@ -443,9 +649,10 @@ class KubernetesChecker:
                        'replicas',
                        ]
         await self.__process_key__(data=dpl_status,
-                                   old_data=self.old_deployment,
+                                   old_data=self.__owned_items__(self.old_deployment),
                                    enable_keys=enable_keys,
-                                   title='Deployment')
+                                   title='Deployment',
+                                   kind='Deployment')
         self.old_deployment = dpl_status
 
     @handle_exceptions_async_method
@@ -466,7 +673,8 @@ class KubernetesChecker:
         await self.__process_key__(data=pv_status,
                                    old_data=self.old_pv,
                                    enable_keys=enable_keys,
-                                   title='PV')
+                                   title='PV',
+                                   kind='PersistentVolume')
         self.old_pv = pv_status
 
     @handle_exceptions_async_method
@@ -483,9 +691,10 @@ class KubernetesChecker:
                        'storage_class_name',
                        ]
         await self.__process_key__(data=pvc_status,
-                                   old_data=self.old_pvc,
+                                   old_data=self.__owned_items__(self.old_pvc),
                                    enable_keys=enable_keys,
-                                   title='PVC')
+                                   title='PVC',
+                                   kind='PersistentVolumeClaim')
         self.old_pvc = pvc_status
 
     @handle_exceptions_async_method
@@ -499,29 +708,29 @@ class KubernetesChecker:
 
         self.print_helper.info_if(self.print_debug, f"send_active_configuration")
 
-        msg = f'Configuration setup:\n'
+        msg = MessageBuilder(f"{title}\n\n")
         if self.k8s_config is not None:
-            msg = msg + f"  . node status= {'ENABLE' if self.k8s_config.NODE_enable else '.'}\n"
-            msg = msg + f"  . pods = {'ENABLE' if self.k8s_config.POD_enable else '.'}\n"
-            msg = msg + (f"  . deployment= {'ENABLE' if self.k8s_config.DPL_enable else '.'} "
-                         f"{'P0' if self.k8s_config.DPL_enable and self.k8s_config.DPL_pods0 else ''}\n")
-            msg = msg + (f"  . stateful sets= {'ENABLE' if self.k8s_config.SS_enable else '.'} "
-                         f"{'P0' if self.k8s_config.SS_enable and self.k8s_config.SS_pods0 else ''}\n")
-            msg = msg + (f"  . replicaset= {'ENABLE' if self.k8s_config.RS_enable else '.'} "
-                         f"{'P0' if self.k8s_config.RS_enable and self.k8s_config.RS_pods0 else ''}\n")
-            msg = msg + (f"  . daemon sets= {'ENABLE' if self.k8s_config.DS_enable else '-'}"
-                         f"{'P0' if self.k8s_config.DS_enable and self.k8s_config.DS_pods0 else ''}\n")
-            msg = msg + f"  . pvc= {'ENABLE' if self.k8s_config.PVC_enable else '.'}\n"
-            msg = msg + f"  . pv= {'ENABLE' if self.k8s_config.PVC_enable else '.'}\n"
+            msg.append(f'Configuration setup:\n')
+            msg.append(f"  . node status= {'ENABLE' if self.k8s_config.NODE_enable else '.'}\n")
+            msg.append(f"  . pods = {'ENABLE' if self.k8s_config.POD_enable else '.'}\n")
+            msg.append(f"  . deployment= {'ENABLE' if self.k8s_config.DPL_enable else '.'} "
+                       f"{'P0' if self.k8s_config.DPL_enable and self.k8s_config.DPL_pods0 else ''}\n")
+            msg.append(f"  . stateful sets= {'ENABLE' if self.k8s_config.SS_enable else '.'} "
+                       f"{'P0' if self.k8s_config.SS_enable and self.k8s_config.SS_pods0 else ''}\n")
+            msg.append(f"  . replicaset= {'ENABLE' if self.k8s_config.RS_enable else '.'} "
+                       f"{'P0' if self.k8s_config.RS_enable and self.k8s_config.RS_pods0 else ''}\n")
+            msg.append(f"  . daemon sets= {'ENABLE' if self.k8s_config.DS_enable else '-'}"
+                       f"{'P0' if self.k8s_config.DS_enable and self.k8s_config.DS_pods0 else ''}\n")
+            msg.append(f"  . pvc= {'ENABLE' if self.k8s_config.PVC_enable else '.'}\n")
+            msg.append(f"  . pv= {'ENABLE' if self.k8s_config.PVC_enable else '.'}\n")
             if self.alive_message_seconds >= 3600:
-                msg = msg + f"\nAlive message every {int(self.alive_message_seconds / 3600)} hours"
+                msg.append(f"\nAlive message every {int(self.alive_message_seconds / 3600)} hours")
             else:
-                msg = msg + f"\nAlive message every {int(self.alive_message_seconds / 60)} minutes"
+                msg.append(f"\nAlive message every {int(self.alive_message_seconds / 60)} minutes")
         else:
-            msg = "Error init config class"
+            msg.append("Error init config class")
 
-        msg = f"{title}\n\n{msg}"
-        await self.send_to_dispatcher(msg)
+        await self.send_to_dispatcher(msg.build())
 
     @handle_exceptions_async_method
     async def run(self):
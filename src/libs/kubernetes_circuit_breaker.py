@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+
+import kubernetes
+import urllib3
+from utils.print_helper import PrintHelper
+
+
+class KubernetesCircuitOpenError(kubernetes.client.ApiException):
+    """
+    Raised without calling the API server while the circuit of the endpoint is open
+    """
+
+    def __init__(self, endpoint, retry_seconds):
+        super().__init__(status=503,
+                         reason=f"circuit open for {endpoint}, retry in {int(retry_seconds)} sec")
+        self.endpoint = endpoint
+
+
+class KubernetesCircuitBreaker:
+    """
+    Circuit breaker for each endpoint of the API server.
+    After failure_threshold consecutive failures the endpoint is not called for a backoff time
+    that doubles at each new failure (with jitter). When the backoff expires one request is allowed:
+    a success closes the circuit, a failure opens it again
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 failure_threshold=3,
+                 backoff_seconds=10,
+                 backoff_max_seconds=600,
+                 jitter=0.2):
+
+        self.print_helper = PrintHelper('kubernetes_circuit_breaker', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        # 0: circuit breaker disabled
+        self.failure_threshold = failure_threshold
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.jitter = jitter
+
+        # endpoint -> {'failures', 'opens', 'open_until', 'trial'}
+        self.circuits = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def is_failure(err):
+        """
+        True if the error means the API server is unavailable or overloaded.
+        The client errors (e.g. 400, 403, 404) do not open the circuit
+        @param err: exception raised by the call
+        """
+        if isinstance(err, kubernetes.client.ApiException):
+            return err.status is None or err.status == 0 or err.status == 429 or err.status >= 500
+        return isinstance(err, (urllib3.exceptions.HTTPError, ConnectionError, TimeoutError))
+
+    def __get_circuit__(self, endpoint):
+        if endpoint not in self.circuits:
+            self.circuits[endpoint] = {'failures': 0, 'opens': 0, 'open_until': 0, 'trial': False}
+        return self.circuits[endpoint]
+
+    def before_call(self, endpoint):
+        """
+        Check the circuit before the request
+        @param endpoint: name of the endpoint (e.g. list_namespaced_pod)
+        @raise KubernetesCircuitOpenError: if the endpoint must not be called
+        """
+        if self.failure_threshold <= 0:
+            return
+        with self.lock:
+            circuit = self.__get_circuit__(endpoint)
+            if circuit['open_until'] == 0:
+                return
+            now = time.monotonic()
+            if now < circuit['open_until'] or circuit['trial']:
+                raise KubernetesCircuitOpenError(endpoint, max(0, circuit['open_until'] - now))
+            # half open: only this request is sent
+            circuit['trial'] = True
+        self.print_helper.info(f"{endpoint} circuit half open, trial request")
+
+    def on_success(self, endpoint):
+        """
+        Close the circuit after a successful request
+        @param endpoint: name of the endpoint
+        """
+        if self.failure_threshold <= 0:
+            return
+        with self.lock:
+            circuit = self.__get_circuit__(endpoint)
+            was_open = circuit['open_until'] > 0
+            circuit.update({'failures': 0, 'opens': 0, 'open_until': 0, 'trial': False})
+        if was_open:
+            self.print_helper.info(f"{endpoint} circuit closed")
+
+    def on_failure(self, endpoint, err):
+        """
+        Count a failed request and open the circuit when the threshold is reached
+        @param endpoint: name of the endpoint
+        @param err: exception raised by the request
+        """
+        if self.failure_threshold <= 0:
+            return
+        if not self.is_failure(err):
+            # the API server answered
+            self.on_success(endpoint)
+            return
+        with self.lock:
+            circuit = self.__get_circuit__(endpoint)
+            circuit['failures'] += 1
+            if circuit['failures'] < self.failure_threshold and not circuit['trial']:
+                return
+            circuit['opens'] += 1
+            backoff = min(self.backoff_seconds * 2 ** (circuit['opens'] - 1), self.backoff_max_seconds)
+            backoff = backoff * random.uniform(1 - self.jitter, 1 + self.jitter)
+            circuit['open_until'] = time.monotonic() + backoff
+            circuit['trial'] = False
+        self.print_helper.wrn(f"{endpoint} circuit open for {backoff:.0f} sec. "
+                              f"{type(err).__name__} {getattr(err, 'status', '')}")
+
+    def call(self, endpoint, function, **kwargs):
+        """
+        Call a function of the k8s client through the circuit of the endpoint
+        @param endpoint: name of the endpoint
+        @param function: function to call
+        @param kwargs: arguments of the function
+        @return: result of the function
+        """
+        self.before_call(endpoint)
+        try:
+            response = function(**kwargs)
+        except Exception as err:
+            self.on_failure(endpoint, err)
+            raise err
+        self.on_success(endpoint)
+        return response
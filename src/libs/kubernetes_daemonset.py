@@ -1,4 +1,6 @@
 from libs.kubernetes_namespace import KubernetesGetNamespace
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_records import DaemonSetRecord
 import kubernetes
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
@@ -14,7 +16,9 @@ class KubernetesGetDms:
                  logger=None,
                  k8s_api_instance=None,
                  k8s_apps_instance=None,
-                 cluster_name=None):
+                 cluster_name=None,
+                 k8s_lister: KubernetesLister = None,
+                 k8s_namespace: KubernetesGetNamespace = None):
 
         self.print_helper = PrintHelper('kubernetes_get_dms',
                                         logger)
@@ -22,14 +26,23 @@ class KubernetesGetDms:
 
         self.print_helper.info_if(self.print_debug,
                                   f"__init__")
-        self.k8s_namespace = KubernetesGetNamespace(debug_on,
-                                                    logger,
-                                                    k8s_api_instance)
         self.api_instance = k8s_api_instance
         self.apps_instance = k8s_apps_instance
 
         self.cluster_name = cluster_name
 
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # shared namespace registry
+        self.k8s_namespace = k8s_namespace
+        if self.k8s_namespace is None:
+            self.k8s_namespace = KubernetesGetNamespace(debug_on,
+                                                        logger,
+                                                        k8s_api_instance,
+                                                        k8s_lister=self.k8s_lister)
+
     @handle_exceptions_method
     def get_daemon_set(self,
                        namespace,
@@ -45,50 +58,47 @@ class KubernetesGetDms:
                 nm_list = self.k8s_namespace.get_namespace()
             total = 0
             if nm_list is not None:
-                for nm in nm_list:
-                    self.print_helper.info_if(self.print_debug,
-                                              f"get_daemon_set  nm:{nm}")
-                    nm_dp = self.apps_instance.list_namespaced_daemon_set(nm)
-                    for st in nm_dp.items:
-                        total += 1
-
-                        add_st_sets = False
-                        if extract_not_equal or extract_equal0:
-
-                            if ((extract_not_equal
-                                 and st.status.number_available is not None
-                                 and st.status.number_ready is not None
-                                 and st.status.number_available != st.status.number_ready)
-                                    or (extract_equal0 and (st.status.number_ready is None
-                                                            or st.status.number_ready == 0))):
-                                add_st_sets = True
-                        else:
+                for st in self.k8s_lister.list_items(nm_list,
+                                                     self.apps_instance.list_namespaced_daemon_set,
+                                                     self.apps_instance.list_daemon_set_for_all_namespaces):
+                    total += 1
+
+                    add_st_sets = False
+                    if extract_not_equal or extract_equal0:
+
+                        if ((extract_not_equal
+                             and st.status.number_available is not None
+                             and st.status.number_ready is not None
+                             and st.status.number_available != st.status.number_ready)
+                                or (extract_equal0 and (st.status.number_ready is None
+                                                        or st.status.number_ready == 0))):
                             add_st_sets = True
-
-                        if add_st_sets:
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"DaemonSet:{st.metadata.name} in {st.metadata.namespace}")
-                            details = {'cluster': self.cluster_name,
-                                       'namespace': st.metadata.namespace,
-                                       'current_number_scheduled': st.status.current_number_scheduled,
-                                       'desired_number_scheduled': st.status.desired_number_scheduled,
-                                       'number_available': st.status.number_available,
-                                       'updated_number_scheduled': st.status.updated_number_scheduled,
-                                       'number_ready': st.status.number_ready
-                                       }
-
-                            if self.print_debug:
-                                self.print_helper.info(f"DaemonSet.current_number_scheduled : "
-                                                       f"{st.status.current_number_scheduled}")
-                                self.print_helper.info(f"DaemonSet.desired_number_scheduled :"
-                                                       f" {st.status.desired_number_scheduled}")
-                                self.print_helper.info(f"DaemonSet.number_ready : {st.status.number_ready}")
-                                self.print_helper.info(f"DaemonSet.number_miss-scheduled :"
-                                                       f" {st.status.number_misscheduled}")
-                                self.print_helper.info(f"DaemonSet.updated_number_scheduled :"
-                                                       f" {st.status.updated_number_scheduled}")
-
-                            dm_sets[st.metadata.name] = details
+                    else:
+                        add_st_sets = True
+
+                    if add_st_sets:
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"DaemonSet:{st.metadata.name} in {st.metadata.namespace}")
+                        details = DaemonSetRecord(self.cluster_name,
+                                                  st.metadata.namespace,
+                                                  st.status.current_number_scheduled,
+                                                  st.status.desired_number_scheduled,
+                                                  st.status.number_available,
+                                                  st.status.updated_number_scheduled,
+                                                  st.status.number_ready)
+
+                        if self.print_debug:
+                            self.print_helper.info(f"DaemonSet.current_number_scheduled : "
+                                                   f"{st.status.current_number_scheduled}")
+                            self.print_helper.info(f"DaemonSet.desired_number_scheduled :"
+                                                   f" {st.status.desired_number_scheduled}")
+                            self.print_helper.info(f"DaemonSet.number_ready : {st.status.number_ready}")
+                            self.print_helper.info(f"DaemonSet.number_miss-scheduled :"
+                                                   f" {st.status.number_misscheduled}")
+                            self.print_helper.info(f"DaemonSet.updated_number_scheduled :"
+                                                   f" {st.status.updated_number_scheduled}")
+
+                        dm_sets[st.metadata.name] = details
 
             self.print_helper.info(f"{len(dm_sets)}/{total} get_daemon_set found "
                                    f"{'with problem' if extract_equal0 or extract_not_equal else ''}")
@@ -1,4 +1,6 @@
 from libs.kubernetes_namespace import KubernetesGetNamespace
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_records import DeploymentRecord
 import kubernetes
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
@@ -14,7 +16,9 @@ class KubernetesGetDeployment:
                  logger=None,
                  k8s_api_instance=None,
                  k8s_apps_instance=None,
-                 cluster_name=None):
+                 cluster_name=None,
+                 k8s_lister: KubernetesLister = None,
+                 k8s_namespace: KubernetesGetNamespace = None):
 
         self.print_helper = PrintHelper('kubernetes_get_deployment',
                                         logger)
@@ -22,13 +26,22 @@ class KubernetesGetDeployment:
 
         self.print_helper.info_if(self.print_debug,
                                   f"__init__")
-        self.k8s_namespace = KubernetesGetNamespace(debug_on,
-                                                    logger,
-                                                    k8s_api_instance)
         self.api_instance = k8s_api_instance
         self.apps_instance = k8s_apps_instance
         self.cluster_name = cluster_name
 
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # shared namespace registry
+        self.k8s_namespace = k8s_namespace
+        if self.k8s_namespace is None:
+            self.k8s_namespace = KubernetesGetNamespace(debug_on,
+                                                        logger,
+                                                        k8s_api_instance,
+                                                        k8s_lister=self.k8s_lister)
+
     @handle_exceptions_method
     def get_deployment(self,
                        namespace,
@@ -46,45 +59,43 @@ class KubernetesGetDeployment:
                 nm_list = self.k8s_namespace.get_namespace()
             total = 0
             if nm_list is not None:
-                for nm in nm_list:
-                    self.print_helper.info_if(self.print_debug,
-                                              f"get_deployment  nm:{nm}")
-                    nm_dp = self.apps_instance.list_namespaced_deployment(nm)
-                    for st in nm_dp.items:
-                        total += 1
-
-                        add_st_sets = False
-
-                        if extract_not_equal or extract_equal0:
-
-                            if ((extract_not_equal
-                                 and st.status.available_replicas is not None
-                                 and st.status.replicas is not None
-                                 and st.status.available_replicas != st.status.replicas)
-                                    or (extract_equal0 and (st.status.replicas == 0 or st.status.replicas is None))):
-                                add_st_sets = True
-                        else:
-                            add_st_sets = True
+                for st in self.k8s_lister.list_items(nm_list,
+                                                     self.apps_instance.list_namespaced_deployment,
+                                                     self.apps_instance.list_deployment_for_all_namespaces):
+                    total += 1
 
-                        if add_st_sets:
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"Deployment:{st.metadata.name} in {st.metadata.namespace}")
-                            # print(st.status)
-                            details = {'cluster': self.cluster_name,
-                                       'namespace': st.metadata.namespace,
-                                       'available_replicas': st.status.available_replicas,
-                                       'replicas': st.status.replicas,
-                                       'ready_replicas': st.status.ready_replicas}
-
-                            if self.print_debug:
-                                self.print_helper.info(f"Deployment.available replicas : "
-                                                       f"{st.status.available_replicas}")
-                                self.print_helper.info(f"Deployment.replicas : "
-                                                       f"{st.status.replicas}")
-                                self.print_helper.info(f"Deployment.ready replicas : "
-                                                       f"{st.status.ready_replicas}")
-
-                            dpl_sets[st.metadata.name] = details
+                    add_st_sets = False
+
+                    if extract_not_equal or extract_equal0:
+
+                        if ((extract_not_equal
+                             and st.status.available_replicas is not None
+                             and st.status.replicas is not None
+                             and st.status.available_replicas != st.status.replicas)
+                                or (extract_equal0 and (st.status.replicas == 0 or st.status.replicas is None))):
+                            add_st_sets = True
+                    else:
+                        add_st_sets = True
+
+                    if add_st_sets:
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"Deployment:{st.metadata.name} in {st.metadata.namespace}")
+                        # print(st.status)
+                        details = DeploymentRecord(self.cluster_name,
+                                                   st.metadata.namespace,
+                                                   st.status.available_replicas,
+                                                   st.status.replicas,
+                                                   st.status.ready_replicas)
+
+                        if self.print_debug:
+                            self.print_helper.info(f"Deployment.available replicas : "
+                                                   f"{st.status.available_replicas}")
+                            self.print_helper.info(f"Deployment.replicas : "
+                                                   f"{st.status.replicas}")
+                            self.print_helper.info(f"Deployment.ready replicas : "
+                                                   f"{st.status.ready_replicas}")
+
+                        dpl_sets[st.metadata.name] = details
 
             self.print_helper.info(f"{len(dpl_sets)}/{total} deployment found "
                                    f"{'with problem' if extract_equal0 or extract_not_equal else ''}")
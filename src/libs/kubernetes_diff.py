@@ -0,0 +1,82 @@
+from itertools import compress
+from operator import is_not
+
+from libs.kubernetes_records import KubernetesRecord
+
+
+class KubernetesDiff:
+    """
+    Incremental diff of the snapshots of one kind.
+    A fingerprint of the keys written in the message is kept for each item, the new, changed
+    and resolved items are computed with set operations on the names
+    """
+
+    def __init__(self, enable_keys=None):
+        self.enable_keys = enable_keys
+        # name -> fingerprint of the last snapshot
+        self.fingerprints = {}
+        # last snapshot, the items equal to the last ones keep their fingerprint
+        self.last_data = {}
+        # record class -> getter of the values of the enable keys
+        self.getters = {}
+
+    def __getter__(self, item_type):
+        """
+        Function returning the values of the enable keys of an item
+        @param item_type: record class (or dict)
+        """
+        getter = self.getters.get(item_type)
+        if getter is None:
+            if issubclass(item_type, KubernetesRecord):
+                getter = item_type.fingerprint_getter(self.enable_keys)
+            elif self.enable_keys is None:
+                getter = repr
+            else:
+                def getter(details):
+                    return repr({key: value for key, value in details.items() if key in self.enable_keys})
+            self.getters[item_type] = getter
+        return getter
+
+    def update(self, data):
+        """
+        Compare a new snapshot with the last one and keep its fingerprints.
+        An equal snapshot returns without any fingerprint (dict compare in C), the fingerprint of an item
+        is computed again only if its details are not equal to the last ones
+        @param data: dict name -> details
+        @return: tuple of sets (new, changed, resolved) of names
+        """
+        last_data = self.last_data
+        self.last_data = data
+        # the comparisons run in C and stop at the identity check for the records shared by the snapshots
+        if data == last_data:
+            return set(), set(), set()
+
+        fingerprints = self.fingerprints
+        new = set()
+        changed = set()
+        item_type = None
+        getter = None
+        # names of the items not shared with the last snapshot (identity check in C)
+        for name in compress(data, map(is_not, data.values(), map(last_data.get, data))):
+            details = data[name]
+            if details == last_data.get(name):
+                continue
+            if type(details) is not item_type:
+                item_type = type(details)
+                getter = self.__getter__(item_type)
+            fingerprint = hash(getter(details))
+            old_fingerprint = fingerprints.get(name)
+            fingerprints[name] = fingerprint
+            if old_fingerprint is None:
+                new.add(name)
+            elif old_fingerprint != fingerprint:
+                changed.add(name)
+
+        resolved = last_data.keys() - data.keys() if len(data) - len(new) < len(last_data) else set()
+        for name in resolved:
+            del fingerprints[name]
+        return new, changed, resolved
+
+    def clear(self):
+        self.fingerprints = {}
+        self.last_data = {}
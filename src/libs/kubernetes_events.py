@@ -0,0 +1,118 @@
+from collections import OrderedDict
+
+from libs.kubernetes_informer import KubernetesInformer
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
+from libs.kubernetes_circuit_breaker import KubernetesCircuitBreaker
+from libs.kubernetes_records import intern_string
+from utils.handle_error import handle_exceptions_method
+
+
+class KubernetesEventWatcher(KubernetesInformer):
+    """
+    Keep the recent warning events of each object (e.g. FailedScheduling, FailedMount, BackOff)
+    updated by a watch stream. The store is a LRU bounded in number of objects and events for each object
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 list_function=None,
+                 max_objects=1000,
+                 events_per_object=3,
+                 rate_limiter: KubernetesRateLimiter = None,
+                 circuit_breaker: KubernetesCircuitBreaker = None):
+
+        super().__init__(debug_on,
+                         logger,
+                         list_function=list_function,
+                         name='events',
+                         rate_limiter=rate_limiter,
+                         list_kwargs={'field_selector': 'type=Warning'},
+                         circuit_breaker=circuit_breaker)
+
+        self.max_objects = max_objects
+        self.events_per_object = events_per_object
+        # (kind, namespace, name) -> OrderedDict event name -> (reason, message, count)
+        self.store = OrderedDict()
+
+    @staticmethod
+    def __object_key__(kind, namespace, name):
+        """
+        Key of the object in the store. The cluster scoped objects have no namespace
+        """
+        return kind, namespace or '', name
+
+    @staticmethod
+    def __event_time__(event):
+        return event.last_timestamp or event.event_time or event.metadata.creation_timestamp
+
+    def __add_event__(self, store, event):
+        """
+        Add or update an event. The least recently updated object is removed when the store is full
+        @param store: OrderedDict of the objects
+        @param event: CoreV1Event
+        """
+        involved = event.involved_object
+        key = self.__object_key__(involved.kind, involved.namespace, involved.name)
+        entries = store.pop(key, None)
+        if entries is None:
+            entries = OrderedDict()
+
+        entries.pop(event.metadata.name, None)
+        entries[event.metadata.name] = (intern_string(event.reason), event.message, event.count)
+        while len(entries) > self.events_per_object:
+            entries.popitem(last=False)
+
+        store[key] = entries
+        while len(store) > self.max_objects:
+            store.popitem(last=False)
+
+    def __remove_event__(self, event):
+        involved = event.involved_object
+        key = self.__object_key__(involved.kind, involved.namespace, involved.name)
+        entries = self.store.get(key)
+        if entries is not None:
+            entries.pop(event.metadata.name, None)
+            if len(entries) == 0:
+                del self.store[key]
+
+    def __reset_store__(self, items):
+        """
+        Fill the store with the listed events, the oldest first
+        @param items: list of CoreV1Event
+        """
+        store = OrderedDict()
+        for event in sorted(items, key=self.__event_time__):
+            self.__add_event__(store, event)
+
+        with self.lock:
+            self.store = store
+
+    def __update_store__(self, event_type, item):
+        with self.lock:
+            if event_type == 'DELETED':
+                self.__remove_event__(item)
+            else:
+                self.__add_event__(self.store, item)
+
+    def get_events(self, kind, namespace, name):
+        """
+        Recent warning events of an object
+        @param kind: kind of the object (e.g. Pod)
+        @param namespace: namespace (None for the cluster scoped objects)
+        @param name: name of the object
+        @return: list of tuple (reason, message, count), the oldest first
+        """
+        with self.lock:
+            entries = self.store.get(self.__object_key__(kind, namespace, name))
+            if entries is None:
+                return []
+            return list(entries.values())
+
+    @handle_exceptions_method
+    def get_items(self, namespace=None):
+        """
+        Number of events for each object
+        """
+        with self.lock:
+            return {key: len(entries) for key, entries in self.store.items()}
@@ -0,0 +1,115 @@
+class FlapState:
+    """
+    Alert state of one object
+    """
+
+    __slots__ = ('history', 'bad', 'good', 'alerting', 'flapping', 'details')
+
+    def __init__(self):
+        # cycles of the flap window, bit 1: object with problem (the last cycle is the lowest bit)
+        self.history = 0
+        # consecutive cycles with and without problem
+        self.bad = 0
+        self.good = 0
+        # alert sent and not resolved
+        self.alerting = False
+        # alerts suppressed until the object is stable
+        self.flapping = False
+        # last details received, written in the resolved message
+        self.details = None
+
+
+class KubernetesFlapDamper:
+    """
+    Flap damping of the alerts of one kind.
+    An object is reported after raise_cycles consecutive cycles with problem and resolved after clear_cycles
+    consecutive cycles without problem. An object changing state at least flap_changes times in the last
+    flap_window cycles is flapping: it is reported once and its alerts are suppressed until it is stable.
+    The state is kept only for the objects alerting, flapping or with problem in the flap window
+    """
+
+    def __init__(self, raise_cycles=1, clear_cycles=1, flap_window=0, flap_changes=4):
+        self.raise_cycles = max(1, raise_cycles)
+        self.clear_cycles = max(1, clear_cycles)
+        # flap detection disabled if the window is shorter than 2 cycles
+        self.flap_window = flap_window if flap_window > 1 else 0
+        self.flap_changes = max(2, flap_changes)
+        self.window_mask = (1 << self.flap_window) - 1
+        # one bit for each pair of consecutive cycles in the window
+        self.changes_mask = (1 << max(0, self.flap_window - 1)) - 1
+        # name -> FlapState
+        self.states = {}
+
+    def __changes__(self, state):
+        """
+        Number of changes of state in the flap window
+        """
+        return ((state.history ^ (state.history >> 1)) & self.changes_mask).bit_count()
+
+    def __evaluate__(self, name, state, bad, raised, cleared, flapping):
+        """
+        Apply the flap detection and the hysteresis to the state of one object after a cycle
+        """
+        if self.flap_window > 0:
+            changes = self.__changes__(state)
+            if not state.flapping and changes >= self.flap_changes:
+                state.flapping = True
+                flapping[name] = (state.details, changes)
+                return
+            if state.flapping:
+                if changes >= (self.flap_changes + 1) // 2:
+                    return
+                # stable again: an object with problem is reported again with its last details
+                state.flapping = False
+                if bad:
+                    state.alerting = False
+
+        if bad and not state.alerting and state.bad >= self.raise_cycles:
+            state.alerting = True
+            raised.add(name)
+        elif not bad and state.alerting and state.good >= self.clear_cycles:
+            state.alerting = False
+            cleared[name] = state.details
+
+    def update(self, data):
+        """
+        Update the states with the objects with problem in the last cycle
+        @param data: dict name -> details of the objects with problem
+        @return: tuple (raised, cleared, flapping)
+            raised: set of names to report
+            cleared: dict name -> last details, objects to report as resolved
+            flapping: dict name -> (last details, number of changes), objects started flapping
+        """
+        raised = set()
+        cleared = {}
+        flapping = {}
+
+        for name, details in data.items():
+            state = self.states.get(name)
+            if state is None:
+                state = FlapState()
+                self.states[name] = state
+            state.history = ((state.history << 1) | 1) & self.window_mask
+            state.bad += 1
+            state.good = 0
+            state.details = details
+            self.__evaluate__(name, state, True, raised, cleared, flapping)
+
+        for name in self.states.keys() - data.keys():
+            state = self.states[name]
+            state.history = (state.history << 1) & self.window_mask
+            state.good += 1
+            state.bad = 0
+            self.__evaluate__(name, state, False, raised, cleared, flapping)
+            if not state.alerting and not state.flapping and state.history == 0:
+                # no problem in the flap window: the state is not needed
+                del self.states[name]
+
+        return raised, cleared, flapping
+
+    def is_reported(self, name):
+        """
+        True if the alert of the object was sent and its changes are reported
+        """
+        state = self.states.get(name)
+        return state is not None and state.alerting and not state.flapping
@@ -0,0 +1,286 @@
+import threading
+import time
+
+import kubernetes
+from kubernetes import watch
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
+from libs.kubernetes_circuit_breaker import KubernetesCircuitBreaker
+from libs.kubernetes_lister import KubernetesLister
+from utils.print_helper import PrintHelper
+from utils.handle_error import handle_exceptions_method
+
+
+class KubernetesInformer:
+    """
+    Keep a local store of k8s items updated with one initial list and a watch stream.
+    The items can be kept in a compact form (transform) and only for the namespaces scanned (namespace_filter)
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 list_function=None,
+                 name='items',
+                 watch_timeout_seconds=300,
+                 retry_seconds=5,
+                 rate_limiter: KubernetesRateLimiter = None,
+                 list_kwargs=None,
+                 circuit_breaker: KubernetesCircuitBreaker = None,
+                 k8s_lister: KubernetesLister = None,
+                 transform=None,
+                 namespace_filter=None,
+                 changed_filter=None):
+
+        self.print_helper = PrintHelper(f'kubernetes_informer_{name}', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        # function used for list and watch (e.g. list_pod_for_all_namespaces)
+        self.list_function = list_function
+        self.name = name
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.retry_seconds = retry_seconds
+        self.rate_limiter = rate_limiter
+        # stop calling the API server while it is failing (None: always call)
+        self.circuit_breaker = circuit_breaker
+        # extra arguments of the list and watch requests (e.g. field_selector)
+        self.list_kwargs = list_kwargs or {}
+        # paged initial list (None: one list request)
+        self.k8s_lister = k8s_lister
+        # function converting an item in the value kept in the store (None: the k8s item)
+        self.transform = transform
+        # function namespace -> bool, the items of the other namespaces are dropped (None: all)
+        self.namespace_filter = namespace_filter
+        # function (old value, new value) -> bool, True if the change of an item must wake the readers of the store
+        # (None: no wake up)
+        self.changed_filter = changed_filter
+        self.changed = threading.Event()
+        # list again at the end of the current watch event (e.g. the namespace filter changed)
+        self.resync_requested = False
+
+        self.store = {}
+        self.lock = threading.Lock()
+        self.resource_version = None
+        self.synced = threading.Event()
+        self.running = False
+        self.thread = None
+
+    @staticmethod
+    def __item_key__(item):
+        """
+        Key of the item in the store
+        @param item: k8s item
+        @return: tuple namespace, name
+        """
+        return item.metadata.namespace, item.metadata.name
+
+    @handle_exceptions_method
+    def start(self):
+        """
+        Start the list and watch loop in a background thread
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.print_helper.info(f"start informer {self.name}")
+        self.running = True
+        self.thread = threading.Thread(target=self.__run__,
+                                       name=f"informer-{self.name}",
+                                       daemon=True)
+        self.thread.start()
+
+    @handle_exceptions_method
+    def stop(self):
+        """
+        Stop the background thread at the end of the current watch request
+        """
+        self.running = False
+
+    def is_synced(self):
+        """
+        True when the store is filled by the initial list
+        """
+        return self.synced.is_set()
+
+    @handle_exceptions_method
+    def resync(self):
+        """
+        Fill the store again with a new list (e.g. the namespaces of the filter changed).
+        The store is not synced until the list is done
+        """
+        self.print_helper.info(f"{self.name} resync requested")
+        self.resync_requested = True
+        self.synced.clear()
+
+    @handle_exceptions_method
+    def get_items(self, namespace=None):
+        """
+        Return a copy of the items in the store
+        @param namespace: list of namespaces to keep (None for all)
+        @return: dict (namespace, name) -> item (or its transformed value)
+        """
+        if namespace is None:
+            with self.lock:
+                return dict(self.store)
+        nm_set = set(namespace)
+        with self.lock:
+            return {key: item for key, item in self.store.items() if key[0] in nm_set}
+
+    def take_changed(self):
+        """
+        True if an item changed as required by the changed filter since the last call
+        """
+        if not self.changed.is_set():
+            return False
+        self.changed.clear()
+        return True
+
+    def __store_value__(self, key, item):
+        """
+        Value kept in the store for an item
+        @param key: key of the item
+        @param item: k8s item
+        @return: value or None if the namespace of the item is not kept
+        """
+        if self.namespace_filter is not None and not self.namespace_filter(key[0]):
+            return None
+        return item if self.transform is None else self.transform(item)
+
+    def __limited__(self, verb):
+        """
+        List function taking the budget of the verb when the request is sent
+        @param verb: list or watch
+        """
+        if self.rate_limiter is None:
+            return self.list_function
+        return self.rate_limiter.limit(verb, self.list_function)
+
+    def __list__(self):
+        """
+        Fill the store with a full list and save the resource version for the watch
+        """
+        self.print_helper.info(f"{self.name} list")
+        self.resync_requested = False
+        if self.k8s_lister is not None:
+            # page by page (limit/continue): only one page of k8s items is in memory
+            list_metadata = {}
+            self.__reset_store__(self.k8s_lister.list_cluster_items(self.list_function,
+                                                                    list_metadata,
+                                                                    watch=False,
+                                                                    **self.list_kwargs))
+            resource_version = list_metadata.get('resource_version')
+        else:
+            if self.circuit_breaker is not None:
+                # the circuit is checked first: a request refused by an open circuit takes no token
+                item_list = self.circuit_breaker.call(self.list_function.__name__,
+                                                      self.__limited__('list'),
+                                                      watch=False,
+                                                      **self.list_kwargs)
+            else:
+                item_list = self.__limited__('list')(watch=False, **self.list_kwargs)
+            self.__reset_store__(item_list.items)
+            resource_version = item_list.metadata.resource_version
+            del item_list
+        self.resource_version = resource_version
+        if not self.resync_requested:
+            self.synced.set()
+        self.print_helper.info(f"{self.name} list {len(self.store)} items. "
+                               f"resource version {self.resource_version}")
+
+    def __reset_store__(self, items):
+        """
+        Replace the store with the items of a full list
+        @param items: iterable of k8s items
+        """
+        store = {}
+        for item in items:
+            key = self.__item_key__(item)
+            value = self.__store_value__(key, item)
+            if value is not None:
+                store[key] = value
+
+        with self.lock:
+            self.store = store
+
+    def __update_store__(self, event_type, item):
+        """
+        Apply a change of an item to the store
+        @param event_type: ADDED, MODIFIED or DELETED
+        @param item: k8s item
+        """
+        key = self.__item_key__(item)
+        value = self.__store_value__(key, item) if event_type != 'DELETED' else None
+        with self.lock:
+            if value is None:
+                old_value = self.store.pop(key, None)
+            else:
+                old_value = self.store.get(key)
+                self.store[key] = value
+        if (self.changed_filter is not None
+                and self.synced.is_set()
+                and old_value != value
+                and self.changed_filter(old_value, value)):
+            self.changed.set()
+
+    def __apply_event__(self, event):
+        """
+        Update the store with a watch event
+        @param event: event received from the watch stream
+        """
+        event_type = event['type']
+        if event_type == 'BOOKMARK':
+            self.resource_version = event['raw_object']['metadata']['resourceVersion']
+            self.print_helper.info_if(self.print_debug,
+                                      f"{self.name} bookmark {self.resource_version}")
+            return
+
+        item = event['object']
+        self.resource_version = item.metadata.resource_version
+        self.__update_store__(event_type, item)
+
+    def __watch__(self):
+        """
+        Apply the watch events starting from the last resource version
+        """
+        endpoint = f"watch_{self.list_function.__name__}"
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call(endpoint)
+        stream = watch.Watch()
+        try:
+            for event in stream.stream(self.__limited__('watch'),
+                                       resource_version=self.resource_version,
+                                       allow_watch_bookmarks=True,
+                                       timeout_seconds=self.watch_timeout_seconds,
+                                       **self.list_kwargs):
+                self.__apply_event__(event)
+                if not self.running or self.resync_requested:
+                    stream.stop()
+        except Exception as err:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.on_failure(endpoint, err)
+            raise err
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.on_success(endpoint)
+
+    def __run__(self):
+        """
+        List and watch loop. A new list is requested only when the resource version is expired
+        """
+        while self.running:
+            try:
+                if self.resource_version is None or self.resync_requested:
+                    self.__list__()
+                self.__watch__()
+
+            except kubernetes.client.ApiException as e:
+                if e.status == 410:
+                    self.print_helper.info(f"{self.name} resource version expired, list again")
+                    self.resource_version = None
+                else:
+                    self.print_helper.error(f"{self.name} k8s error : {e}")
+                    time.sleep(self.retry_seconds)
+
+            except Exception as err:
+                self.print_helper.error_and_exception(f"{self.name} run", err)
+                time.sleep(self.retry_seconds)
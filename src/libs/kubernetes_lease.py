@@ -0,0 +1,241 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import kubernetes
+from kubernetes import client
+from utils.hash_ring import ConsistentHashRing
+from utils.print_helper import PrintHelper
+from utils.handle_error import handle_exceptions_method
+
+
+class KubernetesShardCoordinator:
+    """
+    Coordinate the replicas of the watchdog with coordination.k8s.io Leases.
+    Each replica renews its member lease, the namespaces are split on the alive members
+    by consistent hashing and one replica holds the leader lease for the cluster scoped checks.
+    A lease is alive while its renew time plus its duration is in the future or while this replica
+    saw it change in the last lease_seconds (local clock): a clock skew between the replicas
+    does not drop a member renewed on time
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 coordination_api: client.CoordinationV1Api = None,
+                 namespace='default',
+                 identity=None,
+                 lease_prefix='k8s-watchdog',
+                 lease_seconds=30):
+
+        self.print_helper = PrintHelper('kubernetes_shard', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        self.api_instance = coordination_api
+        self.namespace = namespace
+        self.identity = identity
+        self.lease_prefix = lease_prefix
+        self.lease_seconds = lease_seconds
+        self.leader_lease = f"{lease_prefix}-leader"
+        self.member_label = "k8s-watchdog/shard-group"
+
+        # name -> (resource version, monotonic time of the last change seen)
+        self.observed = {}
+        self.leader_until = 0
+        self.members = [self.identity]
+        self.ring = ConsistentHashRing(self.members)
+        # incremented when the members change (the namespaces of this replica can change)
+        self.members_version = 0
+        self.lock = threading.Lock()
+
+        self.running = False
+        self.thread = None
+
+    @staticmethod
+    def __now__():
+        return datetime.now(timezone.utc)
+
+    def __unchanged_seconds__(self, lease):
+        """
+        Seconds since this replica saw the last change of the lease (local monotonic clock)
+        @param lease: V1Lease
+        """
+        name = lease.metadata.name
+        version = lease.metadata.resource_version
+        now = time.monotonic()
+        if name not in self.observed or self.observed[name][0] != version:
+            self.observed[name] = (version, now)
+        return now - self.observed[name][1]
+
+    def __is_alive__(self, lease):
+        """
+        True if the renew time of the lease plus its duration is in the future
+        or if the lease changed in the last lease_seconds
+        @param lease: V1Lease
+        """
+        if self.__unchanged_seconds__(lease) < self.lease_seconds:
+            return True
+        if lease.spec is None or lease.spec.renew_time is None:
+            return False
+        duration = lease.spec.lease_duration_seconds or self.lease_seconds
+        return lease.spec.renew_time + timedelta(seconds=duration) > self.__now__()
+
+    def __new_lease__(self, name, labels=None):
+        now = self.__now__()
+        return client.V1Lease(metadata=client.V1ObjectMeta(name=name,
+                                                           namespace=self.namespace,
+                                                           labels=labels),
+                              spec=client.V1LeaseSpec(holder_identity=self.identity,
+                                                      lease_duration_seconds=self.lease_seconds,
+                                                      acquire_time=now,
+                                                      renew_time=now,
+                                                      lease_transitions=0))
+
+    @handle_exceptions_method
+    def __renew_member__(self):
+        """
+        Create or renew the member lease of this replica
+        """
+        name = f"{self.lease_prefix}-member-{self.identity}"
+        try:
+            lease = self.api_instance.read_namespaced_lease(name, self.namespace)
+            lease.spec.renew_time = self.__now__()
+            self.api_instance.replace_namespaced_lease(name, self.namespace, lease)
+        except kubernetes.client.ApiException as e:
+            if e.status != 404:
+                raise e
+            self.api_instance.create_namespaced_lease(self.namespace,
+                                                      self.__new_lease__(name,
+                                                                         {self.member_label: self.lease_prefix}))
+
+    @handle_exceptions_method
+    def __update_members__(self):
+        """
+        Read the member leases and rebuild the ring if the alive members changed.
+        The leader deletes only the leases not changed for two lease periods as seen by this replica
+        """
+        leases = self.api_instance.list_namespaced_lease(self.namespace,
+                                                         label_selector=f"{self.member_label}={self.lease_prefix}")
+        members = {self.identity}
+        names = {self.leader_lease}
+        for lease in leases.items:
+            names.add(lease.metadata.name)
+            if lease.spec.holder_identity is not None and self.__is_alive__(lease):
+                members.add(lease.spec.holder_identity)
+            elif self.is_leader() and self.__unchanged_seconds__(lease) > 2 * self.lease_seconds:
+                # the leader removes the leases of the stopped replicas
+                self.print_helper.info(f"delete expired member lease {lease.metadata.name}")
+                try:
+                    self.api_instance.delete_namespaced_lease(lease.metadata.name, self.namespace)
+                    names.discard(lease.metadata.name)
+                except kubernetes.client.ApiException as e:
+                    self.print_helper.wrn(f"delete member lease {lease.metadata.name} k8s error : {e}")
+
+        self.observed = {name: value for name, value in self.observed.items() if name in names}
+
+        members = sorted(members)
+        if members != self.members:
+            self.print_helper.info(f"shard members {self.members} -> {members}")
+            with self.lock:
+                self.members = members
+                self.ring = ConsistentHashRing(members)
+                self.members_version += 1
+
+    @handle_exceptions_method
+    def __renew_leader__(self):
+        """
+        Acquire or renew the leader lease. The update is refused (409) if another replica changed it
+        """
+        try:
+            lease = self.api_instance.read_namespaced_lease(self.leader_lease, self.namespace)
+        except kubernetes.client.ApiException as e:
+            if e.status != 404:
+                raise e
+            lease = None
+
+        try:
+            if lease is None:
+                self.api_instance.create_namespaced_lease(self.namespace,
+                                                          self.__new_lease__(self.leader_lease))
+                self.print_helper.info(f"{self.identity} acquired the leader lease")
+            elif lease.spec.holder_identity == self.identity:
+                lease.spec.renew_time = self.__now__()
+                self.api_instance.replace_namespaced_lease(self.leader_lease, self.namespace, lease)
+            elif not self.__is_alive__(lease):
+                self.print_helper.info(f"{self.identity} takes the leader lease from {lease.spec.holder_identity}")
+                now = self.__now__()
+                lease.spec.holder_identity = self.identity
+                lease.spec.lease_duration_seconds = self.lease_seconds
+                lease.spec.acquire_time = now
+                lease.spec.renew_time = now
+                lease.spec.lease_transitions = (lease.spec.lease_transitions or 0) + 1
+                self.api_instance.replace_namespaced_lease(self.leader_lease, self.namespace, lease)
+            else:
+                self.leader_until = 0
+                return
+            # the leadership ends before the other replicas can take the lease
+            self.leader_until = time.monotonic() + self.lease_seconds * 2 / 3
+        except kubernetes.client.ApiException as e:
+            if e.status != 409:
+                raise e
+            self.leader_until = 0
+
+    def renew(self):
+        """
+        Renew the leases of this replica and read the members.
+        Each step runs even if the previous one failed: an error on the member lease does not drop the leadership
+        @return: list of the errors of the failed steps or None
+        """
+        errors = [res for res in (self.__renew_member__(), self.__renew_leader__(), self.__update_members__())
+                  if res is not None]
+        return errors or None
+
+    def is_leader(self):
+        """
+        True if this replica holds a valid leader lease
+        """
+        return time.monotonic() < self.leader_until
+
+    def owns_namespace(self, namespace):
+        """
+        True if the namespace is assigned to this replica
+        @param namespace: namespace name
+        """
+        with self.lock:
+            return self.ring.get_node(namespace) == self.identity
+
+    def get_members(self):
+        with self.lock:
+            return list(self.members)
+
+    @handle_exceptions_method
+    def start(self):
+        """
+        First renew and start the renew loop in a background thread
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.print_helper.info(f"start shard coordinator {self.identity} in {self.namespace}")
+        self.renew()
+        self.running = True
+        self.thread = threading.Thread(target=self.__run__,
+                                       name=f"shard-{self.identity}",
+                                       daemon=True)
+        self.thread.start()
+
+    @handle_exceptions_method
+    def stop(self):
+        self.running = False
+
+    def __run__(self):
+        """
+        Renew the leases three times in each lease period
+        """
+        while self.running:
+            time.sleep(self.lease_seconds / 3)
+            res = self.renew()
+            if res is not None:
+                self.print_helper.error(f"renew error {res}")
@@ -0,0 +1,194 @@
+import kubernetes
+from libs.kubernetes_raw import KubernetesRawItem
+from libs.kubernetes_raw import load_json
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
+from libs.kubernetes_circuit_breaker import KubernetesCircuitBreaker
+from utils.print_helper import PrintHelper
+
+
+class KubernetesLister:
+    """
+    Wrap the list calls of the k8s API used by the collectors
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 cluster_wide=False,
+                 page_limit=0,
+                 raw_json=False,
+                 field_selector=True,
+                 resource_version0=False,
+                 request_timeout=None,
+                 rate_limiter: KubernetesRateLimiter = None,
+                 circuit_breaker: KubernetesCircuitBreaker = None):
+
+        self.print_helper = PrintHelper('kubernetes_lister', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        # if True use one *_for_all_namespaces call per kind and filter the namespaces locally
+        self.cluster_wide = cluster_wide
+        # max number of items in a response. 0: the whole collection in one response
+        self.page_limit = page_limit
+        # if True skip the deserialization in the client models and parse the json body
+        self.raw_json = raw_json
+        # if True the field selectors of the collectors are sent to the API server
+        self.field_selector = field_selector
+        # list functions where the API server refused the field selector
+        self.field_selector_unsupported = set()
+        # if True the lists are served by the watch cache of the API server (resource_version="0"),
+        # the data can be a little stale but the request does not read etcd
+        self.resource_version0 = resource_version0
+        # connect and read timeout (seconds) of each request. None: wait forever
+        self.request_timeout = request_timeout
+        # client side QPS/burst limiter (None: no limit)
+        self.rate_limiter = rate_limiter
+        # stop calling an endpoint while the API server is failing (None: always call)
+        self.circuit_breaker = circuit_breaker
+
+    def __list__(self, list_function, list_metadata=None, raw_json=None, **kwargs):
+        """
+        Call the list function and yield its items.
+        With page limit the collection is requested page by page (limit/continue),
+        the memory used is bounded by the page size
+        @param list_function: k8s API list function
+        @param list_metadata: dict filled with the resource_version of the list (e.g. to start a watch)
+        @param raw_json: parse the json body instead of building the client models (None: as configured)
+        @param kwargs: arguments of the list function
+        """
+        if raw_json is None:
+            raw_json = self.raw_json
+
+        if 'field_selector' in kwargs:
+            if not self.field_selector or list_function.__name__ in self.field_selector_unsupported:
+                kwargs.pop('field_selector')
+
+        if self.page_limit > 0:
+            kwargs['limit'] = self.page_limit
+
+        if raw_json:
+            kwargs['_preload_content'] = False
+
+        if self.resource_version0:
+            kwargs['resource_version'] = '0'
+
+        if self.request_timeout is not None:
+            kwargs['_request_timeout'] = self.request_timeout
+
+        request = list_function
+        if self.rate_limiter is not None:
+            request = self.rate_limiter.limit('list', list_function)
+
+        pages = 0
+        while True:
+            try:
+                if self.circuit_breaker is not None:
+                    # the circuit is checked first: a request refused by an open circuit takes no token
+                    response = self.circuit_breaker.call(list_function.__name__, request, **kwargs)
+                else:
+                    response = request(**kwargs)
+            except kubernetes.client.ApiException as e:
+                # the field is not selectable for this kind: list without selector, the collector filters locally
+                if e.status == 400 and 'field_selector' in kwargs and pages == 0:
+                    self.print_helper.wrn(f"{list_function.__name__} field selector "
+                                          f"'{kwargs['field_selector']}' not supported. Filter locally")
+                    self.field_selector_unsupported.add(list_function.__name__)
+                    kwargs.pop('field_selector')
+                    continue
+                raise e
+            pages += 1
+            if raw_json:
+                body = load_json(response.data)
+                response.release_conn()
+                items = [KubernetesRawItem(item) for item in body.get('items') or []]
+                continue_token = (body.get('metadata') or {}).get('continue')
+                resource_version = (body.get('metadata') or {}).get('resourceVersion')
+                del body
+            else:
+                items = response.items
+                continue_token = response.metadata._continue if response.metadata is not None else None
+                resource_version = response.metadata.resource_version if response.metadata is not None else None
+            if list_metadata is not None:
+                # the pages of a list are read from the snapshot of the first one
+                list_metadata['resource_version'] = resource_version
+            # release the response, only the current page is kept in memory
+            del response
+            yield from items
+            del items
+
+            if self.page_limit == 0 or not continue_token:
+                break
+            kwargs['_continue'] = continue_token
+            # the resource version is not allowed with the continue token
+            kwargs.pop('resource_version', None)
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"{list_function.__name__} {pages} pages")
+
+    def list_items(self,
+                   namespace,
+                   list_namespaced_function,
+                   list_all_function=None,
+                   **kwargs):
+        """
+        Generator of the items in the required namespaces
+        @param namespace: list of namespaces
+        @param list_namespaced_function: k8s API list function for one namespace
+        @param list_all_function: k8s API list function for all namespaces
+        @param kwargs: arguments of the list function (e.g. label_selector, field_selector)
+        """
+        if self.cluster_wide and list_all_function is not None:
+            self.print_helper.info_if(self.print_debug,
+                                      f"list_items {list_all_function.__name__}")
+            nm_set = set(namespace)
+            for item in self.__list__(list_all_function, **kwargs):
+                if item.metadata.namespace in nm_set:
+                    yield item
+        else:
+            for nm in namespace:
+                self.print_helper.info_if(self.print_debug,
+                                          f"list_items {list_namespaced_function.__name__} nm:{nm}")
+                yield from self.__list__(list_namespaced_function, namespace=nm, **kwargs)
+
+    def list_names(self,
+                   namespace,
+                   list_namespaced_function,
+                   list_all_function=None,
+                   **kwargs):
+        """
+        Generator of the names of the items in the required namespaces.
+        The json body is parsed without building the client models and only the names are kept
+        @param namespace: list of namespaces
+        @param list_namespaced_function: k8s API list function for one namespace
+        @param list_all_function: k8s API list function for all namespaces
+        @param kwargs: arguments of the list function
+        @return: tuples (namespace, name)
+        """
+        if self.cluster_wide and list_all_function is not None:
+            nm_set = set(namespace)
+            for item in self.__list__(list_all_function, raw_json=True, **kwargs):
+                metadata = item.metadata
+                if metadata.namespace in nm_set:
+                    yield metadata.namespace, metadata.name
+        else:
+            for nm in namespace:
+                for item in self.__list__(list_namespaced_function, namespace=nm, raw_json=True, **kwargs):
+                    metadata = item.metadata
+                    yield metadata.namespace, metadata.name
+
+    def list_cluster_items(self,
+                           list_function,
+                           list_metadata=None,
+                           **kwargs):
+        """
+        Generator of cluster scoped items (e.g. nodes, persistent volumes) or of the items of all the namespaces
+        @param list_function: k8s API list function
+        @param list_metadata: dict filled with the resource_version of the list
+        @param kwargs: arguments of the list function
+        """
+        self.print_helper.info_if(self.print_debug,
+                                  f"list_cluster_items {list_function.__name__}")
+        yield from self.__list__(list_function, list_metadata, **kwargs)
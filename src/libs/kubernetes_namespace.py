@@ -1,16 +1,29 @@
+import fnmatch
+import re
+import threading
+import time
+
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_lease import KubernetesShardCoordinator
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
 
 
 class KubernetesGetNamespace:
     """
-    Obtain the list of the namespace in k8s
+    Obtain the list of the namespace in k8s.
+    The list is cached and shared by all the collectors
     """
 
     def __init__(self,
                  debug_on=True,
                  logger=None,
-                 k8s_api_instance=None):
+                 k8s_api_instance=None,
+                 k8s_lister: KubernetesLister = None,
+                 cache_seconds=0,
+                 include_patterns=None,
+                 exclude_patterns=None,
+                 k8s_shard: KubernetesShardCoordinator = None):
 
         self.print_helper = PrintHelper('kubernetes_get_namespace', logger)
         self.print_debug = debug_on
@@ -19,25 +32,123 @@ class KubernetesGetNamespace:
                                   f"__init__")
         self.api_instance = k8s_api_instance
 
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # validity of the cached list (0: list the namespaces every call)
+        self.cache_seconds = cache_seconds
+        self.cache = None
+        self.cache_time = 0
+        self.lock = threading.Lock()
+
+        # glob patterns of the namespaces to scan, compiled once
+        self.include_regex = self.__compile_patterns__(include_patterns)
+        self.exclude_regex = self.__compile_patterns__(exclude_patterns)
+
+        # sharded mode: only the namespaces assigned to this replica are returned
+        self.k8s_shard = k8s_shard
+
+    @staticmethod
+    def __compile_patterns__(patterns):
+        """
+        Compile a list of glob patterns (e.g. ci-*) in one regex
+        @param patterns: list of glob patterns
+        @return: compiled regex or None if the list is empty
+        """
+        if not patterns:
+            return None
+        return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+    def is_namespace_enabled(self, name):
+        """
+        Check the namespace against the include and exclude patterns
+        @param name: namespace name
+        @return: True if the namespace must be scanned
+        """
+        if self.include_regex is not None and not self.include_regex.match(name):
+            return False
+        if self.exclude_regex is not None and self.exclude_regex.match(name):
+            return False
+        return True
+
+    def is_namespace_watched(self, name):
+        """
+        Check the namespace against the patterns and the namespaces assigned to this replica
+        (e.g. the items of the other namespaces are not kept in the informer stores)
+        @param name: namespace name
+        @return: True if the namespace is scanned by this replica
+        """
+        if not self.is_namespace_enabled(name):
+            return False
+        return self.k8s_shard is None or self.k8s_shard.owns_namespace(name)
+
+    def get_namespace_version(self):
+        """
+        Version of the namespaces assigned to this replica, changed when the shard members change
+        @return: int
+        """
+        return self.k8s_shard.members_version if self.k8s_shard is not None else 0
+
+    def invalidate(self):
+        """
+        Force a new list at the next call
+        """
+        self.cache = None
+
     @handle_exceptions_method
     def get_namespace(self):
         """
         Obtain the list of k8s declared namespaces
         :return: List of namespaces
         """
+        namespaces = self.__get_cached_namespace__()
+        if self.k8s_shard is None or namespaces is None:
+            return namespaces
+
+        # the members can change at every renew of the leases, the cache keeps all the namespaces
+        owned = {name: details for name, details in namespaces.items() if self.k8s_shard.owns_namespace(name)}
+        self.print_helper.info(f"namespace assigned to this replica {len(owned)}/{len(namespaces)}")
+        return owned
+
+    def __get_cached_namespace__(self):
+        """
+        Return the cached list or list the namespaces if the cache is expired
+        :return: List of namespaces
+        """
+        # the collectors running in parallel wait the first list instead of calling the API again
+        with self.lock:
+            if (self.cache is not None
+                    and time.monotonic() - self.cache_time < self.cache_seconds):
+                self.print_helper.info_if(self.print_debug,
+                                          f"get_namespace from cache {len(self.cache)}")
+                return self.cache
+
+            namespaces = self.__list_namespace__()
+            if namespaces is not None:
+                self.cache = namespaces
+                self.cache_time = time.monotonic()
+            return namespaces
+
+    def __list_namespace__(self):
+        """
+        List the namespaces from the API
+        :return: List of namespaces
+        """
         try:
             self.print_helper.info(f"get_namespace")
             total_nm = 0
             namespaces = {}
-            nm_list = self.api_instance.list_namespace()
-            for namespace in nm_list.items:
+            for namespace in self.k8s_lister.list_cluster_items(self.api_instance.list_namespace):
                 total_nm += 1
+                if not self.is_namespace_enabled(namespace.metadata.name):
+                    continue
                 # api_response = self.api_instance.patch_namespace(namespace.metadata.name, body)
                 # print(namespace)
                 details = {'Status': namespace.status}
                 namespaces[namespace.metadata.name] = details
 
-            self.print_helper.info(f"namespace found {namespaces.items().__len__()}")
+            self.print_helper.info(f"namespace found {namespaces.items().__len__()}/{total_nm}")
 
             return namespaces
         except Exception as err:
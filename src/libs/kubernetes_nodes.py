@@ -1,3 +1,5 @@
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_records import NodeRecord, ConditionsRecord
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
 
@@ -11,7 +13,8 @@ class KubernetesGetNodes:
                  debug_on=True,
                  logger=None,
                  k8s_api_instance=None,
-                 cluster_name=None):
+                 cluster_name=None,
+                 k8s_lister: KubernetesLister = None):
 
         self.print_helper = PrintHelper('kubernetes_get_nodes', logger)
         self.print_debug = debug_on
@@ -22,6 +25,10 @@ class KubernetesGetNodes:
         self.api_instance = k8s_api_instance
         self.cluster_name = cluster_name
 
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
     @handle_exceptions_method
     def get_node_list(self,
                       only_problem=False):
@@ -38,8 +45,7 @@ class KubernetesGetNodes:
             self.print_helper.info(f"get_node_list. only with problem {only_problem}")
             active_context = ''
             # Listing the cluster nodes
-            node_list = self.api_instance.list_node()
-            for node in node_list.items:
+            for node in self.k8s_lister.list_cluster_items(self.api_instance.list_node):
                 total_nodes += 1
                 node_details = {}
 
@@ -81,14 +87,15 @@ class KubernetesGetNodes:
                 self.print_helper.info_if(self.print_debug, f"[{node.metadata.name}] "
                                                             f"os_image :{node.status.node_info.os_image}")
 
-                node_details['addresses'] = node.status.addresses
+                node_details['addresses'] = tuple((detail.type, detail.address)
+                                                  for detail in node.status.addresses)
                 for detail in node.status.addresses:
                     self.print_helper.info_if(self.print_debug,
                                               f"[{node.metadata.name}] ip :{detail.address} type: {detail.type}")
 
-                condition = {}
+                condition = []
                 for detail in node.status.conditions:
-                    condition[detail.reason] = detail.status
+                    condition.append((detail.reason, detail.status))
                     self.print_helper.info_if(self.print_debug,
                                               f"[{node.metadata.name}] reason:{detail.reason}[{detail.type}]"
                                               f" status: {detail.status}")
@@ -103,11 +110,11 @@ class KubernetesGetNodes:
                                     add_node = False
                     else:
                         add_node = True
-                node_details['conditions'] = condition
+                node_details['conditions'] = ConditionsRecord(condition)
 
                 if add_node:
                     retrieved_nodes += 1
-                    nodes[node.metadata.name] = node_details
+                    nodes[node.metadata.name] = NodeRecord(**node_details)
 
             self.print_helper.info(f"Total nodes {total_nodes}- retrieved {retrieved_nodes}")
 
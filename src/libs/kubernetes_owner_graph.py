@@ -0,0 +1,75 @@
+class KubernetesOwnerGraph:
+    """
+    Index of the owner references of the items received in one cycle
+    (Pod -> ReplicaSet -> Deployment, Pod -> StatefulSet/DaemonSet).
+    The owners of the items listed by the collectors (e.g. all the replica sets, with problem or not)
+    are kept between the cycles: the pods of a deployment have the same root whether or not
+    the alerts of the replica sets are enabled.
+    The items are identified by the tuple (kind, namespace, name)
+    """
+
+    def __init__(self):
+        # item -> owner
+        self.owners = {}
+        # kind -> (namespace, name) -> (owner kind, owner name), replaced at each list of the kind
+        self.listed_owners = {}
+
+    def clear(self):
+        """
+        Clear the owners of the items received in the cycle, the listed owners are kept
+        """
+        self.owners = {}
+
+    def add(self, kind, namespace, name, owner_kind, owner_name):
+        """
+        Add the owner of an item. The owner is in the namespace of the item
+        """
+        if owner_kind is not None and owner_name is not None:
+            self.owners[(kind, namespace, name)] = (owner_kind, namespace, owner_name)
+
+    def add_items(self, kind, items):
+        """
+        Add the owners of the items of one kind
+        @param kind: k8s kind (e.g. Pod)
+        @param items: dict name -> details with namespace, own_kind and own_name
+        """
+        for name, details in items.items():
+            self.add(kind, details.get('namespace'), name, details.get('own_kind'), details.get('own_name'))
+
+    def set_listed_owners(self, kind, owners):
+        """
+        Replace the owners of all the items of one kind listed by a collector.
+        Called by the collector threads: the index of the kind is replaced in one assignment
+        @param kind: k8s kind (e.g. ReplicaSet)
+        @param owners: dict (namespace, name) -> (owner kind, owner name)
+        """
+        self.listed_owners[kind] = owners
+
+    def get_owner(self, node):
+        """
+        Owner of an item received in the cycle or listed by a collector
+        @param node: tuple (kind, namespace, name)
+        @return: tuple (kind, namespace, name) or None
+        """
+        owner = self.owners.get(node)
+        if owner is None:
+            kind, namespace, name = node
+            listed = self.listed_owners.get(kind)
+            owner_ref = listed.get((namespace, name)) if listed is not None else None
+            if owner_ref is not None and owner_ref[0] is not None and owner_ref[1] is not None:
+                owner = (owner_ref[0], namespace, owner_ref[1])
+        return owner
+
+    def get_root(self, kind, namespace, name):
+        """
+        Last owner known following the owner references
+        @return: tuple (kind, namespace, name), the item itself if it has no owner
+        """
+        node = (kind, namespace, name)
+        seen = set()
+        owner = self.get_owner(node)
+        while owner is not None and node not in seen:
+            seen.add(node)
+            node = owner
+            owner = self.get_owner(node)
+        return node
@@ -1,4 +1,7 @@
 from libs.kubernetes_namespace import KubernetesGetNamespace
+from libs.kubernetes_informer import KubernetesInformer
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_records import PodRecord, ConditionsRecord, ContainerStatusRecord
 import kubernetes
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
@@ -8,29 +11,154 @@ class KubernetesGetPods:
     """
     Obtain the list of pods defined in k8s
     """
+    # phases checked when no phase is required
+    default_phase = {"Running", "Completed", "ContainerCreating"}
 
     def __init__(self,
                  debug_on=True,
                  logger=None,
                  k8s_api_instance=None,
                  k8s_apps_instance=None,
-                 cluster_name=None):
+                 cluster_name=None,
+                 pod_informer: KubernetesInformer = None,
+                 k8s_lister: KubernetesLister = None,
+                 k8s_namespace: KubernetesGetNamespace = None):
 
         self.print_helper = PrintHelper('kubernetes_get_pods', logger)
         self.print_debug = debug_on
 
         self.print_helper.info_if(self.print_debug,
                                   f"__init__")
-        self.k8s_namespace = KubernetesGetNamespace(debug_on,
-                                                    logger,
-                                                    k8s_api_instance)
         self.api_instance = k8s_api_instance
         self.apps_instance = k8s_apps_instance
         self.cluster_name = cluster_name
+        # store of pod records updated by watch stream (None: list the pods every call)
+        self.pod_informer = pod_informer
+        # version of the namespaces kept in the informer store (changed by the shard members)
+        self.informer_namespace_version = 0
+
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # shared namespace registry
+        self.k8s_namespace = k8s_namespace
+        if self.k8s_namespace is None:
+            self.k8s_namespace = KubernetesGetNamespace(debug_on,
+                                                        logger,
+                                                        k8s_api_instance,
+                                                        k8s_lister=self.k8s_lister)
 
     def set_cluster_name(self, cluster_name):
         self.cluster_name = cluster_name
 
+    @staticmethod
+    def get_pod_record(pod, cluster_name=None):
+        """
+        Extract the details of a pod read by the checks and the messages
+        (also the records kept in the informer store)
+        :param pod: k8s pod item
+        :param cluster_name: name of the cluster
+        :return: PodRecord
+        """
+        status = [(detail.type, detail.status) for detail in pod.status.conditions or []]
+
+        containers = []
+        for detail in pod.status.container_statuses or []:
+            state = None
+            reason = None
+            if detail.state.waiting is not None:
+                state = "Waiting"
+                reason = detail.state.waiting.reason
+            elif detail.state.terminated is not None:
+                state = "Terminated"
+                reason = detail.state.terminated.reason
+            elif detail.state.running is not None:
+                state = "Running"
+            containers.append(ContainerStatusRecord(str(detail.image).rsplit('/', 1)[-1],
+                                                    detail.restart_count,
+                                                    detail.ready,
+                                                    detail.started,
+                                                    state,
+                                                    reason))
+
+        owner = pod.metadata.owner_references[0] if pod.metadata.owner_references else None
+
+        return PodRecord(cluster_name,
+                         pod.metadata.namespace,
+                         pod.status.phase,
+                         ConditionsRecord(status),
+                         tuple(containers),
+                         owner.controller if owner is not None else None,
+                         owner.kind if owner is not None else None,
+                         owner.name if owner is not None else None)
+
+    @staticmethod
+    def is_alert_changed(old_record, new_record):
+        """
+        Check if a change of a pod changes the alerts with the default phases (e.g. a container in CrashLoopBackOff)
+        :param old_record: PodRecord before the change (None: new pod)
+        :param new_record: PodRecord after the change (None: deleted pod)
+        :return: True if the pod is reported before or after the change
+        """
+        phase = KubernetesGetPods.default_phase
+        return any(record is not None and KubernetesGetPods.is_reported(record, phase, False)
+                   for record in (old_record, new_record))
+
+    @staticmethod
+    def is_reported(record, phase, phase_equal):
+        """
+        Check if the pod must be reported from the state of its containers
+        :param record: PodRecord
+        :param phase: dict of phase to be controlled
+        :param phase_equal:
+        :return: True if the pod must be reported
+        """
+        for container in record.containers:
+            if container.state == "Waiting":
+                state_ckc = "Waiting"
+                # LS 2023.11.01 15:30 add control is in a phase force the state check to new value
+                if container.reason is not None and container.reason in phase:
+                    state_ckc = container.reason
+            elif container.state == "Terminated":
+                state_ckc = container.reason
+            elif container.state == "Running":
+                state_ckc = "Running"
+            else:
+                state_ckc = ""
+            # LS 2023.10.28 add control status POD
+            if (state_ckc in phase) == phase_equal:
+                return True
+        return False
+
+    def __get_pod_details__(self, pod, phase, phase_equal):
+        """
+        Extract the details of a pod and check if the pod must be reported
+        :param pod: k8s pod item
+        :param phase: dict of phase to be controlled
+        :param phase_equal:
+        :return: tuple (add_phase, PodRecord)
+        """
+        self.print_helper.info_if(self.print_debug,
+                                  f"pod {pod.metadata.name} is in phase {phase}")
+        condition = self.get_pod_record(pod, self.cluster_name)
+
+        if self.print_debug:
+            for detail in pod.status.conditions or []:
+                self.print_helper.info(f"[{pod.metadata.name}] "
+                                       f"reason:{detail.reason} "
+                                       f"type:{detail.type} "
+                                       f"message:{detail.message} "
+                                       f"status: {detail.status}")
+            for container in condition.containers:
+                self.print_helper.info(f"[{pod.metadata.name}] "
+                                       f"restart:{container.restart} "
+                                       f"ready:{container.ready} "
+                                       f"started:{container.started} "
+                                       f"state: {container.state} {container.reason or ''}")
+
+        return self.is_reported(condition, phase, phase_equal), condition
+
     @handle_exceptions_method
     def get_pods(self,
                  namespace,
@@ -50,11 +178,10 @@ class KubernetesGetPods:
 
         # LS 2023.10.28 update the parameter from str to object
         if phase is None or len(phase) == 0:
-            phase = {"Running", "Completed", "ContainerCreating"}
+            phase = self.default_phase
 
         try:
             self.print_helper.info(f"get_pods - found pods where phase is  {phase}  and equal {phase_equal} ")
-            total_nm = 0
             pods = {}
 
             if namespace is not None:
@@ -62,130 +189,35 @@ class KubernetesGetPods:
             else:
                 nm_list = self.k8s_namespace.get_namespace()
 
-            for nm in nm_list:
-                total_nm += 1
-
-                self.print_helper.info_if(self.print_debug, f"get_pods  nm:{nm}")
+            total_nm = len(nm_list)
+            if self.pod_informer is not None:
+                namespace_version = self.k8s_namespace.get_namespace_version()
+                if namespace_version != self.informer_namespace_version:
+                    # the store keeps only the namespaces of this replica: list again with the new ones,
+                    # the pods are listed by the collector until the informer is synced
+                    self.informer_namespace_version = namespace_version
+                    self.pod_informer.resync()
+
+            if (self.pod_informer is not None
+                    and not label_selector
+                    and self.pod_informer.is_synced()):
+                # read the pod records from the informer store, no api call
+                for (_, name), condition in self.pod_informer.get_items(nm_list).items():
+                    if self.is_reported(condition, phase, phase_equal):
+                        pods[name] = condition
+            else:
+                kwargs = {'watch': False}
                 if label_selector:
-                    nm_list = self.api_instance.list_namespaced_pod(namespace=nm,
-                                                                    watch=False,
-                                                                    label_selector=label_selector)
-                else:
-                    nm_list = self.api_instance.list_namespaced_pod(namespace=nm,
-                                                                    watch=False)
-
-                if not nm_list.items:
-                    self.print_helper.info_if(self.print_debug,
-                                              f"no pod '{label_selector}' were found in {nm}'")
-                else:
-                    self.print_helper.info_if(self.print_debug,
-                                              f"Found {len(nm_list.items)} pods in {nm}")
-
-                for pod in nm_list.items:
-                    condition = {}
-                    self.print_helper.info_if(self.print_debug,
-                                              f"pod {pod.metadata.name} is in phase {phase}")
-                    add_phase = False
-                    # LS 2023.10.28 the control is moved in the container status details
-                    # if len(phase) > 0:
-                    # if phase_equal:
-                    #     # if pod.status.phase == phase:
-                    #     if pod.status.phase in phase:
-                    #         add_phase = True
-                    # else:
-                    #     # if pod.status.phase != phase:
-                    #     if not (pod.status.phase in phase):
-                    #         add_phase = True
-                    # else:
-                    #    add_phase = True
-                    condition['cluster'] = self.cluster_name
-                    condition['namespace'] = pod.metadata.namespace
-                    condition['phase'] = pod.status.phase
-
-                    status = {}
-                    # n_condition = 0
-                    for detail in pod.status.conditions:
-                        status[detail.type] = detail.status
-                        # condition[f'condition_{n_condition}'] = {'message': detail.message,
-                        #                                          'reason': detail.reason,
-                        #                                          'status': detail.status,
-                        #                                          'type': detail.type}
-                        # condition[f'condition_{n_condition}'] = {detail.type: detail.status}
-                        # n_condition += 1
-                        self.print_helper.info_if(self.print_debug,
-                                                  f"[{pod.metadata.name}] "
-                                                  f"reason:{detail.reason} "
-                                                  f"type:{detail.type} "
-                                                  f"message:{detail.message} "
-                                                  f"status: {detail.status}")
-                    condition['conditions'] = status
-
-                    if pod.status.container_statuses:
-                        # LS  2023.10.18 Comment and iterate each child nodes
-                        # condition['cs_restart_count'] = pod.status.container_statuses[0].restart_count
-                        # condition['cs_ready'] = pod.status.container_statuses[0].ready
-                        # condition['cs_started'] = pod.status.container_statuses[0].started
-                        # condition['cs_state'] = pod.status.container_statuses[0].state
-
-                        container_statuses = 0
-                        for detail in pod.status.container_statuses:
-                            # print(pod.status.container_statuses)
-                            state = {}
-                            state_ckc = ""
-
-                            if detail.state.waiting is not None:
-                                state_ckc = "Waiting"
-                                # 'message': detail.state.waiting.message,
-
-                                state = {"Waiting": 'True',
-                                         'reason': detail.state.waiting.reason
-                                         }
-                                # LS 2023.11.01 15:30 add control is in a phase force the state check to new value
-                                if detail.state.waiting.reason is not None:
-                                    if detail.state.waiting.reason in phase:
-                                        state_ckc = detail.state.waiting.reason
-                            elif detail.state.terminated is not None:
-                                state_ckc = detail.state.terminated.reason
-                                # 'message': detail.state.terminated.message,
-                                state = {"Terminated": 'True',
-                                         'reason': detail.state.terminated.reason
-                                         }
-
-                            elif detail.state.running is not None:
-                                state = {"Running": 'True'}
-                                state_ckc = "Running"
-
-                            condition[f'cs_{container_statuses}'] = {'image': str(detail.image).rsplit('/', 1)[-1],
-                                                                     'restart': f"{detail.restart_count}",
-                                                                     'ready': f"{detail.ready}",
-                                                                     'started': f"{detail.started}",
-                                                                     'state': state}
-
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"[{pod.metadata.name}] "
-                                                      f"restart:{detail.restart_count} "
-                                                      f"ready:{detail.ready} "
-                                                      f"started:{detail.started} "
-                                                      f"state: {state}")
-                            # LS 2023.10.28 add control status POD
-                            if phase_equal:
-                                if state_ckc in phase:
-                                    add_phase = True
-                            else:
-                                if not (state_ckc in phase):
-                                    add_phase = True
-
-                    if pod.metadata.owner_references:
-                        condition['own_controller'] = pod.metadata.owner_references[0].controller
-                        condition['own_kind'] = pod.metadata.owner_references[0].kind
-                        condition['own_name'] = pod.metadata.owner_references[0].name
-
-                    # if add_phase:
-                    #     print("----")
-                    #     print(f"name={pod.metadata.name}")
-                    #     print(pod.status.container_statuses)
-                    #     print("*****")
-
+                    kwargs['label_selector'] = label_selector
+                # the containers of a succeeded pod are terminated with reason Completed:
+                # they are never reported, skip them on server side
+                if not phase_equal and 'Completed' in phase:
+                    kwargs['field_selector'] = 'status.phase!=Succeeded'
+                for pod in self.k8s_lister.list_items(nm_list,
+                                                      self.api_instance.list_namespaced_pod,
+                                                      self.api_instance.list_pod_for_all_namespaces,
+                                                      **kwargs):
+                    add_phase, condition = self.__get_pod_details__(pod, phase, phase_equal)
                     if add_phase:
                         pods[pod.metadata.name] = condition
 
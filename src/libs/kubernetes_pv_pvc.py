@@ -1,4 +1,6 @@
 from libs.kubernetes_namespace import KubernetesGetNamespace
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_records import PvcRecord, PvRecord
 import kubernetes
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
@@ -13,17 +15,30 @@ class KubernetesGetPvPvc:
                  debug_on=True,
                  logger=None,
                  k8s_api_instance=None,
-                 cluster_name=None):
+                 cluster_name=None,
+                 k8s_lister: KubernetesLister = None,
+                 k8s_namespace: KubernetesGetNamespace = None):
 
         self.print_helper = PrintHelper('kubernetes_get_pv_pvc', logger)
         self.print_debug = debug_on
 
         self.print_helper.info_if(self.print_debug,
                                   f"__init__")
-        self.k8s_namespace = KubernetesGetNamespace(debug_on, logger)
         self.api_instance = k8s_api_instance
         self.cluster_name = cluster_name
 
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # shared namespace registry
+        self.k8s_namespace = k8s_namespace
+        if self.k8s_namespace is None:
+            self.k8s_namespace = KubernetesGetNamespace(debug_on,
+                                                        logger,
+                                                        k8s_api_instance,
+                                                        k8s_lister=self.k8s_lister)
+
     @handle_exceptions_method
     def get_pvc_claim(self,
                       namespace,
@@ -36,41 +51,39 @@ class KubernetesGetPvPvc:
             if namespace is not None:
                 nm_list = namespace
             else:
-                nm_list = self.k8s_namespace.get_namespace(self.api_instance)
+                nm_list = self.k8s_namespace.get_namespace()
             total = 0
             if nm_list is not None:
-                for nm in nm_list:
-                    self.print_helper.info_if(self.print_debug,
-                                              f"get_pvc_claim  nm:{nm}")
-                    nm_dp = self.api_instance.list_namespaced_persistent_volume_claim(nm)
-                    for st in nm_dp.items:
-                        total += 1
-
-                        add_st_sets = False
-                        if phase:
-                            if equal_to_phase:
-                                if st.status.phase == phase:
-                                    add_st_sets = True
-                            else:
-                                if st.status.phase != phase:
-                                    add_st_sets = True
+                for st in self.k8s_lister.list_items(nm_list,
+                                                     self.api_instance.list_namespaced_persistent_volume_claim,
+                                                     self.api_instance.list_persistent_volume_claim_for_all_namespaces):
+                    total += 1
+
+                    add_st_sets = False
+                    if phase:
+                        if equal_to_phase:
+                            if st.status.phase == phase:
+                                add_st_sets = True
                         else:
-                            add_st_sets = True
+                            if st.status.phase != phase:
+                                add_st_sets = True
+                    else:
+                        add_st_sets = True
 
-                        if add_st_sets:
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"pvc:{st.metadata.name} in {st.metadata.namespace} phase "
-                                                      f"{st.status.phase}")
-                            details = {'cluster': self.cluster_name,
-                                       'namespace': st.metadata.namespace,
-                                       'phase': st.status.phase,
-                                       'storage_class_name': st.spec.storage_class_name}
-
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"pvc.phase : {st.status.phase}")
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"pvc.storage_class_name: {st.spec.storage_class_name}")
-                            st_sets[st.metadata.name] = details
+                    if add_st_sets:
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"pvc:{st.metadata.name} in {st.metadata.namespace} phase "
+                                                  f"{st.status.phase}")
+                        details = PvcRecord(self.cluster_name,
+                                            st.metadata.namespace,
+                                            st.status.phase,
+                                            st.spec.storage_class_name)
+
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"pvc.phase : {st.status.phase}")
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"pvc.storage_class_name: {st.spec.storage_class_name}")
+                        st_sets[st.metadata.name] = details
 
             self.print_helper.info(f"{len(st_sets)}/{total} pvc found "
                                    f"{'in' if equal_to_phase else 'not in'} phase {phase}")
@@ -99,8 +112,7 @@ class KubernetesGetPvPvc:
             total = 0
             # if nm_list is not None:
             #     for nm in nm_list:
-            nm_dp = self.api_instance.list_persistent_volume()
-            for st in nm_dp.items:
+            for st in self.k8s_lister.list_cluster_items(self.api_instance.list_persistent_volume):
                 total += 1
                 add_st_sets = False
                 if phase:
@@ -117,13 +129,12 @@ class KubernetesGetPvPvc:
                     self.print_helper.info_if(self.print_debug,
                                               f"pv:{st.metadata.name} in {st.metadata.namespace} phase "
                                               f"{st.status.phase}")
-                    details = {'cluster': self.cluster_name,
-                               'namespace': st.metadata.namespace,
-                               'phase': st.status.phase,
-                               'storage_class_name': st.spec.storage_class_name,
-                               'pv.claim_ref': st.spec.claim_ref.name,
-                               'pv.claim_ref_namespace': st.spec.claim_ref.namespace
-                               }
+                    details = PvRecord(self.cluster_name,
+                                       st.metadata.namespace,
+                                       st.status.phase,
+                                       st.spec.storage_class_name,
+                                       st.spec.claim_ref.name,
+                                       st.spec.claim_ref.namespace)
 
                     self.print_helper.info_if(self.print_debug,
                                               f"pv.phase : {st.status.phase}")
@@ -0,0 +1,135 @@
+import functools
+import threading
+import time
+
+from utils.print_helper import PrintHelper
+from utils.handle_error import handle_exceptions_method
+
+
+class TokenBucket:
+    """
+    Token bucket: qps tokens are added every second up to burst tokens
+    """
+
+    def __init__(self, qps, burst):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token. When the bucket is empty the token is reserved in advance,
+        the callers are served in order of arrival
+        @return: seconds to wait before using the token
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.qps)
+            self.last = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.qps
+
+
+class KubernetesRateLimiter:
+    """
+    Client side QPS/burst limiter of the requests to the API server, with one budget for each verb
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 qps=0,
+                 burst=10,
+                 verb_limits=None):
+
+        self.print_helper = PrintHelper('kubernetes_rate_limiter', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        # default budget of the verbs. qps 0: no limit
+        self.qps = qps
+        self.burst = burst
+        # budgets of single verbs {verb: (qps, burst)}
+        self.verb_limits = verb_limits or {}
+
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def __get_bucket__(self, verb):
+        """
+        Bucket of the verb, created at the first request
+        @param verb: k8s verb (e.g. list, get, watch)
+        @return: TokenBucket or None if the verb is not limited
+        """
+        with self.lock:
+            if verb not in self.buckets:
+                qps, burst = self.verb_limits.get(verb, (self.qps, self.burst))
+                self.buckets[verb] = TokenBucket(qps, burst) if qps > 0 else None
+                self.stats[verb] = {'requests': 0, 'throttled': 0, 'wait_seconds': 0.0}
+            return self.buckets[verb]
+
+    def acquire(self, verb='list'):
+        """
+        Wait for the budget of the verb. Called by the threads of the k8s client,
+        the event loop is never blocked
+        @param verb: k8s verb
+        @return: seconds waited
+        """
+        bucket = self.__get_bucket__(verb)
+        wait = bucket.reserve() if bucket is not None else 0
+
+        with self.lock:
+            stats = self.stats[verb]
+            stats['requests'] += 1
+            if wait > 0:
+                stats['throttled'] += 1
+                stats['wait_seconds'] += wait
+
+        if wait > 0:
+            self.print_helper.info_if(self.print_debug,
+                                      f"{verb} throttled {wait:.2f} sec")
+            time.sleep(wait)
+        return wait
+
+    def limit(self, verb, function):
+        """
+        Wrap a function of the k8s client: the budget of the verb is taken when the request is sent
+        (e.g. after the check of the circuit breaker)
+        @param verb: k8s verb
+        @param function: k8s API function
+        @return: function with the same name and docstring (read by the watch streams)
+        """
+        @functools.wraps(function)
+        def limited(*args, **kwargs):
+            self.acquire(verb)
+            return function(*args, **kwargs)
+        return limited
+
+    @handle_exceptions_method
+    def get_stats(self):
+        """
+        Counters of the requests and of the throttled waits for each verb
+        @return: dict verb -> counters
+        """
+        with self.lock:
+            return {verb: dict(stats) for verb, stats in self.stats.items()}
+
+    def print_stats(self):
+        """
+        Log the counters of the limited verbs
+        """
+        stats = self.get_stats()
+        if not stats or 'error' in stats:
+            return
+        for verb, counters in stats.items():
+            if self.buckets.get(verb) is not None:
+                self.print_helper.info(f"api rate limiter {verb}: requests {counters['requests']} - "
+                                       f"throttled {counters['throttled']} - "
+                                       f"wait {counters['wait_seconds']:.1f} sec")
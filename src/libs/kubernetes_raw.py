@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+try:
+    import orjson as json_parser
+except ImportError:
+    import json as json_parser
+
+
+@lru_cache(maxsize=512)
+def camel_case(name):
+    """
+    Convert the attribute name of the client models to the json field name
+    (e.g. container_statuses -> containerStatuses, _continue -> continue)
+    @param name: attribute name
+    @return: json field name
+    """
+    parts = name.lstrip('_').split('_')
+    return parts[0] + ''.join(part.title() for part in parts[1:])
+
+
+def wrap_value(value):
+    """
+    Wrap the json objects, the other values are returned as they are
+    @param value: value decoded from json
+    """
+    if isinstance(value, dict):
+        return KubernetesRawItem(value)
+    if isinstance(value, list):
+        return [wrap_value(item) for item in value]
+    return value
+
+
+def load_json(data):
+    """
+    Decode a json body with the fastest parser available
+    @param data: bytes of the body
+    @return: dict
+    """
+    return json_parser.loads(data)
+
+
+class KubernetesRawItem:
+    """
+    Read-only view of a k8s item decoded from json with the attribute names of the client models
+    (e.g. pod.status.container_statuses). Only the fields read by the filters are converted
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return wrap_value(self._data.get(camel_case(name)))
+
+    # dict access for the fields that are maps in the client models (e.g. metadata.labels)
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def items(self):
+        return self._data.items()
+
+    def to_dict(self):
+        return self._data
+
+    def __eq__(self, other):
+        if isinstance(other, KubernetesRawItem):
+            return self._data == other._data
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self._data)
@@ -0,0 +1,282 @@
+import sys
+from operator import itemgetter
+
+
+def intern_string(value):
+    """
+    Intern the strings repeated in many records (cluster, namespace, phase, image...)
+    @param value: any value
+    @return: the interned string or the value as it is
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def render_value(value):
+    """
+    Convert a record (or a value containing records) in dict
+    @param value: record or value
+    """
+    if isinstance(value, KubernetesRecord):
+        return value.to_dict()
+    return value
+
+
+class KubernetesRecord(tuple):
+    """
+    Compact snapshot of a k8s item, converted in dict only when the message is formatted.
+    As namedtuple the values are kept in a tuple without __dict__ (__slots__ = ()) and read by name,
+    the comparisons and the hashes of the snapshots run in C.
+    The dict keys are the field names unless a different key is declared in render_keys
+    """
+
+    __slots__ = ()
+    # names of the values
+    fields = ()
+    # keys of the rendered dict in the order of the fields (None: the field names)
+    render_keys = None
+    # fields with strings to intern
+    interned = ()
+    # counters changing without a change of state (e.g. restart count), not in the fingerprints
+    volatile = ()
+    # max number of equal records shared by the snapshots (0: a new record at each read)
+    canonical_size = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for index, name in enumerate(cls.fields):
+            setattr(cls, name, property(itemgetter(index), doc=f"{name} (field {index})"))
+        cls.interned_index = tuple(cls.fields.index(name) for name in cls.interned)
+        cls.instances = {}
+        stable_index = tuple(index for index, name in enumerate(cls.fields) if name not in cls.volatile)
+        if len(stable_index) > 1:
+            cls.stable_values = itemgetter(*stable_index)
+        else:
+            cls.stable_values = staticmethod(lambda item: tuple(tuple.__getitem__(item, index)
+                                                                 for index in stable_index))
+
+    def __new__(cls, *args, **kwargs):
+        values = list(args[:len(cls.fields)])
+        values.extend(kwargs.get(name) for name in cls.fields[len(values):])
+        for index in cls.interned_index:
+            values[index] = intern_string(values[index])
+        return cls.canonical(tuple.__new__(cls, values))
+
+    @classmethod
+    def canonical(cls, record):
+        """
+        Record equal to the given one already built, as the interned strings: the snapshots read one
+        after the other share the same objects and their comparison stops at the identity check
+        @param record: new record
+        """
+        if not cls.canonical_size:
+            return record
+        instances = cls.instances
+        canonical_record = instances.get(record)
+        if canonical_record is None:
+            if len(instances) >= cls.canonical_size:
+                instances.clear()
+            instances[record] = canonical_record = record
+        return canonical_record
+
+    def __getnewargs__(self):
+        # copy and pickle through __new__ (the tuple default passes the values as one argument)
+        return tuple(self)
+
+    def values(self):
+        return tuple(self)
+
+    def to_dict(self):
+        """
+        Render the record in the dict format of the messages
+        """
+        return {key: render_value(value) for key, value in zip(self.render_keys or self.fields, self)}
+
+    # dict like access (e.g. details.get('namespace'))
+    def items(self):
+        return self.to_dict().items()
+
+    def get(self, key, default=None):
+        names = self.render_keys or self.fields
+        if key in names:
+            return tuple.__getitem__(self, names.index(key))
+        return default
+
+    def __contains__(self, key):
+        return key in (self.render_keys or self.fields)
+
+    def __repr__(self):
+        return f"{type(self).__name__}{tuple.__repr__(self)}"
+
+    @classmethod
+    def fingerprint_fields(cls, keys=None):
+        """
+        Indexes of the fields with the values of the keys of the rendered dict
+        @param keys: keys of the rendered dict (None: all)
+        """
+        names = cls.render_keys or cls.fields
+        return tuple(index for index, key in enumerate(names) if keys is None or key in keys)
+
+    @classmethod
+    def fingerprint_getter(cls, keys=None):
+        """
+        Function returning the values hashed by the fingerprint (built once for each kind)
+        """
+        indexes = cls.fingerprint_fields(keys)
+        if len(indexes) > 1:
+            return itemgetter(*indexes)
+        # itemgetter of one index does not return a tuple
+        return lambda item: tuple(tuple.__getitem__(item, index) for index in indexes)
+
+    def fingerprint(self, keys=None):
+        """
+        Hash of the values of the keys (e.g. the keys written in the message).
+        The hash is stable while the process runs
+        @param keys: keys of the rendered dict (None: all)
+        """
+        return hash(self.fingerprint_getter(keys)(self))
+
+
+class ConditionsRecord(KubernetesRecord):
+    """
+    Conditions of an item as tuple of (type, status), rendered as dict type -> status
+    """
+    __slots__ = ()
+    canonical_size = 4096
+
+    def __new__(cls, pairs=()):
+        return cls.canonical(tuple.__new__(cls, ((intern_string(key), intern_string(value)) for key, value in pairs)))
+
+    def __getnewargs__(self):
+        return tuple(self),
+
+    def to_dict(self):
+        return dict(self)
+
+
+class ContainerStatusRecord(KubernetesRecord):
+    """
+    Status of a container of a pod
+    """
+    __slots__ = ()
+    fields = ('image', 'restart', 'ready', 'started', 'state', 'reason')
+    interned = ('image', 'state', 'reason')
+    volatile = ('restart',)
+    canonical_size = 65536
+
+    def to_dict(self):
+        state = {}
+        if self.state is not None:
+            state[self.state] = 'True'
+            if self.state != 'Running':
+                state['reason'] = self.reason
+        return {'image': self.image,
+                'restart': f"{self.restart}",
+                'ready': f"{self.ready}",
+                'started': f"{self.started}",
+                'state': state}
+
+
+class PodRecord(KubernetesRecord):
+    """
+    Pod with problem
+    """
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'phase', 'conditions', 'containers',
+              'own_controller', 'own_kind', 'own_name')
+    interned = ('cluster', 'namespace', 'phase', 'own_kind', 'own_name')
+    canonical_size = 65536
+
+    def to_dict(self):
+        details = {'cluster': self.cluster,
+                   'namespace': self.namespace,
+                   'phase': self.phase,
+                   'conditions': render_value(self.conditions)}
+        for index, container in enumerate(self.containers or ()):
+            details[f'cs_{index}'] = container.to_dict()
+        if self.own_kind is not None:
+            details['own_controller'] = self.own_controller
+            details['own_kind'] = self.own_kind
+            details['own_name'] = self.own_name
+        return details
+
+    def get(self, key, default=None):
+        return self.to_dict().get(key, default) if key.startswith('cs_') else super().get(key, default)
+
+    @classmethod
+    def fingerprint_fields(cls, keys=None):
+        # the containers are rendered as cs_0, cs_1...
+        if keys is not None and any(key.startswith('cs_') for key in keys):
+            keys = set(keys)
+            keys.add('containers')
+        return super().fingerprint_fields(keys)
+
+    @classmethod
+    def fingerprint_getter(cls, keys=None):
+        """
+        As KubernetesRecord.fingerprint_getter, the containers without the volatile fields:
+        a pod in CrashLoopBackOff does not change at each restart
+        """
+        indexes = cls.fingerprint_fields(keys)
+        containers_index = cls.fields.index('containers')
+        if containers_index not in indexes:
+            return super().fingerprint_getter(keys)
+
+        other_index = tuple(index for index in indexes if index != containers_index)
+        other_values = itemgetter(*other_index) if other_index else (lambda item: ())
+        containers_values = itemgetter(containers_index)
+        stable_values = ContainerStatusRecord.stable_values
+
+        def getter(item):
+            return other_values(item), tuple(map(stable_values, containers_values(item) or ()))
+        return getter
+
+
+class NodeRecord(KubernetesRecord):
+    """
+    Cluster node
+    """
+    __slots__ = ()
+    fields = ('cluster', 'context', 'name', 'role', 'version', 'architecture', 'operating_system',
+              'kernel_version', 'os_image', 'addresses', 'conditions')
+    interned = ('cluster', 'context', 'role', 'version', 'architecture', 'operating_system',
+                'kernel_version', 'os_image')
+
+
+class StatefulSetRecord(KubernetesRecord):
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'available_replicas', 'current_replicas', 'replicas', 'ready_replicas')
+    interned = ('cluster', 'namespace')
+
+
+class ReplicaSetRecord(KubernetesRecord):
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'available_replicas', 'replicas', 'ready_replicas', 'own_kind', 'own_name')
+    interned = ('cluster', 'namespace', 'own_kind', 'own_name')
+
+
+class DeploymentRecord(KubernetesRecord):
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'available_replicas', 'replicas', 'ready_replicas')
+    interned = ('cluster', 'namespace')
+
+
+class DaemonSetRecord(KubernetesRecord):
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'current_number_scheduled', 'desired_number_scheduled',
+              'number_available', 'updated_number_scheduled', 'number_ready')
+    interned = ('cluster', 'namespace')
+
+
+class PvcRecord(KubernetesRecord):
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'phase', 'storage_class_name')
+    interned = ('cluster', 'namespace', 'phase', 'storage_class_name')
+
+
+class PvRecord(KubernetesRecord):
+    __slots__ = ()
+    fields = ('cluster', 'namespace', 'phase', 'storage_class_name', 'claim_ref', 'claim_ref_namespace')
+    render_keys = ('cluster', 'namespace', 'phase', 'storage_class_name', 'pv.claim_ref', 'pv.claim_ref_namespace')
+    interned = ('cluster', 'namespace', 'phase', 'storage_class_name', 'claim_ref_namespace')
@@ -0,0 +1,108 @@
+import time
+
+from utils.print_helper import PrintHelper
+
+
+class KubernetesScheduler:
+    """
+    Decide when each kind of k8s items must be read again.
+    Every kind has its own interval: the healthy kinds without changes back off,
+    the kinds with active alerts are read more often
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 intervals=None,
+                 backoff_factor=2,
+                 backoff_max=4,
+                 alert_factor=2,
+                 min_seconds=5):
+
+        self.print_helper = PrintHelper('kubernetes_scheduler', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+
+        # base interval (seconds) for each kind key
+        self.intervals = intervals or {}
+        # the interval of a healthy kind without changes is multiplied by backoff_factor
+        # up to backoff_max times the base interval
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        # the interval of a kind with active alerts is the base interval divided by alert_factor
+        self.alert_factor = alert_factor
+        self.min_seconds = min_seconds
+
+        now = time.monotonic()
+        # all the kinds are read at the first cycle
+        self.current = {key: interval for key, interval in self.intervals.items()}
+        self.next_time = {key: now for key in self.intervals}
+        self.last_data = {}
+
+    def due_kinds(self, now=None):
+        """
+        Keys of the kinds to read now
+        @param now: monotonic time (None: current time)
+        @return: list of kind keys in the order of the configuration
+        """
+        if now is None:
+            now = time.monotonic()
+        return [key for key, next_time in self.next_time.items() if next_time <= now]
+
+    def seconds_to_next(self, now=None):
+        """
+        Seconds to wait before the next kind is due
+        @param now: monotonic time (None: current time)
+        """
+        if not self.next_time:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        return max(0, int(min(self.next_time.values()) - now))
+
+    def wake(self, key, now=None):
+        """
+        Read a kind at the next check (e.g. a change of its items was received from a watch)
+        @param key: kind key
+        @param now: monotonic time (None: current time)
+        """
+        if key in self.next_time:
+            if now is None:
+                now = time.monotonic()
+            self.next_time[key] = min(self.next_time[key], now)
+
+    def update(self, key, data, now=None):
+        """
+        Compute the next read of a kind from the data just read
+        @param key: kind key
+        @param data: items with problem returned by the collector
+        @param now: monotonic time (None: current time)
+        @return: the new interval in seconds
+        """
+        if key not in self.intervals:
+            return None
+        if now is None:
+            now = time.monotonic()
+
+        base = self.intervals[key]
+        if not isinstance(data, dict):
+            # read error: back to the base interval
+            interval = base
+        elif len(data) > 0:
+            # active alerts: speed up
+            interval = max(self.min_seconds, int(base / self.alert_factor))
+        elif key in self.last_data and self.last_data[key] == data:
+            # healthy and unchanged: back off
+            interval = min(self.current[key] * self.backoff_factor, base * self.backoff_max)
+        else:
+            interval = base
+
+        if interval != self.current[key]:
+            self.print_helper.info(f"{key} interval {self.current[key]} -> {interval} sec")
+
+        self.current[key] = interval
+        self.next_time[key] = now + interval
+        self.last_data[key] = data
+        return interval
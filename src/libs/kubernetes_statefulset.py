@@ -1,4 +1,6 @@
 from libs.kubernetes_namespace import KubernetesGetNamespace
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_records import StatefulSetRecord
 import kubernetes
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_method
@@ -14,20 +16,31 @@ class KubernetesGetSfs:
                  logger=None,
                  k8s_api_instance=None,
                  k8s_apps_instance=None,
-                 cluster_name=None):
+                 cluster_name=None,
+                 k8s_lister: KubernetesLister = None,
+                 k8s_namespace: KubernetesGetNamespace = None):
 
         self.print_helper = PrintHelper('kubernetes_get_sfs', logger)
         self.print_debug = debug_on
 
         self.print_helper.info_if(self.print_debug,
                                   f"__init__")
-        self.k8s_namespace = KubernetesGetNamespace(debug_on,
-                                                    logger,
-                                                    k8s_api_instance)
         self.api_instance = k8s_api_instance
         self.apps_instance = k8s_apps_instance
         self.cluster_name = cluster_name
 
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # shared namespace registry
+        self.k8s_namespace = k8s_namespace
+        if self.k8s_namespace is None:
+            self.k8s_namespace = KubernetesGetNamespace(debug_on,
+                                                        logger,
+                                                        k8s_api_instance,
+                                                        k8s_lister=self.k8s_lister)
+
     @handle_exceptions_method
     def get_stateful_set(self,
                          namespace,
@@ -44,49 +57,46 @@ class KubernetesGetSfs:
                 nm_list = self.k8s_namespace.get_namespace()
             total = 0
             if nm_list is not None:
-                for nm in nm_list:
-                    self.print_helper.info_if(self.print_debug,
-                                              f"get_stateful_set  nm:{nm}")
-                    # details = {}
-                    # self.print_helper.info(f"namespace:{nm}")
-                    nm_dp = self.apps_instance.list_namespaced_stateful_set(nm)
-                    for st in nm_dp.items:
-                        total += 1
-
-                        add_st_sets = False
-
-                        if extract_not_equal or extract_equal0:
-
-                            if ((extract_not_equal
-                                 and st.status.available_replicas is not None
-                                 and st.status.replicas is not None
-                                 and st.status.available_replicas != st.status.replicas)
-                                    or (extract_equal0 and (st.status.replicas is None
-                                                            or st.status.replicas == 0))):
-                                add_st_sets = True
-                        else:
-                            add_st_sets = True
+                for st in self.k8s_lister.list_items(nm_list,
+                                                     self.apps_instance.list_namespaced_stateful_set,
+                                                     self.apps_instance.list_stateful_set_for_all_namespaces):
+                    total += 1
 
-                        if add_st_sets:
-                            self.print_helper.info_if(self.print_debug,
-                                                      f"StatefulSets:{st.metadata.name} in {st.metadata.namespace}")
-                            details = {'cluster': self.cluster_name,
-                                       'namespace': st.metadata.namespace,
-                                       'available_replicas': st.status.available_replicas,
-                                       'current_replicas': st.status.current_replicas, 'replicas': st.status.replicas,
-                                       'ready_replicas': st.status.ready_replicas}
-
-                            if self.print_debug:
-                                self.print_helper.info(f"StatefulSets.available replicas :"
-                                                       f" {st.status.available_replicas}")
-                                self.print_helper.info(f"StatefulSets.current replicas :"
-                                                       f" {st.status.current_replicas}")
-                                self.print_helper.info(f"StatefulSets.replicas :"
-                                                       f" {st.status.replicas}")
-                                self.print_helper.info(f"StatefulSets.ready replicas :"
-                                                       f" {st.status.ready_replicas}")
-
-                            st_sets[st.metadata.name] = details
+                    add_st_sets = False
+
+                    if extract_not_equal or extract_equal0:
+
+                        if ((extract_not_equal
+                             and st.status.available_replicas is not None
+                             and st.status.replicas is not None
+                             and st.status.available_replicas != st.status.replicas)
+                                or (extract_equal0 and (st.status.replicas is None
+                                                        or st.status.replicas == 0))):
+                            add_st_sets = True
+                    else:
+                        add_st_sets = True
+
+                    if add_st_sets:
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"StatefulSets:{st.metadata.name} in {st.metadata.namespace}")
+                        details = StatefulSetRecord(self.cluster_name,
+                                                    st.metadata.namespace,
+                                                    st.status.available_replicas,
+                                                    st.status.current_replicas,
+                                                    st.status.replicas,
+                                                    st.status.ready_replicas)
+
+                        if self.print_debug:
+                            self.print_helper.info(f"StatefulSets.available replicas :"
+                                                   f" {st.status.available_replicas}")
+                            self.print_helper.info(f"StatefulSets.current replicas :"
+                                                   f" {st.status.current_replicas}")
+                            self.print_helper.info(f"StatefulSets.replicas :"
+                                                   f" {st.status.replicas}")
+                            self.print_helper.info(f"StatefulSets.ready replicas :"
+                                                   f" {st.status.ready_replicas}")
+
+                        st_sets[st.metadata.name] = details
 
             self.print_helper.info(f"{len(st_sets)}/{total} stateful sets found "
                                    f"{'with problem' if extract_equal0 or extract_not_equal else ''}")
@@ -12,6 +12,16 @@ from libs.kubernetes_replicaset import KubernetesGetRps
 from libs.kubernetes_deployment import KubernetesGetDeployment
 from libs.kubernetes_daemonset import KubernetesGetDms
 from libs.kubernetes_pv_pvc import KubernetesGetPvPvc
+from libs.kubernetes_workloads import KubernetesGetWorkloads
+from libs.kubernetes_informer import KubernetesInformer
+from libs.kubernetes_events import KubernetesEventWatcher
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_api_client import KubernetesApiClient
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
+from libs.kubernetes_circuit_breaker import KubernetesCircuitBreaker
+from libs.kubernetes_lease import KubernetesShardCoordinator
+from libs.kubernetes_owner_graph import KubernetesOwnerGraph
+from utils.config import ConfigK8sProcess
 
 
 class KubernetesStatus:
@@ -24,22 +34,42 @@ class KubernetesStatus:
                  kube_config_file=None,
                  k8s_cluster_name=None,
                  debug_on=True,
-                 logger=None):
+                 logger=None,
+                 k8s_key_config: ConfigK8sProcess = None,
+                 kube_context=None,
+                 k8s_rate_limiter: KubernetesRateLimiter = None,
+                 kube_config_dict=None):
 
         self.print_helper = PrintHelper('k8s_status', logger)
         self.print_debug = debug_on
 
         self.print_helper.info_if(self.print_debug,
                                   f"__init__")
+
+        self.k8s_config = ConfigK8sProcess()
+        if k8s_key_config is not None:
+            self.k8s_config = k8s_key_config
+
+        # the configuration is loaded in an explicit object used by the shared api client
+        client_configuration = client.Configuration()
+
         load_default = True
-        if kube_config_file is not None:
+        if kube_config_dict is not None:
+            # kube config parsed once and shared by all the clusters
+            load_default = False
+            config.load_kube_config_from_dict(config_dict=kube_config_dict,
+                                              context=kube_context,
+                                              client_configuration=client_configuration)
+        elif kube_config_file is not None:
             if len(kube_config_file) > 0:
                 self.print_helper.info_if(self.print_debug,
                                           f"config file {kube_config_file}")
 
                 if os.path.isfile(kube_config_file):
                     load_default = False
-                    config.load_kube_config(config_file=kube_config_file)
+                    config.load_kube_config(config_file=kube_config_file,
+                                            context=kube_context,
+                                            client_configuration=client_configuration)
                 else:
                     load_default = False   # Forced to else
                     self.print_helper.error(f"config file"
@@ -49,74 +79,205 @@ class KubernetesStatus:
             if kube_config_load_method:
                 self.print_helper.info_if(self.print_debug,
                                           f"load_kube_config- out-of-the-cluster")
-                config.load_kube_config()
+                config.load_kube_config(context=kube_context,
+                                        client_configuration=client_configuration)
             else:
                 self.print_helper.info_if(self.print_debug,
                                           f"load in-cluster configuration  ")
 
-                config.load_incluster_config()
+                config.load_incluster_config(client_configuration=client_configuration)
 
         self.k8s_in_cluster = not kube_config_load_method
         self.k8s_config_file = kube_config_file
-
-        self.api_instance = client.CoreV1Api()
-        self.apps_instance = client.AppsV1Api()
+        # kube config parsed in main (None: read the file)
+        self.kube_config_dict = kube_config_dict
+        # context of the kube config (None: current context)
+        self.k8s_context = kube_context
+
+        # one connection pool shared by all the collectors
+        self.k8s_api_client = KubernetesApiClient(debug_on,
+                                                  logger,
+                                                  configuration=client_configuration,
+                                                  pool_size=self.k8s_config.API_pool_size,
+                                                  tcp_keepalive=self.k8s_config.API_tcp_keepalive)
+        self.api_instance = self.k8s_api_client.core_v1()
+        self.apps_instance = self.k8s_api_client.apps_v1()
+
+        # client side limit of the requests to the API server (shared in multi cluster mode)
+        self.k8s_rate_limiter = k8s_rate_limiter
+        if self.k8s_rate_limiter is None:
+            self.k8s_rate_limiter = KubernetesRateLimiter(debug_on,
+                                                          logger,
+                                                          qps=self.k8s_config.API_qps,
+                                                          burst=self.k8s_config.API_burst,
+                                                          verb_limits=self.k8s_config.API_verb_limits)
+        # stop the requests to an endpoint while the API server is failing
+        self.k8s_circuit_breaker = KubernetesCircuitBreaker(debug_on,
+                                                            logger,
+                                                            failure_threshold=self.k8s_config.API_breaker_failures,
+                                                            backoff_seconds=self.k8s_config.API_breaker_backoff_seconds,
+                                                            backoff_max_seconds=self.k8s_config.API_breaker_backoff_max)
 
         # Load cluster name
         self.cluster_name_forced = k8s_cluster_name
         self.cluster_name = self.get_cluster_name()
 
+        # shared wrapper of the list calls
+        self.k8s_lister = KubernetesLister(debug_on,
+                                           logger,
+                                           cluster_wide=self.k8s_config.LIST_cluster_wide,
+                                           page_limit=self.k8s_config.LIST_page_limit,
+                                           raw_json=self.k8s_config.LIST_raw_json,
+                                           field_selector=self.k8s_config.LIST_field_selector,
+                                           resource_version0=self.k8s_config.LIST_resource_version0,
+                                           request_timeout=self.k8s_config.get_api_request_timeout(),
+                                           rate_limiter=self.k8s_rate_limiter,
+                                           circuit_breaker=self.k8s_circuit_breaker)
+
+        # sharded mode: the replicas split the namespaces, the leader reads the cluster scoped items
+        self.k8s_shard = None
+        if self.k8s_config.SHARD_enable:
+            self.k8s_shard = KubernetesShardCoordinator(debug_on,
+                                                        logger,
+                                                        coordination_api=self.k8s_api_client.coordination_v1(),
+                                                        namespace=self.k8s_config.SHARD_namespace,
+                                                        identity=self.k8s_config.SHARD_identity,
+                                                        lease_seconds=self.k8s_config.SHARD_lease_seconds)
+            self.k8s_shard.start()
+
         self.k8s_nodes = KubernetesGetNodes(debug_on,
                                             logger,
                                             self.api_instance,
-                                            cluster_name=self.cluster_name)
+                                            cluster_name=self.cluster_name,
+                                            k8s_lister=self.k8s_lister)
+        # namespace registry shared by all the collectors
         self.k8s_namespace = KubernetesGetNamespace(debug_on,
                                                     logger,
-                                                    self.api_instance)
+                                                    self.api_instance,
+                                                    k8s_lister=self.k8s_lister,
+                                                    cache_seconds=self.k8s_config.NAMESPACE_cache_seconds,
+                                                    include_patterns=self.k8s_config.NAMESPACE_include,
+                                                    exclude_patterns=self.k8s_config.NAMESPACE_exclude,
+                                                    k8s_shard=self.k8s_shard)
+        # keep the pods in a local store updated by a watch stream, as records of the namespaces scanned
+        self.pod_informer = None
+        if self.k8s_config.POD_enable and self.k8s_config.POD_informer:
+            self.pod_informer = KubernetesInformer(debug_on,
+                                                   logger,
+                                                   list_function=self.api_instance.list_pod_for_all_namespaces,
+                                                   name='pods',
+                                                   rate_limiter=self.k8s_rate_limiter,
+                                                   circuit_breaker=self.k8s_circuit_breaker,
+                                                   k8s_lister=self.k8s_lister,
+                                                   transform=self.__pod_record__,
+                                                   namespace_filter=self.k8s_namespace.is_namespace_watched,
+                                                   changed_filter=KubernetesGetPods.is_alert_changed)
+            self.pod_informer.start()
+
+        # recent warning events of the objects, streamed by a watch (no list call in the cycles)
+        self.k8s_events = None
+        if self.k8s_config.EVENTS_enable:
+            self.k8s_events = KubernetesEventWatcher(debug_on,
+                                                     logger,
+                                                     list_function=self.api_instance.list_event_for_all_namespaces,
+                                                     max_objects=self.k8s_config.EVENTS_max_objects,
+                                                     events_per_object=self.k8s_config.EVENTS_per_object,
+                                                     rate_limiter=self.k8s_rate_limiter,
+                                                     circuit_breaker=self.k8s_circuit_breaker)
+            self.k8s_events.start()
+
         self.k8s_pods = KubernetesGetPods(debug_on,
                                           logger,
                                           self.api_instance,
                                           self.apps_instance,
-                                          cluster_name=self.cluster_name)
+                                          cluster_name=self.cluster_name,
+                                          pod_informer=self.pod_informer,
+                                          k8s_lister=self.k8s_lister,
+                                          k8s_namespace=self.k8s_namespace)
         self.k8s_sfs = KubernetesGetSfs(debug_on,
                                         logger,
                                         self.api_instance,
                                         self.apps_instance,
-                                        cluster_name=self.cluster_name)
+                                        cluster_name=self.cluster_name,
+                                        k8s_lister=self.k8s_lister,
+                                        k8s_namespace=self.k8s_namespace)
         self.k8s_rps = KubernetesGetRps(debug_on,
                                         logger,
                                         self.api_instance,
                                         self.apps_instance,
-                                        cluster_name=self.cluster_name)
+                                        cluster_name=self.cluster_name,
+                                        k8s_lister=self.k8s_lister,
+                                        k8s_namespace=self.k8s_namespace)
         self.k8s_deployment = KubernetesGetDeployment(debug_on,
                                                       logger,
                                                       self.api_instance,
                                                       self.apps_instance,
-                                                      cluster_name=self.cluster_name)
+                                                      cluster_name=self.cluster_name,
+                                                      k8s_lister=self.k8s_lister,
+                                                      k8s_namespace=self.k8s_namespace)
+        # owner references shared with the checker for grouping the alerts by root owner
+        self.k8s_owner_graph = None
+        self.k8s_workloads = None
+        if self.k8s_config.GROUP_by_owner:
+            self.k8s_owner_graph = KubernetesOwnerGraph()
+        if self.k8s_config.WORKLOADS_joined or self.k8s_owner_graph is not None:
+            # replica sets listed once, the deployments are computed from their replica sets.
+            # The owners of the replica sets are indexed for the grouped alerts
+            self.k8s_workloads = KubernetesGetWorkloads(debug_on,
+                                                        logger,
+                                                        self.apps_instance,
+                                                        cluster_name=self.cluster_name,
+                                                        k8s_lister=self.k8s_lister,
+                                                        k8s_namespace=self.k8s_namespace,
+                                                        k8s_owner_graph=self.k8s_owner_graph)
+        if self.k8s_config.WORKLOADS_joined:
+            self.k8s_rps = self.k8s_workloads
+            self.k8s_deployment = self.k8s_workloads
         self.k8s_dms = KubernetesGetDms(debug_on,
                                         logger,
                                         self.api_instance,
                                         self.apps_instance,
-                                        cluster_name=self.cluster_name)
+                                        cluster_name=self.cluster_name,
+                                        k8s_lister=self.k8s_lister,
+                                        k8s_namespace=self.k8s_namespace)
         self.k8s_pv_c = KubernetesGetPvPvc(debug_on,
                                            logger,
                                            self.api_instance,
-                                           cluster_name=self.cluster_name)
+                                           cluster_name=self.cluster_name,
+                                           k8s_lister=self.k8s_lister,
+                                           k8s_namespace=self.k8s_namespace)
+
+    def __pod_record__(self, pod):
+        """
+        Pod kept in the informer store: the details read by the checks, not the whole k8s item
+        @param pod: k8s pod item
+        @return: PodRecord
+        """
+        return KubernetesGetPods.get_pod_record(pod, self.cluster_name)
 
     def get_cluster_name_from_config_file(self):
         """
         Obtain the name of current cluster reading the config file
+        (the kube config already parsed if available)
         @return:
         """
         try:
             cluster_name = None
             if not self.k8s_in_cluster:
-                self.print_helper.info(f"get_cluster_name_from_config_file {self.k8s_config_file}")
-
-                cluster_context = config.kube_config.list_kube_config_contexts(config_file=self.k8s_config_file)
+                if self.kube_config_dict is not None:
+                    self.print_helper.info(f"get_cluster_name_from_config_file loaded kube config")
+                    loader = config.kube_config.KubeConfigLoader(config_dict=self.kube_config_dict)
+                    cluster_context = loader.list_contexts(), loader.current_context
+                else:
+                    self.print_helper.info(f"get_cluster_name_from_config_file {self.k8s_config_file}")
+                    cluster_context = config.kube_config.list_kube_config_contexts(config_file=self.k8s_config_file)
                 self.print_helper.info_if(self.print_debug,
                                           f"get_cluster_name:context {cluster_context}")
-                cluster_name = cluster_context[1]['context']['cluster']
+                if self.k8s_context is not None:
+                    cluster_name = next(context['context']['cluster'] for context in cluster_context[0]
+                                        if context['name'] == self.k8s_context)
+                else:
+                    cluster_name = cluster_context[1]['context']['cluster']
                 self.print_helper.info(f"cluster name from file  {cluster_name}")
 
             return cluster_name
@@ -162,6 +323,7 @@ class KubernetesStatus:
 
                 if cluster_name is None:
                     # Retrieve information about the current cluster
+                    self.k8s_rate_limiter.acquire('get')
                     cluster_info = self.api_instance.read_namespaced_config_map("kube-root-ca.crt",
                                                                                 "kube-system")
 
@@ -177,6 +339,19 @@ class KubernetesStatus:
                 cluster_name = None
             return cluster_name
 
+    def print_api_stats(self):
+        """
+        Log the counters of the shared connection pool and of the rate limiter
+        """
+        self.k8s_api_client.print_pool_stats()
+        self.k8s_rate_limiter.print_stats()
+
+    def is_leader(self):
+        """
+        True if this replica reads the cluster scoped items (always True without sharding)
+        """
+        return self.k8s_shard is None or self.k8s_shard.is_leader()
+
     def get_cluster_name_loaded(self):
         """
         return the current cluster name
@@ -195,6 +370,13 @@ class KubernetesStatus:
         """
         return self.k8s_namespace.get_namespace()
 
+    def pods_changed(self):
+        """
+        True if a pod with alert changed in the informer store since the last call
+        (the pods are read before the next cycle)
+        """
+        return self.pod_informer is not None and self.pod_informer.take_changed()
+
     def get_pods(self,
                  namespace,
                  label_selector: str = '',
@@ -211,6 +393,9 @@ class KubernetesStatus:
         """
         if phase is None:
             phase = {}
+        if self.k8s_owner_graph is not None:
+            # the pods are grouped under the deployment of their replica set, alert of the replica set or not
+            self.k8s_workloads.update_owners(namespace)
         return self.k8s_pods.get_pods(namespace, label_selector, phase, phase_equal)
 
     def get_stateful_set(self, namespace,
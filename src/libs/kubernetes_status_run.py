@@ -1,7 +1,12 @@
 import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.config import ConfigK8sProcess
 from libs.kubernetes_status import KubernetesStatus
+from libs.kubernetes_scheduler import KubernetesScheduler
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
 from utils.print_helper import PrintHelper
 from utils.handle_error import handle_exceptions_async_method
 
@@ -18,9 +23,14 @@ class KubernetesStatusRun:
                  logger=None,
                  queue=None,
                  cycles_seconds: int = 120,
-                 k8s_key_config: ConfigK8sProcess = None):
+                 k8s_key_config: ConfigK8sProcess = None,
+                 kube_context=None,
+                 executor: ThreadPoolExecutor = None,
+                 rate_limiter: KubernetesRateLimiter = None,
+                 kube_config_dict=None):
 
-        self.print_helper = PrintHelper('k8s_status', logger)
+        self.print_helper = PrintHelper('k8s_status' if kube_context is None else f'k8s_status_{kube_context}',
+                                        logger)
         self.print_debug = debug_on
 
         self.print_helper.debug_if(self.print_debug,
@@ -28,14 +38,19 @@ class KubernetesStatusRun:
 
         self.queue = queue
         forced_cname = None
-        if k8s_key_config is not None:
+        # in multi cluster mode the name is read from the context
+        if k8s_key_config is not None and kube_context is None:
             forced_cname = k8s_key_config.CLUSTER_Name_forced
 
         self.k8s_stat = KubernetesStatus(kube_load_method,
                                          kube_config_file,
                                          forced_cname,
                                          debug_on,
-                                         logger)
+                                         logger,
+                                         k8s_key_config=k8s_key_config,
+                                         kube_context=kube_context,
+                                         k8s_rate_limiter=rate_limiter,
+                                         kube_config_dict=kube_config_dict)
 
         self.cycle_seconds = cycles_seconds
         self.loop = 0
@@ -44,6 +59,53 @@ class KubernetesStatusRun:
         if k8s_key_config is not None:
             self.k8s_config = k8s_key_config
 
+        # bounded pool for the blocking k8s client calls, the event loop is never blocked.
+        # In multi cluster mode the pool is shared by all the clusters
+        self.executor = executor
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.k8s_config.API_max_workers,
+                                               thread_name_prefix='k8s_api')
+
+        # last data read for each kind, sent as stale while the API server is not available
+        self.last_snapshot = {}
+
+        # per kind intervals instead of one cycle for all the kinds
+        self.scheduler = None
+        if self.k8s_config.SCHEDULER_enable:
+            self.scheduler = KubernetesScheduler(debug_on,
+                                                 logger,
+                                                 intervals=self.__kind_intervals__(),
+                                                 backoff_max=self.k8s_config.SCHEDULER_backoff_max)
+
+        # informer mode: the pods are read before the next cycle when a pod with alert changes,
+        # at most once every pods_wake_seconds
+        self.pods_wake_seconds = 5
+        self.pods_wake_time = 0
+
+    def __pods_changed__(self):
+        """
+        True if a pod with alert changed in the informer store and the pods were not woken in the last seconds
+        """
+        now = time.monotonic()
+        if now - self.pods_wake_time < self.pods_wake_seconds or not self.k8s_config.POD_enable:
+            return False
+        if not self.k8s_stat.pods_changed():
+            return False
+        self.pods_wake_time = now
+        return True
+
+    async def __run_in_executor__(self, function, *args, **kwargs):
+        """
+        Run a blocking k8s client call in the thread pool
+        @param function: function to call
+        @param args: positional arguments
+        @param kwargs: keyword arguments
+        @return: the result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor,
+                                          functools.partial(function, *args, **kwargs))
+
     @handle_exceptions_async_method
     async def __put_in_queue(self, obj):
         """
@@ -54,6 +116,176 @@ class KubernetesStatusRun:
 
         await self.queue.put(obj)
 
+    @staticmethod
+    def __is_read_error__(data):
+        """
+        True if the collector did not read the items (None or error of the exception handler)
+        @param data: data returned by the collector
+        """
+        return data is None or (isinstance(data, dict) and data.keys() == {'error', 'ex'})
+
+    async def __collect_kind__(self, key, list_ns):
+        """
+        Read the state of one kind of k8s items. On read error the last data is sent marked as stale
+        @param key: key of the kind (e.g. k8s_config.POD_key)
+        @param list_ns: list of namespaces
+        @return: dict for the checker (empty if there is nothing to send)
+        """
+        if (self.__is_read_error__(list_ns)
+                and key not in (self.k8s_config.NODE_key, self.k8s_config.PV_key)):
+            # the namespaces are not available
+            data = None
+        else:
+            data = await self.__read_kind__(key, list_ns)
+        if not self.__is_read_error__(data):
+            self.last_snapshot[key] = data
+            return {key: data}
+
+        self.print_helper.wrn(f"{key} read error, send last data as stale")
+        if key not in self.last_snapshot:
+            return {}
+        return {key: self.last_snapshot[key],
+                self.k8s_config.disp_MSG_key_stale: True}
+
+    async def __read_kind__(self, key, list_ns):
+        """
+        Call the collector of one kind of k8s items
+        @param key: key of the kind (e.g. k8s_config.POD_key)
+        @param list_ns: list of namespaces
+        @return: the items with problem
+        """
+        match key:
+            case self.k8s_config.NODE_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_node_list,
+                                                      only_problem=True)
+            case self.k8s_config.POD_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_pods,
+                                                      namespace=list_ns,
+                                                      phase_equal=False)
+            case self.k8s_config.DPL_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_deployment,
+                                                      namespace=list_ns,
+                                                      extract_equal0=self.k8s_config.DPL_pods0,
+                                                      extract_not_equal=True)
+            case self.k8s_config.SS_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_stateful_set,
+                                                      namespace=list_ns,
+                                                      extract_equal0=self.k8s_config.SS_pods0,
+                                                      extract_not_equal=True)
+            case self.k8s_config.RS_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_replica_set,
+                                                      namespace=list_ns,
+                                                      extract_equal0=self.k8s_config.RS_pods0,
+                                                      extract_not_equal=True)
+            case self.k8s_config.DS_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_daemon_set,
+                                                      namespace=list_ns,
+                                                      extract_equal0=self.k8s_config.DS_pods0,
+                                                      extract_not_equal=True)
+            case self.k8s_config.PVC_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_pvc_claim,
+                                                      namespace=list_ns,
+                                                      equal_to_phase=False)
+            case self.k8s_config.PV_key:
+                return await self.__run_in_executor__(self.k8s_stat.get_pv,
+                                                      equal_to_phase=False)
+        return None
+
+    def __enabled_kinds__(self):
+        """
+        Keys of the kinds enabled in the configuration, in the order of the report
+        """
+        kinds = [(self.k8s_config.NODE_enable, self.k8s_config.NODE_key),
+                 (self.k8s_config.POD_enable, self.k8s_config.POD_key),
+                 (self.k8s_config.DPL_enable, self.k8s_config.DPL_key),
+                 (self.k8s_config.SS_enable, self.k8s_config.SS_key),
+                 (self.k8s_config.RS_enable, self.k8s_config.RS_key),
+                 (self.k8s_config.DS_enable, self.k8s_config.DS_key),
+                 (self.k8s_config.PVC_enable, self.k8s_config.PVC_key),
+                 (self.k8s_config.PV_enable, self.k8s_config.PV_key)]
+        return [key for enable, key in kinds if enable]
+
+    def __kind_intervals__(self):
+        """
+        Interval of each enabled kind. 0 in the configuration: the process cycle
+        @return: dict kind key -> seconds
+        """
+        intervals = {self.k8s_config.NODE_key: self.k8s_config.NODE_cycle_seconds,
+                     self.k8s_config.POD_key: self.k8s_config.POD_cycle_seconds,
+                     self.k8s_config.DPL_key: self.k8s_config.DPL_cycle_seconds,
+                     self.k8s_config.SS_key: self.k8s_config.SS_cycle_seconds,
+                     self.k8s_config.RS_key: self.k8s_config.RS_cycle_seconds,
+                     self.k8s_config.DS_key: self.k8s_config.DS_cycle_seconds,
+                     self.k8s_config.PVC_key: self.k8s_config.PVC_cycle_seconds,
+                     self.k8s_config.PV_key: self.k8s_config.PV_cycle_seconds}
+        return {key: intervals[key] if intervals[key] > 0 else self.cycle_seconds
+                for key in self.__enabled_kinds__()}
+
+    async def __run_cycle_concurrent__(self, kinds=None, concurrency=None):
+        """
+        Read the kinds in parallel and send them between the start and end keys
+        @param kinds: keys of the kinds to read (None: all the enabled kinds)
+        @param concurrency: max number of kinds read at the same time
+        @return: list of tuple key, message sent to the checker
+        """
+        if kinds is None:
+            kinds = self.__enabled_kinds__()
+        # sharded mode: nodes and persistent volumes are read by the leader only
+        if not self.k8s_stat.is_leader():
+            kinds = [key for key in kinds if key not in (self.k8s_config.NODE_key, self.k8s_config.PV_key)]
+        if concurrency is None:
+            concurrency = self.k8s_config.COLLECT_concurrency
+        self.print_helper.info(f"concurrent read of {kinds} - "
+                               f"concurrency {concurrency}")
+
+        # nodes and persistent volumes are not namespaced
+        list_ns = []
+        if any(key not in (self.k8s_config.NODE_key, self.k8s_config.PV_key) for key in kinds):
+            list_ns = await self.__run_in_executor__(self.k8s_stat.get_namespace)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def collect(key):
+            async with semaphore:
+                return key, await self.__collect_kind__(key, list_ns)
+
+        results = await asyncio.gather(*[collect(key) for key in kinds])
+
+        # send start data key for capturing the state in one message
+        if self.k8s_config.disp_MSG_key_unique:
+            await self.__put_in_queue({self.k8s_config.disp_MSG_key_start: "start"})
+
+        for key, data in results:
+            if data:
+                await self.__put_in_queue(data)
+
+        # send end data key for sending message
+        if self.k8s_config.disp_MSG_key_unique:
+            await self.__put_in_queue({self.k8s_config.disp_MSG_key_end: "end"})
+
+        self.k8s_stat.print_api_stats()
+        return results
+
+    async def __run_cycle_scheduled__(self):
+        """
+        Read the kinds due by the scheduler and compute their next read
+        """
+        kinds = self.scheduler.due_kinds()
+        if not kinds:
+            return False
+
+        concurrency = self.k8s_config.COLLECT_concurrency if self.k8s_config.COLLECT_concurrent else 1
+        results = await self.__run_cycle_concurrent__(kinds, concurrency)
+        # kinds not read by this replica
+        read_kinds = set(key for key, _ in results)
+        for key in kinds:
+            if key not in read_kinds:
+                self.scheduler.update(key, None)
+        for key, data in results:
+            # stale data: back to the base interval
+            self.scheduler.update(key, None if self.k8s_config.disp_MSG_key_stale in data else data.get(key))
+        return True
+
     @handle_exceptions_async_method
     async def run(self):
         """
@@ -75,7 +307,37 @@ class KubernetesStatusRun:
 
         while True:
             try:
-                if seconds_waiting > self.cycle_seconds:
+                if self.scheduler is not None:
+                    if self.__pods_changed__():
+                        self.scheduler.wake(self.k8s_config.POD_key)
+                    if await self.__run_cycle_scheduled__():
+                        self.loop += 1
+                        self.print_helper.info(f"end read. loop counter {self.loop}")
+                        if self.loop > 500000:
+                            self.loop = 1
+                    elif seconds_waiting % 30 == 0:
+                        self.print_helper.info(f"...wait next check in {self.scheduler.seconds_to_next()} sec")
+
+                    await asyncio.sleep(1)
+                    seconds_waiting += 1
+                    continue
+
+                if index == 0 and seconds_waiting <= self.cycle_seconds and self.__pods_changed__():
+                    # a pod with alert changed in the informer store: report the pods before the next cycle
+                    self.print_helper.info(f"pods changed, read the pods")
+                    await self.__run_cycle_concurrent__([self.k8s_config.POD_key], 1)
+
+                elif seconds_waiting > self.cycle_seconds and self.k8s_config.COLLECT_concurrent:
+                    self.loop += 1
+                    self.print_helper.info(f"start run status. loop counter {self.loop}")
+                    if self.loop > 500000:
+                        self.loop = 1
+
+                    await self.__run_cycle_concurrent__()
+                    seconds_waiting = 0
+                    self.print_helper.info(f"end read")
+
+                elif seconds_waiting > self.cycle_seconds:
                     if index == 0:
                         self.loop += 1
                         self.print_helper.info(f"start run status. loop counter {self.loop} - index {index}")
@@ -91,68 +353,55 @@ class KubernetesStatusRun:
                             if self.k8s_config.disp_MSG_key_unique:
                                 data_res[self.k8s_config.disp_MSG_key_start] = "start"
                         case 1:
-                            # nodelist
                             n = 1
-                            if self.k8s_config.NODE_enable:
-                                nodelist = self.k8s_stat.get_node_list(only_problem=True)
-                                data_res[self.k8s_config.NODE_key] = nodelist
-
+                            if self.k8s_config.NODE_enable and self.k8s_stat.is_leader():
+                                # nodelist
+                                key = self.k8s_config.NODE_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 2:
                             n = 2
-                            list_ns = self.k8s_stat.get_namespace()
+                            list_ns = await self.__run_in_executor__(self.k8s_stat.get_namespace)
 
                             if self.k8s_config.POD_enable:
                                 # pod
-                                pods_error = self.k8s_stat.get_pods(namespace=list_ns, phase_equal=False)
-                                data_res[self.k8s_config.POD_key] = pods_error
-
+                                key = self.k8s_config.POD_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 3:
                             n = 3
                             if self.k8s_config.DPL_enable:
                                 # deployment sets
-                                depl_error = self.k8s_stat.get_deployment(namespace=list_ns,
-                                                                          extract_equal0=self.k8s_config.DPL_pods0,
-                                                                          extract_not_equal=True)
-                                data_res[self.k8s_config.DPL_key] = depl_error
+                                key = self.k8s_config.DPL_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 4:
                             n = 4
                             if self.k8s_config.SS_enable:
                                 # stateful sets
-                                sts_error = self.k8s_stat.get_stateful_set(namespace=list_ns,
-                                                                           extract_equal0=self.k8s_config.SS_pods0,
-                                                                           extract_not_equal=True)
-                                data_res[self.k8s_config.SS_key] = sts_error
+                                key = self.k8s_config.SS_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 5:
                             n = 5
-                            # replicaset
                             if self.k8s_config.RS_enable:
-                                replicaset_error = self.k8s_stat.get_replica_set(namespace=list_ns,
-                                                                                 extract_equal0=
-                                                                                 self.k8s_config.RS_pods0,
-                                                                                 extract_not_equal=True)
-                                data_res[self.k8s_config.RS_key] = replicaset_error
+                                # replicaset
+                                key = self.k8s_config.RS_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 6:
                             n = 6
-                            # # daemon sets
                             if self.k8s_config.DS_enable:
-                                daemons_set_errors = self.k8s_stat.get_daemon_set(namespace=list_ns,
-                                                                                  extract_equal0=
-                                                                                  self.k8s_config.DS_pods0,
-                                                                                  extract_not_equal=True)
-                                data_res[self.k8s_config.DS_key] = daemons_set_errors
+                                # daemon sets
+                                key = self.k8s_config.DS_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 7:
                             n = 7
                             if self.k8s_config.PVC_enable:
                                 # persistent volume claims
-                                pvc_unbound = self.k8s_stat.get_pvc_claim(namespace=list_ns,
-                                                                          equal_to_phase=False)
-                                data_res[self.k8s_config.PVC_key] = pvc_unbound
+                                key = self.k8s_config.PVC_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 8:
                             n = 8
-                            if self.k8s_config.PV_enable:
-                                # PV
-                                pv_unbound = self.k8s_stat.get_pv(equal_to_phase=False)
-                                data_res[self.k8s_config.PV_key] = pv_unbound
+                            if self.k8s_config.PV_enable and self.k8s_stat.is_leader():
+                                # persistent volumes
+                                key = self.k8s_config.PV_key
+                                data_res.update(await self.__collect_kind__(key, list_ns))
                         case 9:
                             n = 9
                             # send end data key for sending message
@@ -172,6 +421,7 @@ class KubernetesStatusRun:
                     else:
                         index = 0
                         self.print_helper.info(f"end read.{n}")
+                        self.k8s_stat.print_api_stats()
 
                 if seconds_waiting % 30 == 0:
                     self.print_helper.info(f"...wait next check in {self.cycle_seconds - seconds_waiting} sec")
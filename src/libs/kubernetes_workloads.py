@@ -0,0 +1,238 @@
+import threading
+import time
+
+from libs.kubernetes_namespace import KubernetesGetNamespace
+from libs.kubernetes_lister import KubernetesLister
+from libs.kubernetes_owner_graph import KubernetesOwnerGraph
+from libs.kubernetes_records import ReplicaSetRecord, DeploymentRecord, intern_string
+import kubernetes
+from utils.print_helper import PrintHelper
+from utils.handle_error import handle_exceptions_method
+
+
+class KubernetesGetWorkloads:
+    """
+    Joined collector of replica sets and deployments.
+    The replica sets are listed once and indexed by owner, the status of each deployment is the sum
+    of the status of its replica sets as computed by the deployment controller.
+    The deployments are listed only for their names: a deployment without replica sets
+    (e.g. replica set refused by a quota or an admission webhook) is reported as well.
+    The owners of all the replica sets listed are kept in the owner graph of the grouped alerts
+    """
+
+    def __init__(self,
+                 debug_on=True,
+                 logger=None,
+                 k8s_apps_instance=None,
+                 cluster_name=None,
+                 k8s_lister: KubernetesLister = None,
+                 k8s_namespace: KubernetesGetNamespace = None,
+                 cache_seconds=10,
+                 k8s_owner_graph: KubernetesOwnerGraph = None):
+
+        self.print_helper = PrintHelper('kubernetes_get_workloads', logger)
+        self.print_debug = debug_on
+
+        self.print_helper.info_if(self.print_debug,
+                                  f"__init__")
+        self.apps_instance = k8s_apps_instance
+        self.cluster_name = cluster_name
+
+        self.k8s_lister = k8s_lister
+        if self.k8s_lister is None:
+            self.k8s_lister = KubernetesLister(debug_on, logger)
+
+        # shared namespace registry
+        self.k8s_namespace = k8s_namespace
+        if self.k8s_namespace is None:
+            self.k8s_namespace = KubernetesGetNamespace(debug_on,
+                                                        logger,
+                                                        None,
+                                                        k8s_lister=self.k8s_lister)
+
+        # the replica sets listed for one kind are reused by the other kind in the same cycle
+        self.cache_seconds = cache_seconds
+        self.cache = None
+        self.cache_key = None
+        self.cache_time = 0
+        self.lock = threading.Lock()
+
+        # owners of the replica sets for grouping the alerts (None: alerts not grouped)
+        self.k8s_owner_graph = k8s_owner_graph
+
+    def __list_replica_sets__(self, nm_list):
+        """
+        List the replica sets or return the list read in the last cache_seconds
+        @param nm_list: list of namespaces
+        @return: list of tuple (namespace, name, own_kind, own_name, available_replicas, replicas, ready_replicas)
+        """
+        cache_key = tuple(nm_list)
+        with self.lock:
+            if (self.cache is not None
+                    and self.cache_key == cache_key
+                    and time.monotonic() - self.cache_time < self.cache_seconds):
+                self.print_helper.info_if(self.print_debug,
+                                          f"replica sets from cache {len(self.cache)}")
+                return self.cache
+
+            items = []
+            for st in self.k8s_lister.list_items(nm_list,
+                                                 self.apps_instance.list_namespaced_replica_set,
+                                                 self.apps_instance.list_replica_set_for_all_namespaces):
+                owner = st.metadata.owner_references[0] if st.metadata.owner_references else None
+                items.append((intern_string(st.metadata.namespace),
+                              st.metadata.name,
+                              intern_string(owner.kind) if owner is not None else None,
+                              owner.name if owner is not None else None,
+                              st.status.available_replicas,
+                              st.status.replicas,
+                              st.status.ready_replicas))
+
+            self.cache = items
+            self.cache_key = cache_key
+            self.cache_time = time.monotonic()
+            if self.k8s_owner_graph is not None:
+                self.k8s_owner_graph.set_listed_owners('ReplicaSet',
+                                                       {(rs_namespace, name): (own_kind, own_name)
+                                                        for rs_namespace, name, own_kind, own_name, *_ in items})
+            self.print_helper.info(f"listed {len(items)} replica sets")
+            return items
+
+    def __list_deployments__(self, nm_list):
+        """
+        List the names of the deployments, the json body is not converted in client models
+        @param nm_list: list of namespaces
+        @return: list of tuple (namespace, name)
+        """
+        names = self.k8s_lister.list_names(nm_list,
+                                           self.apps_instance.list_namespaced_deployment,
+                                           self.apps_instance.list_deployment_for_all_namespaces)
+        items = [(intern_string(dpl_namespace), name) for dpl_namespace, name in names]
+        self.print_helper.info(f"listed {len(items)} deployments")
+        return items
+
+    @handle_exceptions_method
+    def update_owners(self, namespace):
+        """
+        Update the owners of the replica sets in the owner graph.
+        The list of the last cache_seconds is reused (e.g. read for the deployments in the same cycle)
+        @param namespace: list of namespaces
+        """
+        nm_list = self.__get_namespace_list__(namespace)
+        if nm_list is not None and self.k8s_owner_graph is not None:
+            self.__list_replica_sets__(nm_list)
+
+    def __get_namespace_list__(self, namespace):
+        if namespace is not None:
+            return namespace
+        return self.k8s_namespace.get_namespace()
+
+    @staticmethod
+    def __is_problem__(available_replicas, replicas, extract_not_equal, extract_equal0):
+        """
+        Filter of the replica sets and deployments with problem
+        """
+        if not (extract_not_equal or extract_equal0):
+            return True
+        return ((extract_not_equal
+                 and available_replicas is not None
+                 and replicas is not None
+                 and available_replicas != replicas)
+                or (extract_equal0 and (replicas is None or replicas == 0)))
+
+    @handle_exceptions_method
+    def get_replica_set(self,
+                        namespace,
+                        extract_not_equal=False,
+                        extract_equal0=False):
+        try:
+            self.print_helper.info(f"get_replica_set "
+                                   f"-not equal: {extract_not_equal} -equal0:{extract_equal0}")
+            rt_sets = {}
+            nm_list = self.__get_namespace_list__(namespace)
+            total = 0
+            if nm_list is not None:
+                for (rs_namespace, name, own_kind, own_name,
+                     available_replicas, replicas, ready_replicas) in self.__list_replica_sets__(nm_list):
+                    total += 1
+                    if self.__is_problem__(available_replicas, replicas, extract_not_equal, extract_equal0):
+                        rt_sets[name] = ReplicaSetRecord(self.cluster_name,
+                                                         rs_namespace,
+                                                         available_replicas,
+                                                         replicas,
+                                                         ready_replicas,
+                                                         own_kind,
+                                                         own_name)
+
+            self.print_helper.info(f"{len(rt_sets)}/{total} ReplicaSet found "
+                                   f"{'with problem' if extract_equal0 or extract_not_equal else ''}")
+
+            return rt_sets
+
+        except kubernetes.client.ApiException as e:
+            self.print_helper.error(f"get_replica_set k8s error : {e}")
+            if e.status == 404:
+                return None
+
+            raise e
+        except Exception as err:
+            self.print_helper.error_and_exception(f"get_replica_set", err)
+            return None
+
+    @handle_exceptions_method
+    def get_deployment(self,
+                       namespace,
+                       extract_not_equal=False,
+                       extract_equal0=False):
+        try:
+            self.print_helper.info(f"get_deployment from replica sets "
+                                   f"-not equal: {extract_not_equal} -equal0:{extract_equal0}")
+            dpl_sets = {}
+            nm_list = self.__get_namespace_list__(namespace)
+            if nm_list is not None:
+                # (namespace, deployment) -> [available, replicas, ready]
+                totals = {}
+                for (rs_namespace, _, own_kind, own_name,
+                     available_replicas, replicas, ready_replicas) in self.__list_replica_sets__(nm_list):
+                    if own_kind != 'Deployment':
+                        continue
+                    total = totals.setdefault((rs_namespace, own_name), [0, 0, 0])
+                    total[0] += available_replicas or 0
+                    total[1] += replicas or 0
+                    total[2] += ready_replicas or 0
+
+                deployments = self.__list_deployments__(nm_list)
+                for dpl_namespace, name in deployments:
+                    total = totals.get((dpl_namespace, name))
+                    # 0 is omitted in the status of the API server
+                    available_replicas, replicas, ready_replicas = ((total[0] or None,
+                                                                     total[1] or None,
+                                                                     total[2] or None)
+                                                                    if total is not None else (None, None, None))
+                    problem = self.__is_problem__(available_replicas, replicas, extract_not_equal, extract_equal0)
+                    if not problem and (extract_not_equal or extract_equal0):
+                        # no replica set owned: the controller creates one even for 0 replicas
+                        problem = total is None
+                    if problem:
+                        self.print_helper.info_if(self.print_debug,
+                                                  f"Deployment:{name} in {dpl_namespace}")
+                        dpl_sets[name] = DeploymentRecord(self.cluster_name,
+                                                          dpl_namespace,
+                                                          available_replicas,
+                                                          replicas,
+                                                          ready_replicas)
+
+                self.print_helper.info(f"{len(dpl_sets)}/{len(deployments)} deployment found "
+                                       f"{'with problem' if extract_equal0 or extract_not_equal else ''}")
+
+            return dpl_sets
+
+        except kubernetes.client.ApiException as e:
+            self.print_helper.error(f"get_deployment k8s error : {e}")
+            if e.status == 404:
+                return None
+
+            raise e
+        except Exception as err:
+            self.print_helper.error_and_exception(f"get_deployment", err)
+            return None
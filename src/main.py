@@ -1,5 +1,8 @@
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from kubernetes.config import kube_config
 
 from utils.print_helper import PrintHelper, LLogger
 from utils.config import ConfigProgram
@@ -10,6 +13,7 @@ from libs.kubernetes_checker import KubernetesChecker
 from libs.dispatcher import Dispatcher
 from libs.dispatcher_telegram import DispatcherTelegram
 from libs.dispatcher_email import DispatcherEmail
+from libs.kubernetes_rate_limiter import KubernetesRateLimiter
 from utils.handle_error import handle_exceptions_async_method
 from utils.version import __version__
 from utils.version import __date__
@@ -27,7 +31,8 @@ async def main_start(seconds=120,
                      load_kube_config=False,
                      config_file=None,
                      disp_class: ConfigDispatcher = None,
-                     k8s_class: ConfigK8sProcess = None):
+                     k8s_class: ConfigK8sProcess = None,
+                     kube_contexts=None):
     """
 
     :param seconds: time to scrapy the k8s system
@@ -35,9 +40,9 @@ async def main_start(seconds=120,
     :param config_file: optional config file
     :param disp_class: class dispatcher configuration
     :param k8s_class: class k8s configuration
+    :param kube_contexts: list of kube config contexts, one pipeline for each cluster (None: current context)
     """
     # create the shared queue
-    queue = asyncio.Queue()
     queue_dispatcher = asyncio.Queue()
     queue_dispatcher_telegram = asyncio.Queue()
     queue_dispatcher_mail = asyncio.Queue()
@@ -45,22 +50,56 @@ async def main_start(seconds=120,
     # Force separate telegram handler
     # telegram_separate_cor = True
 
-    k8s_stat_read = KubernetesStatusRun(kube_load_method=load_kube_config,
-                                        kube_config_file=config_file,
-                                        debug_on=debug_on,
-                                        logger=logger,
-                                        queue=queue,
-                                        cycles_seconds=seconds,
-                                        k8s_key_config=k8s_class)
-
-    k8s_stat_checker = KubernetesChecker(debug_on=debug_on,
-                                         logger=logger,
-                                         queue=queue,
-                                         dispatcher_queue=queue_dispatcher,
-                                         dispatcher_max_msg_len=disp_class.max_msg_len,
-                                         dispatcher_alive_message_hours=disp_class.alive_message,
-                                         k8s_key_config=k8s_class
-                                         )
+    # the kube config file is parsed once for all the clusters
+    kube_config_dict = None
+    if not kube_contexts:
+        kube_contexts = [None]
+    elif load_kube_config:
+        kube_config_dict = kube_config.KubeConfigMerger(config_file
+                                                        if config_file
+                                                        else kube_config.KUBE_CONFIG_DEFAULT_LOCATION).config
+
+    # thread pool and rate limiter shared by all the clusters
+    executor = ThreadPoolExecutor(max_workers=k8s_class.API_max_workers,
+                                  thread_name_prefix='k8s_api')
+    rate_limiter = KubernetesRateLimiter(debug_on,
+                                         logger,
+                                         qps=k8s_class.API_qps,
+                                         burst=k8s_class.API_burst,
+                                         verb_limits=k8s_class.API_verb_limits)
+
+    # one pipeline reader -> checker for each cluster, all the checkers send to the same dispatcher
+    k8s_pipelines = []
+    for kube_context in kube_contexts:
+        queue = asyncio.Queue()
+
+        k8s_stat_read = KubernetesStatusRun(kube_load_method=load_kube_config,
+                                            kube_config_file=config_file,
+                                            debug_on=debug_on,
+                                            logger=logger,
+                                            queue=queue,
+                                            cycles_seconds=seconds,
+                                            k8s_key_config=k8s_class,
+                                            kube_context=kube_context,
+                                            executor=executor,
+                                            rate_limiter=rate_limiter,
+                                            kube_config_dict=kube_config_dict)
+
+        k8s_stat_checker = KubernetesChecker(debug_on=debug_on,
+                                             logger=logger,
+                                             queue=queue,
+                                             dispatcher_queue=queue_dispatcher,
+                                             dispatcher_max_msg_len=disp_class.max_msg_len,
+                                             dispatcher_alive_message_hours=disp_class.alive_message,
+                                             k8s_key_config=k8s_class,
+                                             kube_context=kube_context,
+                                             k8s_shard=k8s_stat_read.k8s_stat.k8s_shard,
+                                             k8s_events=k8s_stat_read.k8s_stat.k8s_events,
+                                             dispatcher_channels=disp_class.message_channels,
+                                             k8s_owner_graph=k8s_stat_read.k8s_stat.k8s_owner_graph
+                                             )
+        k8s_pipelines.append(k8s_stat_read)
+        k8s_pipelines.append(k8s_stat_checker)
 
     dispatcher_main = Dispatcher(debug_on=debug_on,
                                  logger=logger,
@@ -91,8 +130,7 @@ async def main_start(seconds=120,
             print_helper.info("try to restart the service")
             # run the producer and consumers
             # if telegram_separate_cor:
-            await asyncio.gather(k8s_stat_read.run(),
-                                 k8s_stat_checker.run(),
+            await asyncio.gather(*[pipeline.run() for pipeline in k8s_pipelines],
                                  dispatcher_main.run(),
                                  dispatcher_telegram.run(),
                                  dispatcher_mail.run())
@@ -123,6 +161,7 @@ if __name__ == "__main__":
     # kube config method
     k8s_load_kube_config_method = config_prg.k8s_load_kube_config_method()
     kube_config_file = config_prg.k8s_config_file()
+    kube_contexts = config_prg.k8s_kube_contexts()
     loop_seconds = config_prg.process_run_sec()
 
     logger = init_logger.init_logger_from_config(cl_config=config_prg)
@@ -138,5 +177,6 @@ if __name__ == "__main__":
                            k8s_load_kube_config_method,
                            kube_config_file,
                            clk8s_setup_disp,
-                           clk8s_setup
+                           clk8s_setup,
+                           kube_contexts
                            ))
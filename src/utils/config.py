@@ -1,6 +1,9 @@
 from dotenv import load_dotenv
 import os
+import re
+import socket
 from utils.handle_error import handle_exceptions_static_method, handle_exceptions_method
+from utils.message_template import PARSE_MODE_CHANNELS
 
 
 # class syntax
@@ -104,6 +107,15 @@ class ConfigProgram:
             res = '2000'
         return int(res)
 
+    @handle_exceptions_method
+    def telegram_parse_mode(self):
+        res = self.load_key('TELEGRAM_PARSE_MODE', '')
+        # plain text if the value is not a parse mode of Telegram
+        for parse_mode in ['HTML', 'MarkdownV2']:
+            if res.lower() == parse_mode.lower():
+                return parse_mode
+        return ''
+
     @handle_exceptions_method
     def telegram_rate_limit_minute(self):
         res = self.load_key('TELEGRAM_MAX_MSG_MINUTE',
@@ -162,6 +174,12 @@ class ConfigProgram:
     def k8s_config_file(self):
         return self.load_key('PROCESS_KUBE_CONFIG', None)
 
+    @handle_exceptions_method
+    def k8s_kube_contexts(self):
+        # contexts of the kube config watched by this process (empty: current context)
+        res = self.load_key('PROCESS_KUBE_CONTEXTS', '')
+        return [context.strip() for context in re.split('[;,]', res) if len(context.strip()) > 0]
+
     @handle_exceptions_method
     def k8s_force_cluster_identification(self):
         return self.load_key('PROCESS_CLUSTER_NAME', None)
@@ -176,6 +194,385 @@ class ConfigProgram:
         res = self.load_key('K8S_PODS', 'True')
         return True if res.lower() == "true" or res.lower() == "1" else False
 
+    @handle_exceptions_method
+    def k8s_pods_informer_enable(self):
+        res = self.load_key('K8S_PODS_INFORMER', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_events_watch_enable(self):
+        res = self.load_key('K8S_EVENTS_WATCH', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_events_max_objects(self):
+        res = self.load_key('K8S_EVENTS_MAX_OBJECTS',
+                            '1000')
+
+        if len(res) == 0:
+            res = '1000'
+        n_objects = int(res)
+        if n_objects < 1:
+            n_objects = 1
+
+        return n_objects
+
+    @handle_exceptions_method
+    def k8s_events_per_object(self):
+        res = self.load_key('K8S_EVENTS_PER_OBJECT',
+                            '3')
+
+        if len(res) == 0:
+            res = '3'
+        n_events = int(res)
+        if n_events < 1:
+            n_events = 1
+
+        return n_events
+
+    @handle_exceptions_method
+    def k8s_group_by_owner(self):
+        res = self.load_key('K8S_GROUP_BY_OWNER', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_workloads_joined(self):
+        res = self.load_key('K8S_WORKLOADS_JOINED', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_alert_raise_cycles(self):
+        res = self.load_key('K8S_ALERT_RAISE_CYCLES',
+                            '1')
+
+        if len(res) == 0:
+            res = '1'
+        n_cycles = int(res)
+        if n_cycles < 1:
+            n_cycles = 1
+
+        return n_cycles
+
+    @handle_exceptions_method
+    def k8s_alert_clear_cycles(self):
+        res = self.load_key('K8S_ALERT_CLEAR_CYCLES',
+                            '1')
+
+        if len(res) == 0:
+            res = '1'
+        n_cycles = int(res)
+        if n_cycles < 1:
+            n_cycles = 1
+
+        return n_cycles
+
+    @handle_exceptions_method
+    def k8s_flap_window(self):
+        res = self.load_key('K8S_FLAP_WINDOW',
+                            '0')
+
+        if len(res) == 0:
+            res = '0'
+        n_cycles = int(res)
+        if n_cycles < 2:
+            n_cycles = 0
+        elif n_cycles > 64:
+            n_cycles = 64
+
+        return n_cycles
+
+    @handle_exceptions_method
+    def k8s_flap_changes(self):
+        res = self.load_key('K8S_FLAP_CHANGES',
+                            '4')
+
+        if len(res) == 0:
+            res = '4'
+        n_changes = int(res)
+        if n_changes < 2:
+            n_changes = 2
+
+        return n_changes
+
+    @handle_exceptions_method
+    def k8s_cluster_wide_list(self):
+        res = self.load_key('K8S_CLUSTER_WIDE_LIST', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_api_max_workers(self):
+        res = self.load_key('K8S_API_MAX_WORKERS',
+                            '4')
+
+        if len(res) == 0:
+            res = '4'
+        n_workers = int(res)
+        if n_workers < 1:
+            n_workers = 1
+
+        return n_workers
+
+    @handle_exceptions_method
+    def k8s_api_pool_size(self):
+        res = self.load_key('K8S_API_POOL_SIZE',
+                            '0')
+
+        if len(res) == 0:
+            res = '0'
+        n_connections = int(res)
+        if n_connections < 0:
+            n_connections = 0
+
+        return n_connections
+
+    @handle_exceptions_method
+    def k8s_api_tcp_keepalive(self):
+        res = self.load_key('K8S_API_TCP_KEEPALIVE', 'True')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_api_connect_timeout(self):
+        res = self.load_key('K8S_API_CONNECT_TIMEOUT',
+                            '10')
+
+        if len(res) == 0:
+            res = '10'
+        n_seconds = int(res)
+        if n_seconds < 0:
+            n_seconds = 0
+
+        return n_seconds
+
+    @handle_exceptions_method
+    def k8s_api_read_timeout(self):
+        res = self.load_key('K8S_API_READ_TIMEOUT',
+                            '60')
+
+        if len(res) == 0:
+            res = '60'
+        n_seconds = int(res)
+        if n_seconds < 0:
+            n_seconds = 0
+
+        return n_seconds
+
+    @handle_exceptions_method
+    def k8s_api_qps(self):
+        res = self.load_key('K8S_API_QPS',
+                            '0')
+
+        if len(res) == 0:
+            res = '0'
+        qps = float(res)
+        if qps < 0:
+            qps = 0
+
+        return qps
+
+    @handle_exceptions_method
+    def k8s_api_burst(self):
+        res = self.load_key('K8S_API_BURST',
+                            '10')
+
+        if len(res) == 0:
+            res = '10'
+        burst = int(res)
+        if burst < 1:
+            burst = 1
+
+        return burst
+
+    @handle_exceptions_method
+    def k8s_api_verb_limits(self):
+        # budget of single verbs in the format verb=qps/burst (e.g. list=5/10,watch=1/2)
+        res = self.load_key('K8S_API_VERB_LIMITS', '')
+        limits = {}
+        for item in re.split('[;,]', res):
+            if '=' not in item:
+                continue
+            verb, budget = item.split('=', 1)
+            qps, _, burst = budget.partition('/')
+            qps = max(0.0, float(qps))
+            limits[verb.strip().lower()] = (qps, max(1, int(burst)) if len(burst.strip()) > 0 else max(1, int(qps)))
+
+        return limits
+
+    @handle_exceptions_method
+    def k8s_api_breaker_failures(self):
+        res = self.load_key('K8S_API_BREAKER_FAILURES',
+                            '3')
+
+        if len(res) == 0:
+            res = '3'
+        n_failures = int(res)
+        if n_failures < 0:
+            n_failures = 0
+
+        return n_failures
+
+    @handle_exceptions_method
+    def k8s_api_breaker_backoff_sec(self):
+        res = self.load_key('K8S_API_BREAKER_BACKOFF_SEC',
+                            '10')
+
+        if len(res) == 0:
+            res = '10'
+        n_seconds = int(res)
+        if n_seconds < 1:
+            n_seconds = 1
+
+        return n_seconds
+
+    @handle_exceptions_method
+    def k8s_api_breaker_backoff_max_sec(self):
+        res = self.load_key('K8S_API_BREAKER_BACKOFF_MAX_SEC',
+                            '600')
+
+        if len(res) == 0:
+            res = '600'
+        n_seconds = int(res)
+        if n_seconds < 1:
+            n_seconds = 1
+
+        return n_seconds
+
+    @handle_exceptions_method
+    def k8s_list_page_limit(self):
+        res = self.load_key('K8S_LIST_PAGE_LIMIT',
+                            '0')
+
+        if len(res) == 0:
+            res = '0'
+        n_items = int(res)
+        if n_items < 0:
+            n_items = 0
+
+        return n_items
+
+    @handle_exceptions_method
+    def k8s_list_raw_json(self):
+        res = self.load_key('K8S_LIST_RAW_JSON', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_list_field_selector(self):
+        res = self.load_key('K8S_LIST_FIELD_SELECTOR', 'True')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_list_resource_version0(self):
+        # True: the lists are served by the API server watch cache (resource_version="0").
+        # Lower load on etcd and lower latency, but the data can be behind etcd by a few seconds
+        # False: quorum read from etcd, always the latest data
+        res = self.load_key('K8S_LIST_RESOURCE_VERSION0', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_namespace_cache_sec(self):
+        res = self.load_key('K8S_NAMESPACE_CACHE_SEC',
+                            '300')
+
+        if len(res) == 0:
+            res = '300'
+        n_seconds = int(res)
+        if n_seconds < 0:
+            n_seconds = 0
+
+        return n_seconds
+
+    @handle_exceptions_method
+    def k8s_namespace_include(self):
+        res = self.load_key('K8S_NAMESPACE_INCLUDE', '')
+        return [pattern.strip() for pattern in re.split('[;,]', res) if len(pattern.strip()) > 0]
+
+    @handle_exceptions_method
+    def k8s_namespace_exclude(self):
+        res = self.load_key('K8S_NAMESPACE_EXCLUDE', '')
+        return [pattern.strip() for pattern in re.split('[;,]', res) if len(pattern.strip()) > 0]
+
+    @handle_exceptions_method
+    def k8s_collect_concurrent(self):
+        res = self.load_key('K8S_COLLECT_CONCURRENT', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_collect_concurrency(self):
+        res = self.load_key('K8S_COLLECT_CONCURRENCY',
+                            '4')
+
+        if len(res) == 0:
+            res = '4'
+        n_tasks = int(res)
+        if n_tasks < 1:
+            n_tasks = 1
+
+        return n_tasks
+
+    @handle_exceptions_method
+    def k8s_scheduler_enable(self):
+        res = self.load_key('K8S_SCHEDULER', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_kind_cycle_sec(self, kind):
+        # interval of one kind (e.g. K8S_NODE_CYCLE_SEC). 0: PROCESS_CYCLE_SEC
+        res = self.load_key(f'K8S_{kind}_CYCLE_SEC',
+                            '0')
+
+        if len(res) == 0:
+            res = '0'
+        n_seconds = int(res)
+        if n_seconds < 0:
+            n_seconds = 0
+
+        return n_seconds
+
+    @handle_exceptions_method
+    def k8s_scheduler_backoff_max(self):
+        res = self.load_key('K8S_SCHEDULER_BACKOFF_MAX',
+                            '4')
+
+        if len(res) == 0:
+            res = '4'
+        n_times = int(res)
+        if n_times < 1:
+            n_times = 1
+
+        return n_times
+
+    @handle_exceptions_method
+    def k8s_sharding_enable(self):
+        res = self.load_key('K8S_SHARDING', 'False')
+        return True if res.lower() == "true" or res.lower() == "1" else False
+
+    @handle_exceptions_method
+    def k8s_shard_namespace(self):
+        # namespace of the leases. Default: namespace of the pod
+        default = os.getenv('POD_NAMESPACE')
+        namespace_file = '/var/run/secrets/kubernetes.io/serviceaccount/namespace'
+        if default is None and os.path.isfile(namespace_file):
+            with open(namespace_file) as file:
+                default = file.read().strip()
+        return self.load_key('K8S_SHARD_NAMESPACE', default if default else 'default')
+
+    @handle_exceptions_method
+    def k8s_shard_identity(self):
+        # name of the replica. POD_NAME is set with the downward API, the hostname is the pod name
+        return self.load_key('POD_NAME', socket.gethostname())
+
+    @handle_exceptions_method
+    def k8s_shard_lease_sec(self):
+        res = self.load_key('K8S_SHARD_LEASE_SEC',
+                            '30')
+
+        if len(res) == 0:
+            res = '30'
+        n_seconds = int(res)
+        if n_seconds < 10:
+            n_seconds = 10
+
+        return n_seconds
+
     @handle_exceptions_method
     def k8s_deployment_enable(self):
         res = self.load_key('K8S_DEPLOYMENT', 'True')
@@ -233,8 +630,14 @@ class ConfigK8sProcess:
         self.CLUSTER_Name_key = 'cluster'
 
         self.POD_enable = True
+        self.POD_informer = False
         self.POD_key = 'pods'
 
+        # recent warning events attached to the messages
+        self.EVENTS_enable = False
+        self.EVENTS_max_objects = 1000
+        self.EVENTS_per_object = 3
+
         self.SS_enable = True
         self.SS_pods0 = False
         self.SS_key = 'stateful_sets'
@@ -257,17 +660,97 @@ class ConfigK8sProcess:
         self.DPL_pods0 = False
         self.DPL_key = 'deployment'
 
+        # deployments computed from the replica sets listed once
+        self.WORKLOADS_joined = False
+
+        # flap damping: cycles with problem to report an object, cycles without problem to resolve it,
+        # window (cycles) and changes of state in the window of the flapping objects (window 0: disabled)
+        self.ALERT_raise_cycles = 1
+        self.ALERT_clear_cycles = 1
+        self.FLAP_window = 0
+        self.FLAP_changes = 4
+
         self.NODE_enable = True
         self.NODE_key = 'nodelist'
 
+        # one list call for all namespaces instead of one call for each namespace
+        self.LIST_cluster_wide = False
+        # items for each page of the list calls (0: no pagination)
+        self.LIST_page_limit = 0
+        # parse the json body instead of building the client models
+        self.LIST_raw_json = False
+        # send the filters on the status to the API server as field selector
+        self.LIST_field_selector = True
+        # serve the lists from the API server watch cache (can be stale by a few seconds)
+        self.LIST_resource_version0 = False
+
+        # validity of the namespace list shared by the collectors (0: list every cycle)
+        self.NAMESPACE_cache_seconds = 300
+        # glob patterns of the namespaces to scan or to skip (empty: all the namespaces)
+        self.NAMESPACE_include = []
+        self.NAMESPACE_exclude = []
+
+        # max number of threads running the blocking k8s API calls
+        self.API_max_workers = 4
+        # connections of the shared api client (0: max workers + 2 for the informer and events watch)
+        self.API_pool_size = 0
+        self.API_tcp_keepalive = True
+        # timeouts (seconds) of each list request (0: no timeout)
+        self.API_connect_timeout = 10
+        self.API_read_timeout = 60
+        # client side limit of the requests (qps 0: no limit) and budgets of single verbs
+        self.API_qps = 0
+        self.API_burst = 10
+        self.API_verb_limits = {}
+        # circuit breaker: consecutive failures to open the circuit (0: disabled) and backoff
+        self.API_breaker_failures = 3
+        self.API_breaker_backoff_seconds = 10
+        self.API_breaker_backoff_max = 600
+
+        # read all the kinds in parallel in each cycle
+        self.COLLECT_concurrent = False
+        self.COLLECT_concurrency = 4
+
+        # interval of each kind (0: process cycle), used when the scheduler is enabled
+        self.SCHEDULER_enable = False
+        self.SCHEDULER_backoff_max = 4
+        self.NODE_cycle_seconds = 0
+        self.POD_cycle_seconds = 0
+        self.DPL_cycle_seconds = 0
+        self.SS_cycle_seconds = 0
+        self.RS_cycle_seconds = 0
+        self.DS_cycle_seconds = 0
+        self.PVC_cycle_seconds = 0
+        self.PV_cycle_seconds = 0
+
+        # sharded mode: the replicas split the namespaces with Leases
+        self.SHARD_enable = False
+        self.SHARD_namespace = 'default'
+        self.SHARD_identity = socket.gethostname()
+        self.SHARD_lease_seconds = 30
+
         # LS 2023.11.03 key for sending a unique message
         self.disp_MSG_key_unique = True  # Fixed True
         self.disp_MSG_key_start = 'msg_key_start'
         self.disp_MSG_key_end = 'msg_key_end'
+        # key added to the last known data of a kind when the API server is not available
+        self.disp_MSG_key_stale = 'msg_key_stale'
+        # one alert for each root owner of pods and workloads in the summary message
+        self.GROUP_by_owner = False
 
         if cl_config is not None:
             self.__init_configuration_app__(cl_config)
 
+    def get_api_request_timeout(self):
+        """
+        Timeout of the k8s requests in the format of the client (connect, read)
+        @return: tuple or None if the timeouts are disabled
+        """
+        if self.API_connect_timeout == 0 and self.API_read_timeout == 0:
+            return None
+        return (self.API_connect_timeout if self.API_connect_timeout > 0 else None,
+                self.API_read_timeout if self.API_read_timeout > 0 else None)
+
     def __print_configuration__(self):
         """
         Print setup class
@@ -277,14 +760,60 @@ class ConfigK8sProcess:
 
         print(f"INFO    [Process setup] k8s check node={self.NODE_enable}")
         print(f"INFO    [Process setup] k8s check daemon sets={self.DS_enable}- pods0={self.DS_pods0}")
-        print(f"INFO    [Process setup] k8s check pods ={self.POD_enable}")
+        print(f"INFO    [Process setup] k8s check pods ={self.POD_enable}- informer={self.POD_informer}")
+        print(f"INFO    [Process setup] k8s events watch={self.EVENTS_enable}"
+              f"- max objects={self.EVENTS_max_objects}"
+              f"- events for each object={self.EVENTS_per_object}")
         print(f"INFO    [Process setup] k8s check deployment={self.DPL_enable}- pods0={self.DPL_pods0}")
         print(f"INFO    [Process setup] k8s check stateful sets={self.SS_enable}- pods0={self.SS_pods0}")
         print(f"INFO    [Process setup] k8s check replicaset={self.RS_enable}- pods0={self.RS_pods0}")
+        print(f"INFO    [Process setup] k8s deployment from replicaset={self.WORKLOADS_joined}")
+        print(f"INFO    [Process setup] k8s alert raise cycles={self.ALERT_raise_cycles}"
+              f"- clear cycles={self.ALERT_clear_cycles}"
+              f"- flap window={self.FLAP_window}"
+              f"- flap changes={self.FLAP_changes}")
         print(f"INFO    [Process setup] k8s check pvc={self.PVC_enable}")
         print(f"INFO    [Process setup] k8s check pv={self.PVC_enable}")
 
-        print(f"INFO    [Process setup] k8s send summary message={self.disp_MSG_key_unique}")
+        print(f"INFO    [Process setup] k8s list cluster wide={self.LIST_cluster_wide}")
+        print(f"INFO    [Process setup] k8s list page limit={self.LIST_page_limit}")
+        print(f"INFO    [Process setup] k8s list raw json={self.LIST_raw_json}")
+        print(f"INFO    [Process setup] k8s list field selector={self.LIST_field_selector}")
+        print(f"INFO    [Process setup] k8s list from watch cache={self.LIST_resource_version0}")
+        print(f"INFO    [Process setup] k8s namespace cache seconds={self.NAMESPACE_cache_seconds}")
+        print(f"INFO    [Process setup] k8s namespace include={self.NAMESPACE_include}"
+              f" - exclude={self.NAMESPACE_exclude}")
+        print(f"INFO    [Process setup] k8s api max workers={self.API_max_workers}"
+              f"- pool size={self.API_pool_size}"
+              f"- tcp keepalive={self.API_tcp_keepalive}")
+        print(f"INFO    [Process setup] k8s api connect timeout={self.API_connect_timeout}"
+              f"- read timeout={self.API_read_timeout}")
+        print(f"INFO    [Process setup] k8s api qps={self.API_qps}"
+              f"- burst={self.API_burst}"
+              f"- verb limits={self.API_verb_limits}")
+        print(f"INFO    [Process setup] k8s api breaker failures={self.API_breaker_failures}"
+              f"- backoff={self.API_breaker_backoff_seconds}"
+              f"- backoff max={self.API_breaker_backoff_max}")
+        print(f"INFO    [Process setup] k8s collect concurrent={self.COLLECT_concurrent}"
+              f"- concurrency={self.COLLECT_concurrency}")
+        print(f"INFO    [Process setup] k8s scheduler={self.SCHEDULER_enable}"
+              f"- backoff max={self.SCHEDULER_backoff_max}")
+        print(f"INFO    [Process setup] k8s cycle seconds node={self.NODE_cycle_seconds}"
+              f"- pods={self.POD_cycle_seconds}"
+              f"- deployment={self.DPL_cycle_seconds}"
+              f"- stateful sets={self.SS_cycle_seconds}"
+              f"- replicaset={self.RS_cycle_seconds}"
+              f"- daemon sets={self.DS_cycle_seconds}"
+              f"- pvc={self.PVC_cycle_seconds}"
+              f"- pv={self.PV_cycle_seconds}")
+
+        print(f"INFO    [Process setup] k8s sharding={self.SHARD_enable}"
+              f"- namespace={self.SHARD_namespace}"
+              f"- identity={self.SHARD_identity}"
+              f"- lease seconds={self.SHARD_lease_seconds}")
+
+        print(f"INFO    [Process setup] k8s send summary message={self.disp_MSG_key_unique}"
+              f"- group by owner={self.GROUP_by_owner}")
 
     def __init_configuration_app__(self, cl_config: ConfigProgram):
         """
@@ -293,6 +822,11 @@ class ConfigK8sProcess:
         self.PVC_enable = cl_config.k8s_pvc_enable()
         self.PV_enable = cl_config.k8s_pv_enable()
         self.POD_enable = cl_config.k8s_pods_enable()
+        self.POD_informer = cl_config.k8s_pods_informer_enable()
+        self.EVENTS_enable = cl_config.k8s_events_watch_enable()
+        self.EVENTS_max_objects = cl_config.k8s_events_max_objects()
+        self.EVENTS_per_object = cl_config.k8s_events_per_object()
+        self.GROUP_by_owner = cl_config.k8s_group_by_owner()
         self.NODE_enable = cl_config.k8s_nodes_enable()
         self.DS_enable = cl_config.k8s_daemons_sets_enable()
         self.DPL_enable = cl_config.k8s_deployment_enable()
@@ -302,7 +836,49 @@ class ConfigK8sProcess:
         self.DPL_pods0 = cl_config.k8s_deployment_pods0()
         self.SS_pods0 = cl_config.k8s_stateful_sets_pods0()
         self.RS_pods0 = cl_config.k8s_replica_sets_pods0()
+        self.WORKLOADS_joined = cl_config.k8s_workloads_joined()
+        self.ALERT_raise_cycles = cl_config.k8s_alert_raise_cycles()
+        self.ALERT_clear_cycles = cl_config.k8s_alert_clear_cycles()
+        self.FLAP_window = cl_config.k8s_flap_window()
+        self.FLAP_changes = cl_config.k8s_flap_changes()
         self.CLUSTER_Name_forced = cl_config.k8s_force_cluster_identification()
+        self.LIST_cluster_wide = cl_config.k8s_cluster_wide_list()
+        self.LIST_page_limit = cl_config.k8s_list_page_limit()
+        self.LIST_raw_json = cl_config.k8s_list_raw_json()
+        self.LIST_field_selector = cl_config.k8s_list_field_selector()
+        self.LIST_resource_version0 = cl_config.k8s_list_resource_version0()
+        self.NAMESPACE_cache_seconds = cl_config.k8s_namespace_cache_sec()
+        self.NAMESPACE_include = cl_config.k8s_namespace_include()
+        self.NAMESPACE_exclude = cl_config.k8s_namespace_exclude()
+        self.API_max_workers = cl_config.k8s_api_max_workers()
+        self.API_pool_size = cl_config.k8s_api_pool_size()
+        if self.API_pool_size == 0:
+            self.API_pool_size = self.API_max_workers + 2
+        self.API_tcp_keepalive = cl_config.k8s_api_tcp_keepalive()
+        self.API_connect_timeout = cl_config.k8s_api_connect_timeout()
+        self.API_read_timeout = cl_config.k8s_api_read_timeout()
+        self.API_qps = cl_config.k8s_api_qps()
+        self.API_burst = cl_config.k8s_api_burst()
+        self.API_verb_limits = cl_config.k8s_api_verb_limits()
+        self.API_breaker_failures = cl_config.k8s_api_breaker_failures()
+        self.API_breaker_backoff_seconds = cl_config.k8s_api_breaker_backoff_sec()
+        self.API_breaker_backoff_max = cl_config.k8s_api_breaker_backoff_max_sec()
+        self.COLLECT_concurrent = cl_config.k8s_collect_concurrent()
+        self.COLLECT_concurrency = cl_config.k8s_collect_concurrency()
+        self.SCHEDULER_enable = cl_config.k8s_scheduler_enable()
+        self.SCHEDULER_backoff_max = cl_config.k8s_scheduler_backoff_max()
+        self.NODE_cycle_seconds = cl_config.k8s_kind_cycle_sec('NODE')
+        self.POD_cycle_seconds = cl_config.k8s_kind_cycle_sec('PODS')
+        self.DPL_cycle_seconds = cl_config.k8s_kind_cycle_sec('DEPLOYMENT')
+        self.SS_cycle_seconds = cl_config.k8s_kind_cycle_sec('STATEFUL_SETS')
+        self.RS_cycle_seconds = cl_config.k8s_kind_cycle_sec('REPLICA_SETS')
+        self.DS_cycle_seconds = cl_config.k8s_kind_cycle_sec('DAEMON_SETS')
+        self.PVC_cycle_seconds = cl_config.k8s_kind_cycle_sec('PVC')
+        self.PV_cycle_seconds = cl_config.k8s_kind_cycle_sec('PV')
+        self.SHARD_enable = cl_config.k8s_sharding_enable()
+        self.SHARD_namespace = cl_config.k8s_shard_namespace()
+        self.SHARD_identity = cl_config.k8s_shard_identity()
+        self.SHARD_lease_seconds = cl_config.k8s_shard_lease_sec()
 
         self.__print_configuration__()
 
@@ -317,6 +893,8 @@ class ConfigDispatcher:
         self.telegram_token = ''
         self.telegram_max_msg_len = 2000
         self.telegram_rate_limit = 20
+        # '' plain text, HTML or MarkdownV2
+        self.telegram_parse_mode = ''
 
         self.email_enable = True
         self.email_smtp_server = ''
@@ -325,6 +903,9 @@ class ConfigDispatcher:
         self.email_sender_password = '***'
         self.email_recipient = ''
 
+        # formats of the messages written by the checkers (see utils/message_template.py)
+        self.message_channels = ['text']
+
         if cl_config is not None:
             self.__init_configuration_app__(cl_config)
 
@@ -354,6 +935,7 @@ class ConfigDispatcher:
 
             print(f"INFO    [Dispatcher setup] telegram-max message length={self.telegram_max_msg_len}")
             print(f"INFO    [Dispatcher setup] telegram-rate limit minute={self.telegram_rate_limit}")
+            print(f"INFO    [Dispatcher setup] telegram-parse mode={self.telegram_parse_mode or 'plain text'}")
             print(f"INFO    [Dispatcher setup] Notification-alive message every={self.alive_message} hour")
 
         print(f"INFO    [Dispatcher setup] email={self.email_enable}")
@@ -375,6 +957,7 @@ class ConfigDispatcher:
         self.telegram_token = cl_config.telegram_token()
         self.telegram_max_msg_len = cl_config.telegram_max_msg_len()
         self.telegram_rate_limit = cl_config.telegram_rate_limit_minute()
+        self.telegram_parse_mode = cl_config.telegram_parse_mode()
 
         self.email_enable = cl_config.email_enable()
         self.email_sender = cl_config.email_sender()
@@ -386,5 +969,10 @@ class ConfigDispatcher:
 
         self.alive_message = cl_config.notification_alive_message_hours()
 
+        # the messages are written also in the format of the parse mode of Telegram
+        self.message_channels = ['text']
+        if self.telegram_enable and self.telegram_parse_mode in PARSE_MODE_CHANNELS:
+            self.message_channels.append(PARSE_MODE_CHANNELS[self.telegram_parse_mode])
+
         # email section
         self.__print_configuration__()
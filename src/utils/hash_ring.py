@@ -0,0 +1,39 @@
+import bisect
+import hashlib
+
+
+class ConsistentHashRing:
+    """
+    Consistent hashing of keys on a set of nodes.
+    Adding or removing a node moves only the keys of that node
+    """
+
+    def __init__(self, nodes=None, virtual_nodes=64):
+        # points on the ring of each node, they spread the keys evenly
+        self.virtual_nodes = virtual_nodes
+        self.nodes = sorted(set(nodes or []))
+        self.ring = []
+        self.ring_nodes = []
+        self.__build__()
+
+    @staticmethod
+    def __hash_key__(key):
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+    def __build__(self):
+        points = sorted((self.__hash_key__(f"{node}#{index}"), node)
+                        for node in self.nodes
+                        for index in range(self.virtual_nodes))
+        self.ring = [point for point, _ in points]
+        self.ring_nodes = [node for _, node in points]
+
+    def get_node(self, key):
+        """
+        Node owning the key
+        @param key: string (e.g. namespace name)
+        @return: node or None if the ring is empty
+        """
+        if not self.ring:
+            return None
+        index = bisect.bisect(self.ring, self.__hash_key__(key)) % len(self.ring)
+        return self.ring_nodes[index]
@@ -0,0 +1,129 @@
+class MessageBuilder:
+    """
+    Message written in fragments and joined once when it is sent.
+    The length for the max message length cut-off is summed only when it is read, on the fragments
+    added since the last read: appending to a str copies the whole message each time, quadratic in the big reports
+    """
+
+    def __init__(self, title=''):
+        # first fragment of the message, kept after a reset (e.g. 'Pod details:\n')
+        self.title = title
+        self.fragments = [title] if len(title) > 0 else []
+        # length of the first counted fragments
+        self.length = len(title)
+        self.counted = len(self.fragments)
+
+    def append(self, text):
+        """
+        Add a fragment at the end of the message
+        @param text: str
+        @return: self
+        """
+        self.fragments.append(text)
+        return self
+
+    def extend(self, other):
+        """
+        Add the fragments of another message at the end of the message
+        @param other: MessageBuilder
+        @return: self
+        """
+        self.fragments.extend(other.fragments)
+        return self
+
+    def is_empty(self):
+        """
+        True if nothing was added after the title
+        """
+        return len(self) <= len(self.title)
+
+    def build(self):
+        """
+        Join the fragments
+        @return: str message
+        """
+        if len(self.fragments) > 1:
+            # keep the joined message: a second build does not join again
+            self.fragments = [''.join(self.fragments)]
+            self.length = len(self.fragments[0])
+            self.counted = 1
+        return self.fragments[0] if self.fragments else ''
+
+    def flush(self):
+        """
+        Join the fragments and restart the message from the title
+        @return: str message
+        """
+        message = self.build()
+        self.fragments = [self.title] if len(self.title) > 0 else []
+        self.length = len(self.title)
+        self.counted = len(self.fragments)
+        return message
+
+    def __len__(self):
+        if self.counted < len(self.fragments):
+            # only the fragments added since the last read, summed in C
+            self.length += sum(map(len, self.fragments[self.counted:]))
+            self.counted = len(self.fragments)
+        return self.length
+
+    def __str__(self):
+        return self.build()
+
+
+class ChannelMessageBuilder:
+    """
+    Message written in the format of each channel (e.g. plain text and Telegram HTML) at the same time,
+    one MessageBuilder for each channel. The fragments are dict channel -> str
+    """
+
+    def __init__(self, title=None):
+        # channel -> MessageBuilder starting with the title of the channel
+        self.builders = {channel: MessageBuilder(text) for channel, text in (title or {}).items()}
+
+    def __builder__(self, channel):
+        builder = self.builders.get(channel)
+        if builder is None:
+            builder = MessageBuilder()
+            self.builders[channel] = builder
+        return builder
+
+    def append(self, fragments):
+        """
+        Add a fragment at the end of the message of each channel
+        @param fragments: dict channel -> str
+        @return: self
+        """
+        for channel, text in fragments.items():
+            self.__builder__(channel).append(text)
+        return self
+
+    def extend(self, other):
+        """
+        Add the fragments of another message at the end of the message of each channel
+        @param other: ChannelMessageBuilder
+        @return: self
+        """
+        for channel, builder in other.builders.items():
+            self.__builder__(channel).extend(builder)
+        return self
+
+    def is_empty(self):
+        return all(builder.is_empty() for builder in self.builders.values())
+
+    def build(self):
+        """
+        @return: dict channel -> str message
+        """
+        return {channel: builder.build() for channel, builder in self.builders.items()}
+
+    def flush(self):
+        """
+        Join the fragments and restart the message of each channel from its title
+        @return: dict channel -> str message
+        """
+        return {channel: builder.flush() for channel, builder in self.builders.items()}
+
+    def __len__(self):
+        # the longest channel for the max message length cut-off
+        return max((len(builder) for builder in self.builders.values()), default=0)
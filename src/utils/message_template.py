@@ -0,0 +1,260 @@
+import html
+import re
+from string import Formatter
+
+# characters reserved by the MarkdownV2 parse mode of Telegram
+MARKDOWN_V2_RESERVED = re.compile(r'([_*\[\]()~`>#+\-=|{}.!\\])')
+
+
+def escape_html(text):
+    return html.escape(text, quote=False)
+
+
+def escape_markdown_v2(text):
+    return MARKDOWN_V2_RESERVED.sub(r'\\\1', text)
+
+
+# fragments of the messages. The values of the fields are escaped for the channel,
+# the literal parts are written as they are (the reserved characters are escaped here)
+TEXT_TEMPLATES = {
+    'title': "{title} details:\n",
+    'item': "----------\n{name}\n",
+    'value': "{key}= {value}\n",
+    'section': "{key}:\n",
+    'section_value': "   {key}= {value}\n",
+    'events': "events:\n",
+    'event': "   {reason}= {message}{count}\n",
+    'group': "==========\n{kind} {name} in {namespace}: {counts}\n",
+    'group_others': "also {kind}= {names}\n",
+    'report_start': "Start report\n",
+    'report_separator': f"\n{'-' * 20}\n",
+    'report_end': "\nEnd report",
+    'text': "{text}",
+}
+
+HTML_TEMPLATES = {
+    'title': "<b>{title} details:</b>\n",
+    'item': "----------\n<b>{name}</b>\n",
+    'value': "{key}= <code>{value}</code>\n",
+    'section': "<i>{key}:</i>\n",
+    'section_value': "   {key}= <code>{value}</code>\n",
+    'events': "<i>events:</i>\n",
+    'event': "   <b>{reason}</b>= {message}{count}\n",
+    'group': "==========\n<b>{kind} {name}</b> in {namespace}: {counts}\n",
+    'group_others': "also {kind}= {names}\n",
+    'report_start': "<b>Start report</b>\n",
+    'report_separator': f"\n{'-' * 20}\n",
+    'report_end': "\n<b>End report</b>",
+    'text': "{text}",
+}
+
+MARKDOWN_V2_TEMPLATES = {
+    'title': "*{title} details:*\n",
+    'item': '\\-' * 10 + "\n*{name}*\n",
+    'value': "{key}\\= {value}\n",
+    'section': "_{key}:_\n",
+    'section_value': "   {key}\\= {value}\n",
+    'events': "_events:_\n",
+    'event': "   *{reason}*\\= {message}{count}\n",
+    'group': '\\=' * 10 + "\n*{kind} {name}* in {namespace}: {counts}\n",
+    'group_others': "also {kind}\\= {names}\n",
+    'report_start': "*Start report*\n",
+    'report_separator': "\n" + '\\-' * 20 + "\n",
+    'report_end': "\n*End report*",
+    'text': "{text}",
+}
+
+# channel -> (escape of the values, templates)
+CHANNELS = {
+    'text': (None, TEXT_TEMPLATES),
+    'html': (escape_html, HTML_TEMPLATES),
+    'markdownv2': (escape_markdown_v2, MARKDOWN_V2_TEMPLATES),
+}
+
+# parse mode of Telegram -> channel
+PARSE_MODE_CHANNELS = {
+    'HTML': 'html',
+    'MarkdownV2': 'markdownv2',
+}
+
+
+class MessageTemplate:
+    """
+    Fragment template compiled once: the text is split in literal parts and fields when it is created,
+    only the values are escaped and joined when the fragment is rendered.
+    The fixed values (e.g. the key of a line) are escaped and written in the literal parts
+    @param escape: escape of the values (None: plain text)
+    """
+
+    __slots__ = ('escape', 'parts', 'tail')
+
+    def __init__(self, text, escape=None, **fixed):
+        self.escape = escape
+        parts = []
+        literal_text = ''
+        for literal, field, _, _ in Formatter().parse(text):
+            literal_text += literal
+            if field is None:
+                continue
+            if field in fixed:
+                literal_text += self.__escape__(fixed[field])
+            else:
+                parts.append((literal_text, field))
+                literal_text = ''
+        self.parts = tuple(parts)
+        self.tail = literal_text
+
+    def __escape__(self, value):
+        return f"{value}" if self.escape is None else self.escape(f"{value}")
+
+    def is_static(self):
+        """
+        True if the template has no field (e.g. report_end): its text is rendered once
+        """
+        return len(self.parts) == 0
+
+    def render(self, **values):
+        return ''.join([f"{literal}{self.__escape__(values[field])}" for literal, field in self.parts]) + self.tail
+
+
+class ItemTemplate:
+    """
+    Template of the items of one kind for one channel, compiled with the enable keys.
+    Only the enable keys are written (all if None), the dict values are written as sections.
+    The static fragments are rendered once: the lines of each key are kept as the text before and after
+    the value, only the name and the values of the item are escaped and joined at each render
+    """
+
+    def __init__(self, channel, enable_keys=None):
+        self.escape, self.templates = CHANNELS[channel]
+        self.enable_keys = None if enable_keys is None else frozenset(enable_keys)
+        item = MessageTemplate(self.templates['item'], self.escape)
+        # text before and after the name of the item
+        self.item = (item.parts[0][0], item.tail)
+        # key -> (text before the value, text after the value, section title).
+        # With enable keys only their lines are compiled, a key not found is not written.
+        # The other keys (e.g. the conditions in a section) are compiled when found
+        self.lines = {}
+        self.section_values = {}
+        for key in enable_keys or []:
+            self.__line__(key)
+
+    def __compile__(self, name, key):
+        template = MessageTemplate(self.templates[name], self.escape, key=key)
+        if template.is_static():
+            return template.tail, ''
+        return template.parts[0][0], template.tail
+
+    def __line__(self, key):
+        line = self.__compile__('value', key) + self.__compile__('section', key)[:1]
+        self.lines[key] = line
+        return line
+
+    def __section_value__(self, key):
+        line = self.__compile__('section_value', key) + self.__compile__('section', key)[:1]
+        self.section_values[key] = line
+        return line
+
+    def __render_section__(self, title, section, fragments):
+        escape = self.escape
+        section_values = self.section_values
+        fragments.append(title)
+        for key, value in section.items():
+            if value is None:
+                continue
+            line = section_values.get(key) or self.__section_value__(key)
+            if isinstance(value, dict):
+                self.__render_section__(line[2], value, fragments)
+                continue
+            text = f"{value}"
+            if text:
+                fragments.append(f"{line[0]}{text if escape is None else escape(text)}{line[1]}")
+
+    def render(self, name, details):
+        """
+        Render an item
+        @param name: name of the item
+        @param details: dict details of the item
+        @return: str fragment
+        """
+        escape = self.escape
+        lines = self.lines
+        all_keys = self.enable_keys is None
+        head, tail = self.item
+        fragments = [f"{head}{name if escape is None else escape(f'{name}')}{tail}"]
+        for key, value in details.items():
+            if value is None:
+                continue
+            line = lines.get(key)
+            if line is None:
+                if not all_keys:
+                    continue
+                line = self.__line__(key)
+            if isinstance(value, dict):
+                self.__render_section__(line[2], value, fragments)
+                continue
+            text = f"{value}"
+            if text:
+                fragments.append(f"{line[0]}{text if escape is None else escape(text)}{line[1]}")
+        return ''.join(fragments)
+
+
+class MessageTemplates:
+    """
+    Templates of the messages in the format of each channel (e.g. plain text for email and HTML for Telegram).
+    The templates are compiled once, the items of each title with its enable keys.
+    Only the static fragments are kept: the templates without field (e.g. report_start, report_end)
+    are rendered once, the items are rendered at each report from their compiled lines
+    """
+
+    def __init__(self, channels=None):
+        self.channels = [channel for channel in (channels or []) if channel in CHANNELS] or ['text']
+        # channel -> fragment name -> template
+        self.templates = {channel: {name: MessageTemplate(text, CHANNELS[channel][0])
+                                    for name, text in CHANNELS[channel][1].items()}
+                          for channel in self.channels}
+        # fragment name -> channel -> text of the templates without field
+        self.static = {name: {channel: self.templates[channel][name].tail for channel in self.channels}
+                       for name in self.templates[self.channels[0]]
+                       if all(self.templates[channel][name].is_static() for channel in self.channels)}
+        # title -> channel -> ItemTemplate
+        self.item_templates = {}
+
+    def render(self, template_name, **values):
+        """
+        Render a fragment for each channel
+        @param template_name: name of the fragment (e.g. title)
+        @return: dict channel -> str
+        """
+        static = self.static.get(template_name)
+        if static is not None:
+            return static
+        return {channel: self.templates[channel][template_name].render(**values) for channel in self.channels}
+
+    def add_items(self, title, enable_keys=None):
+        """
+        Compile the templates of the items of a title (e.g. Pod or Resolved Pod)
+        @param title: title of the items
+        @param enable_keys: keys written in the message (None: all)
+        @return: dict channel -> ItemTemplate
+        """
+        item_templates = {channel: ItemTemplate(channel, enable_keys) for channel in self.channels}
+        self.item_templates[title] = item_templates
+        return item_templates
+
+    def render_item(self, title, enable_keys, name, details):
+        """
+        Render an item for each channel
+        @param title: title of the items. The enable keys of a title do not change
+        @param enable_keys: keys written in the message (None: all)
+        @param name: name of the item
+        @param details: item record (converted in dict with to_dict) or dict
+        @return: dict channel -> str
+        """
+        item_templates = self.item_templates.get(title)
+        if item_templates is None:
+            item_templates = self.add_items(title, enable_keys)
+
+        if hasattr(details, 'to_dict'):
+            details = details.to_dict()
+        return {channel: item_template.render(name, details) for channel, item_template in item_templates.items()}